@@ -0,0 +1,241 @@
+"""Synthetische benchmark voor de volledige pipeline (BNKA-achtige extracts).
+
+Voorbeeld:
+    python benchmarks/bench_pipeline.py --rows 10000,100000 --formats xlsx,csv
+    python benchmarks/bench_pipeline.py --rows 10000 --save-baseline
+    python benchmarks/bench_pipeline.py --rows 1000000 --formats csv --threshold 0.25
+
+Draait offline: genereert data in --workdir, gebruikt config/M140/BNKA als template,
+meet elke stage (via RunMetrics) plus end-to-end, en vergelijkt met een opgeslagen baseline.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from argparse import Namespace
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO = Path(__file__).resolve().parents[1]
+try:
+    import transform_myd  # noqa: F401
+except ImportError:  # niet geïnstalleerd: draai vanuit de checkout
+    sys.path.insert(0, str(REPO / "src"))
+
+import pandas as pd
+import yaml
+
+from transform_myd.pipeline import run_pipeline
+
+DEFAULT_BASELINE = REPO / "benchmarks" / "baseline.json"
+COUNTRIES = ["NL", "BE", "DE", "FR", "GB", "LU", "AT", "CH", "IT", "ES"]
+CITY_WORDS = ["Amsterdam", "Rotterdam", "Köln", "Zürich", "Liège", "Malmö", "Gent", "Utrecht", "Münster", "Genève"]
+BANK_WORDS = ["Bank", "Sparkasse", "Crédit", "Banque", "Volksbank", "Raiffeisen", "Fortis", "Caisse", "Trust", "Capital"]
+STREET_WORDS = ["Hoofdstraat", "Kerkstraat", "Bahnhofstraße", "Rue de la Gare", "Dorpsstraat", "Marktplatz"]
+
+
+def _mojibake(s: str) -> str:
+    try:
+        return s.encode("utf-8").decode("latin1")
+    except Exception:
+        return s
+
+
+def generate_bnka(rows: int, cardinality: int = 5000, mojibake_rate: float = 0.01,
+                  reject_rate: float = 0.05, seed: int = 42) -> pd.DataFrame:
+    """BNKA-achtige extract met instelbare cardinaliteit, mojibake- en reject-ratio."""
+    rnd = random.Random(seed)
+    card = max(1, min(cardinality, rows))
+    names = [f"{rnd.choice(BANK_WORDS)} {rnd.choice(CITY_WORDS)} {i}" for i in range(card)]
+    cities = [f"{rnd.choice(CITY_WORDS)}" for _ in range(card)]
+    streets = [f"{rnd.choice(STREET_WORDS)} {rnd.randint(1, 250)}" for _ in range(card)]
+    data: Dict[str, List[str]] = {k: [] for k in ("BANKS", "BANKL", "BANKA", "PROVZ", "STRAS",
+                                                  "ORT01", "SWIFT", "BNKLZ", "BRNCH")}
+    for i in range(rows):
+        k = rnd.randrange(card)
+        banks = rnd.choice(COUNTRIES)
+        bankl = f"{10000000 + i}"
+        banka = names[k]
+        city = cities[k]
+        if rnd.random() < mojibake_rate:
+            banka = _mojibake(banka); city = _mojibake(city)
+        provz = str(rnd.randint(1, 99))
+        if rnd.random() < reject_rate:
+            # wisselend: verplicht veld leeg of max_length-overtreding
+            if rnd.random() < 0.5: bankl = ""
+            else: provz = "1234"
+        data["BANKS"].append(banks)
+        data["BANKL"].append(bankl)
+        data["BANKA"].append(banka)
+        data["PROVZ"].append(provz)
+        data["STRAS"].append(streets[k] if rnd.random() > 0.02 else "")
+        data["ORT01"].append(city)
+        data["SWIFT"].append(f"{banka[:4].upper():<4}{banks}2X".replace(" ", "X"))
+        data["BNKLZ"].append(bankl)
+        data["BRNCH"].append("" if rnd.random() < 0.7 else f"Filiaal {rnd.randint(1, 50)}")
+    return pd.DataFrame(data)
+
+
+def _materialize(workdir: Path, rows: int, fmt: str, opts: Namespace) -> Path:
+    name = f"bnka_{rows}_c{opts.cardinality}_m{opts.mojibake_rate}_r{opts.reject_rate}_s{opts.seed}.{fmt}"
+    path = workdir / "data" / "raw" / name
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    df = generate_bnka(rows, opts.cardinality, opts.mojibake_rate, opts.reject_rate, opts.seed)
+    if fmt == "csv":
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+    else:
+        df.to_excel(path, index=False, engine="openpyxl")
+    print(f"  gegenereerd {path.name} in {time.perf_counter() - t0:.1f}s")
+    return path
+
+
+def _prepare_config(workdir: Path, template: Path, string_dtype: str = "object") -> Path:
+    cfg_root = workdir / "config"
+    if cfg_root.exists():
+        shutil.rmtree(cfg_root)
+    shutil.copytree(template / "_shared", cfg_root / "_shared")
+    shutil.copytree(template / "M140" / "BNKA", cfg_root / "M140" / "BNKA")
+    meta_path = cfg_root / "M140" / "BNKA" / "meta.yaml"
+    meta = yaml.safe_load(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+    meta = meta or {}
+    meta.setdefault("engine", {})["string_dtype"] = string_dtype
+    meta_path.write_text(yaml.safe_dump(meta, sort_keys=False, allow_unicode=True), encoding="utf-8")
+    return cfg_root
+
+
+def _run_case(cfg_root: Path, workdir: Path, input_file: Path, opts: Namespace) -> Dict[str, Any]:
+    out = workdir / "out"
+    ns = Namespace(
+        object_name="M140", variant_name="BNKA", config_dir=str(cfg_root),
+        input_file=str(input_file), output_file=str(out / "output.csv"),
+        reject_file=str(out / "rejected.csv"), log_dir=str(workdir / "logs"),
+        sample=None, report=not opts.no_reports, report_format="html", reports="raw,post,validation",
+        scaffold_object=None, from_excel=None, force=False, dry_run=False,
+        runlist_path=None, lint=False, lint_all=False, strict=False,
+        trace_config=False, no_txt_log=False, quiet=True, classic_summary=False,
+        ci=False, fail_on_rejects=False, fail_on_zero_valid=False,
+        no_lineage=False, keep_lineage=False, encoding_out=None, encoding_rejects=None,
+        metrics=False, profile=None, workers=opts.workers,
+    )
+    t0 = time.perf_counter()
+    res = run_pipeline(ns)
+    wall = time.perf_counter() - t0
+    stages = {s["name"]: s["wall_s"] for s in res["metrics"]["stages"]}
+    stages["end_to_end"] = wall
+    peak_rss = max((s["rss_mb"] or 0.0) for s in res["metrics"]["stages"]) if res["metrics"]["stages"] else None
+    return {"stages": stages, "rows": res["total"], "valid": res["valid"], "rejected": res["rejected"],
+            "peak_rss_mb": peak_rss}
+
+
+def _compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_abs: float) -> List[str]:
+    regressions: List[str] = []
+    for case, res in results.items():
+        base = (baseline.get("cases") or {}).get(case)
+        if not base:
+            continue
+        for stage, cur in res["stages"].items():
+            ref = base["stages"].get(stage)
+            if ref is None:
+                continue
+            if cur > ref * (1 + threshold) and (cur - ref) > min_abs:
+                regressions.append(f"{case}:{stage} {ref:.3f}s → {cur:.3f}s (+{(cur / ref - 1) * 100:.0f}%)")
+    return regressions
+
+
+def _print_table(case: str, res: Dict[str, Any], base: Optional[Dict[str, Any]]) -> None:
+    print(f"\n== {case}  rows={res['rows']} valid={res['valid']} rejected={res['rejected']} "
+          f"peak_rss={res['peak_rss_mb'] or 0:.0f}MB ==")
+    print(f"{'stage':<20} {'s':>9} {'baseline':>9} {'Δ%':>7}")
+    for stage, cur in res["stages"].items():
+        ref = ((base or {}).get("stages") or {}).get(stage)
+        delta = f"{(cur / ref - 1) * 100:+.0f}" if ref else "-"
+        print(f"{stage:<20} {cur:>9.3f} {ref if ref is not None else float('nan'):>9.3f} {delta:>7}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> Namespace:
+    p = argparse.ArgumentParser(description="Synthetische pipeline-benchmark (BNKA template).")
+    p.add_argument("--rows", default="10000,100000", help="Comma-separated rij-aantallen, bv. 10000,100000,1000000.")
+    p.add_argument("--formats", default="xlsx,csv", help="Bronformaten: xlsx,csv.")
+    p.add_argument("--cardinality", type=int, default=5000, help="Aantal unieke banken/steden/straten.")
+    p.add_argument("--mojibake-rate", type=float, default=0.01, help="Fractie rijen met mojibake.")
+    p.add_argument("--reject-rate", type=float, default=0.05, help="Fractie rijen die validatie faalt.")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--repeat", type=int, default=1, help="Herhalingen per case; de snelste telt.")
+    p.add_argument("--no-reports", action="store_true", help="Sla report-stages over.")
+    p.add_argument("--workers", type=int, default=None, help="Row-partitioned uitvoering (zie --workers van de CLI).")
+    p.add_argument("--string-dtype", default="object", choices=["object", "python", "pyarrow"],
+                   help="meta.engine.string_dtype voor de run (cases krijgen suffix bij niet-object).")
+    p.add_argument("--config-template", default=str(REPO / "config"), help="Config root met _shared en M140/BNKA.")
+    p.add_argument("--workdir", default=None, help="Werkmap (default: tijdelijke map; gegenereerde data wordt hergebruikt).")
+    p.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON om mee te vergelijken.")
+    p.add_argument("--save-baseline", action="store_true", help="Schrijf resultaten als nieuwe baseline.")
+    p.add_argument("--threshold", type=float, default=0.20, help="Toegestane vertraging t.o.v. baseline (0.20 = 20%%).")
+    p.add_argument("--min-abs", type=float, default=0.05, help="Negeer verschillen kleiner dan N seconden.")
+    p.add_argument("--out", default=None, help="Schrijf resultaten ook naar dit JSON-bestand.")
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    opts = parse_args(argv)
+    workdir = Path(opts.workdir) if opts.workdir else Path(tempfile.mkdtemp(prefix="myd_bench_"))
+    workdir = workdir.resolve(); workdir.mkdir(parents=True, exist_ok=True)
+    cfg_root = _prepare_config(workdir, Path(opts.config_template).resolve(), opts.string_dtype)
+    baseline_path = Path(opts.baseline).resolve()
+    out_path = Path(opts.out).resolve() if opts.out else None
+    old_cwd = os.getcwd()
+    os.chdir(workdir)  # meta.dirs (data/raw, data/out, ...) zijn relatief aan cwd
+    try:
+        return _bench(opts, workdir, cfg_root, baseline_path, out_path)
+    finally:
+        os.chdir(old_cwd)  # main() is herbruikbaar (tests, notebooks) zonder de cwd te verzetten
+
+
+def _bench(opts: Namespace, workdir: Path, cfg_root: Path, baseline_path: Path, out_path: Optional[Path]) -> int:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+
+    results: Dict[str, Any] = {}
+    for rows in [int(r) for r in opts.rows.split(",") if r.strip()]:
+        for fmt in [f.strip() for f in opts.formats.split(",") if f.strip()]:
+            case = f"{fmt}_{rows}" + ("" if opts.string_dtype == "object" else f"_{opts.string_dtype}")
+            case += f"_w{opts.workers}" if opts.workers and opts.workers > 1 else ""
+            src = _materialize(workdir, rows, fmt, opts)
+            best: Optional[Dict[str, Any]] = None
+            for _ in range(max(1, opts.repeat)):
+                res = _run_case(cfg_root, workdir, src, opts)
+                if best is None or res["stages"]["end_to_end"] < best["stages"]["end_to_end"]:
+                    best = res
+            results[case] = best
+            _print_table(case, best, (baseline.get("cases") or {}).get(case))
+
+    payload = {"python": sys.version.split()[0], "pandas": pd.__version__,
+               "params": {k: v for k, v in vars(opts).items() if k not in ("out", "save_baseline")},
+               "cases": results}
+    if out_path:
+        out_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    if opts.save_baseline:
+        merged = dict(baseline); merged.update({k: v for k, v in payload.items() if k != "cases"})
+        merged["cases"] = {**(baseline.get("cases") or {}), **results}
+        baseline_path.write_text(json.dumps(merged, indent=2), encoding="utf-8")
+        print(f"\nBaseline opgeslagen: {baseline_path}")
+        return 0
+
+    regressions = _compare(results, baseline, opts.threshold, opts.min_abs)
+    if regressions:
+        print("\nRegressies:")
+        for r in regressions:
+            print(f" ! {r}")
+        return 1
+    print("\nGeen regressies." if baseline else "\nGeen baseline gevonden (gebruik --save-baseline).")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,15 @@
 """transform_myd package."""
 __all__ = [
     "__version__",
+    "Engine",
+    "EngineResult",
 ]
 __version__ = "17.7.0"
 
+
+def __getattr__(name):
+    # Lazy: 'import transform_myd' (en de CLI) laadt pandas pas bij gebruik van de API.
+    if name in ("Engine", "EngineResult"):
+        from . import engine
+        return getattr(engine, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
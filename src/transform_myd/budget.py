@@ -0,0 +1,224 @@
+from __future__ import annotations
+import re
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .config import TransformConfig
+from .io_excel import STREAM_CHUNK_ROWS, _is_csv, excel_row_count, read_head
+from .rejects import details_format
+from .sampling import SampleSpec
+from .validate import unique_key_specs
+
+# Geheugenbudget (--memory-budget / meta.engine.memory_budget): vóór het laden de piek schatten uit
+# bestandsgrootte, kolommen en de kop van de bron, en daarop in_memory / streaming / spill kiezen.
+EXECUTION_MODES = ("in_memory", "streaming", "spill")
+ESTIMATE_ROWS = 1000           # kop van de bron voor bytes/rij
+FRAME_FACTOR = 3.0             # df + valid/reject split + export frame (gemeten ~3x het object-frame)
+ROW_OVERHEAD = 600             # bytes/rij buiten het frame: errors dict, reject details, TXT-log regels
+STREAM_ROW_BYTES = 250         # streaming houdt per bronrij een TXT-log regel + sleutel vast
+KEY_ROW_BYTES = 100            # spill: alleen de unique_keys index groeit mee
+LOOKUP_FACTOR = 4.0            # lookup-sources: in-memory t.o.v. bestandsgrootte
+XLSX_EXPANSION = 4.0           # xlsx zonder sheet-dimensie: tekst ≈ 4x het (gezipte) bestand
+CHUNK_SHARE = 0.25             # deel van het budget voor één chunk
+MIN_CHUNK_ROWS = 5_000
+MAX_CHUNK_ROWS = 4 * STREAM_CHUNK_ROWS
+AUTO_FRACTION = 0.5            # --memory-budget auto: helft van het beschikbare geheugen
+REPORT_SAMPLE_ROWS = 10_000    # rapporten op een sample als exact profileren niet past
+
+DOWNGRADES = {
+    "report_sample": "rapporten op sample",
+    "post_delta": "post delta uit",
+    "trace_alloc": "trace_alloc uit",
+    "details_csv": "reject details als csv",
+}
+
+_UNITS = {"": 2**20, "b": 1, "k": 2**10, "kb": 2**10, "kib": 2**10, "m": 2**20, "mb": 2**20, "mib": 2**20,
+          "g": 2**30, "gb": 2**30, "gib": 2**30, "t": 2**40, "tb": 2**40, "tib": 2**40}
+_SIZE_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([a-z]*)$")
+
+
+def _mb(n: float) -> str:
+    return f"{n / 2**20:,.0f} MB"
+
+
+def _available_bytes() -> Optional[int]:
+    try:
+        import psutil  # optioneel
+        return int(psutil.virtual_memory().available)
+    except Exception:
+        pass
+    try:
+        with open("/proc/meminfo", "r") as fp:
+            for line in fp:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except Exception:
+        pass
+    return None
+
+
+def parse_budget(value: Any) -> Optional[int]:
+    """'4GB' / '512MB' / 2048 (= MB) / 'auto' → bytes; leeg, 0 of none = geen budget."""
+    if value is None or value is False:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value * 2**20) if value > 0 else None
+    text = str(value).strip().lower()
+    if text in ("", "0", "none", "off"):
+        return None
+    if text == "auto":
+        avail = _available_bytes()
+        return int(avail * AUTO_FRACTION) if avail else None
+    m = _SIZE_RE.match(text)
+    if not m or m.group(2) not in _UNITS or float(m.group(1)) <= 0:
+        raise SystemExit(f"Ongeldig geheugenbudget '{value}' (bijv. 4GB, 512MB, 2048 of auto).")
+    return int(float(m.group(1)) * _UNITS[m.group(2)])
+
+
+def resolve_budget(args, meta: Optional[Dict[str, Any]] = None) -> Optional[int]:
+    """--memory-budget > meta.engine.memory_budget."""
+    value = getattr(args, "memory_budget", None)
+    if value is None:
+        value = ((meta or {}).get("engine") or {}).get("memory_budget")
+    return parse_budget(value)
+
+
+@dataclass
+class Footprint:
+    rows: int                  # geschatte datarijen (na sample)
+    columns: int
+    row_bytes: float           # bytes per rij als Python-strings (zoals na sanitize/maps)
+    file_bytes: int
+    exact_rows: bool           # geteld of uit de sheet-dimensie i.p.v. geschat
+    extra_bytes: int = 0       # lookup-sources
+
+    @property
+    def frame_bytes(self) -> int:
+        return int(self.rows * self.row_bytes)
+
+
+def _csv_rows(path: Path, size: int) -> Tuple[int, bool]:
+    """Datarijen uit de gemiddelde regellengte van de kop; exact als de kop het hele bestand is."""
+    with open(path, "rb") as fp:
+        head = list(islice(fp, ESTIMATE_ROWS + 1))
+    data = head[1:]
+    if not data:
+        return 0, True
+    if sum(map(len, head)) >= size:
+        return len(data), True
+    return int((size - len(head[0])) / (sum(map(len, data)) / len(data))), False
+
+
+def estimate_footprint(cfg: TransformConfig, spec: Optional[SampleSpec] = None) -> Footprint:
+    """Schatting vóór het laden: alleen de kop van de basisbron wordt gelezen."""
+    meta = cfg.meta or {}
+    enc_in = (meta.get("encoding") or {}).get("input", "utf-8-sig")
+    path, sheet, enc, extra = Path(cfg.input_file), meta.get("sheet"), enc_in, 0
+    sources = meta.get("sources")
+    if sources:
+        base = meta.get("base", sources[0]["name"])
+        src = next((s for s in sources if s["name"] == base), sources[0])
+        path, sheet, enc = Path(src["path"]), src.get("sheet"), src.get("encoding", enc_in)
+        extra = int(sum(Path(s["path"]).stat().st_size for s in sources
+                        if s is not src and Path(s["path"]).exists()) * LOOKUP_FACTOR)
+    size = path.stat().st_size
+    head = read_head(path, sheet, nrows=ESTIMATE_ROWS, encoding=enc)
+    n_head = len(head)
+    row_bytes = float(head.astype(object).memory_usage(deep=True, index=False).sum()) / n_head if n_head else 0.0
+    if _is_csv(path):
+        rows, exact = _csv_rows(path, size)
+    else:
+        rows, exact = excel_row_count(path, sheet), True
+        if rows is None:
+            text_row = len(head.to_csv(index=False, header=False).encode("utf-8")) / n_head if n_head else 1.0
+            rows, exact = int(size * XLSX_EXPANSION / max(text_row, 1.0)), False
+    if spec is not None:
+        rows = min(rows, spec.n)
+    return Footprint(rows, len(head.columns), row_bytes, size, exact, extra)
+
+
+@dataclass
+class ExecutionPlan:
+    mode: str                               # in_memory | streaming | spill
+    budget: int
+    footprint: Footprint
+    estimate: int                           # geschatte piek (bytes) in deze modus
+    chunk_rows: int = 0
+    downgrades: List[str] = field(default_factory=list)
+    note: str = ""
+    over_budget: bool = False               # ook de zuinigste modus past niet: de run waarschuwt (of stopt met --strict)
+
+    @property
+    def chunked(self) -> bool:
+        return self.mode != "in_memory"
+
+    def downgraded(self, what: str) -> bool:
+        return what in self.downgrades
+
+    def line(self) -> str:
+        fp = self.footprint
+        rows = f"{'' if fp.exact_rows else '~'}{fp.rows} rijen x {fp.columns} kolommen"
+        out = f"{self.mode} (budget {_mb(self.budget)}, schatting {_mb(self.estimate)}, {rows}"
+        if self.chunked:
+            out += f", chunks van {self.chunk_rows} rijen"
+        out += ")"
+        if self.downgrades:
+            out += "; downgrade: " + ", ".join(DOWNGRADES[d] for d in self.downgrades)
+        return out + (f"; {self.note}" if self.note else "")
+
+    def as_dict(self) -> Dict[str, Any]:
+        fp = self.footprint
+        return {"mode": self.mode, "budget_mb": round(self.budget / 2**20, 1),
+                "estimate_mb": round(self.estimate / 2**20, 1), "rows": fp.rows, "exact_rows": fp.exact_rows,
+                "columns": fp.columns, "row_bytes": round(fp.row_bytes, 1), "chunk_rows": self.chunk_rows,
+                "downgrades": list(self.downgrades), "note": self.note, "over_budget": self.over_budget}
+
+
+def streaming_blocker(cfg: TransformConfig, spec: Optional[SampleSpec] = None) -> Optional[str]:
+    """Reden waarom deze config niet in chunks kan (None = kan wel)."""
+    meta = cfg.meta or {}
+    if meta.get("sources"):
+        return "meta.sources/joins"
+    if spec is not None:
+        return "sample"
+    if any(s["policy"] == "reject_all" for s in unique_key_specs(meta)):
+        return "unique_keys reject_all"
+    return None
+
+
+def plan_execution(cfg: TransformConfig, budget: int, spec: Optional[SampleSpec] = None,
+                   report_stages: Sequence[str] = (), trace_alloc: bool = False) -> ExecutionPlan:
+    """Kies de uitvoeringsmodus binnen ``budget`` (bytes); optionele stages eerst afschalen, dan chunken."""
+    fp = estimate_footprint(cfg, spec)
+    frame = fp.frame_bytes
+    base = int(frame * FRAME_FACTOR + fp.rows * ROW_OVERHEAD + fp.extra_bytes)
+    optional: List[str] = []
+    extra = 0
+    if report_stages:
+        optional.append("report_sample"); extra += frame                   # df.copy() per rapport
+    if "post" in report_stages:
+        optional.append("post_delta"); extra += frame                      # RAW baseline vastgehouden
+    if trace_alloc:
+        optional.append("trace_alloc"); extra += frame                     # tracemalloc administratie
+    if base + extra <= budget:
+        return ExecutionPlan("in_memory", budget, fp, base + extra)
+    if base <= budget:
+        return ExecutionPlan("in_memory", budget, fp, base, downgrades=optional)
+    blocker = streaming_blocker(cfg, spec)
+    if blocker:
+        return ExecutionPlan("in_memory", budget, fp, base, downgrades=optional,
+                             note=f"chunken kan niet ({blocker}); budget kan overschreden worden", over_budget=True)
+    per_row = fp.row_bytes * FRAME_FACTOR + ROW_OVERHEAD
+    chunk_rows = int(min(max(budget * CHUNK_SHARE / max(per_row, 1.0), MIN_CHUNK_ROWS), MAX_CHUNK_ROWS))
+    chunk = int(chunk_rows * per_row)
+    downgrades = list(optional)
+    streaming = chunk + fp.rows * STREAM_ROW_BYTES
+    if streaming <= budget:
+        return ExecutionPlan("streaming", budget, fp, streaming, chunk_rows, downgrades)
+    spill = chunk + (fp.rows * KEY_ROW_BYTES if unique_key_specs(cfg.meta) else 0)
+    if details_format(cfg.meta, bool(report_stages)) == "parquet":
+        downgrades.append("details_csv")
+    note = "" if spill <= budget else "ook spill past niet binnen het budget"
+    return ExecutionPlan("spill", budget, fp, spill, chunk_rows, downgrades, note, over_budget=spill > budget)
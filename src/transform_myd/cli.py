@@ -1,10 +1,14 @@
 from __future__ import annotations
 import argparse
 from pathlib import Path
-from .pipeline import run_pipeline
-from .linting import lint_config, lint_all
-from .runlist import run_from_runlist
-from .scaffold import scaffold
+# Zware modules (pandas/openpyxl via pipeline) pas importeren in de branch die ze nodig heeft:
+# --help, --lint en --scaffold blijven zo snel.
+
+def _positive_int(value: str) -> int:
+   try: n = int(value)
+   except ValueError: raise argparse.ArgumentTypeError(f"geen geheel getal: {value!r}")
+   if n < 1: raise argparse.ArgumentTypeError(f"moet >= 1 zijn, niet {n}")
+   return n
 
 def parse_args():
    # ASCII-only description (Windows consoles met cp1252)
@@ -25,7 +29,17 @@ def parse_args():
    p.add_argument("--logdir", dest="log_dir", default="logs",
                   help="Log directory (default: ./logs)")
    p.add_argument("--sample", type=int, default=None,
-                  help="Alleen de eerste N rijen verwerken (na load/join).")
+                  help="Alleen N rijen verwerken; de loader leest/parst alleen wat nodig is.")
+   p.add_argument("--sample-mode", choices=["head","random","stratified"], default=None,
+                  help="head = eerste N (default), random = reservoir sample, stratified = per --sample-by.")
+   p.add_argument("--sample-seed", type=int, default=None,
+                  help="Seed voor random/stratified sample (reproduceerbaar).")
+   p.add_argument("--sample-by", default=None,
+                  help="Sleutelkolom voor --sample-mode stratified.")
+   p.add_argument("--workers", type=int, default=None,
+                  help="Row-partitioned uitvoering van sanitize/maps/transforms/validate in N processen (0 = alle cores; default: meta.engine.workers of 1).")
+   p.add_argument("--memory-budget", default=None,
+                  help="Geheugenbudget per job (bijv. 4GB, 512MB, auto): kiest in-memory, streaming of spill en schaalt optionele stages af (default: meta.engine.memory_budget).")
    p.add_argument("--report", action="store_true",
                   help="Genereer rapport(en).")
    p.add_argument("--report-format", choices=["md","html","both"], default="html",
@@ -37,6 +51,8 @@ def parse_args():
                   help="Maak boilerplate config voor <OBJECT> of <OBJECT_VARIANT>.")
    p.add_argument("--from-excel", dest="from_excel", default=None,
                   help="Neem headers uit Excel voor column_map.yaml")
+   p.add_argument("--infer-rules", action="store_true",
+                  help="Scaffold: leid concept value_rules/value_map af uit een sample van --from-excel (--sample N, default 1000).")
    p.add_argument("--force", action="store_true",
                   help="Overschrijf bestaande files bij scaffold.")
    p.add_argument("--dry-run", action="store_true",
@@ -44,12 +60,34 @@ def parse_args():
    # RUNLIST & LINT
    p.add_argument("--runlist", dest="runlist_path", default=None,
                   help="YAML met batch runs (zie voorbeeld).")
+   p.add_argument("--prefetch", type=int, default=None,
+                  help="Runlist: lees de bron van de volgende N job(s) in terwijl de huidige rekent, en schrijf exports asynchroon (0 = uit; default: runlist pipeline.prefetch of 1).")
    p.add_argument("--lint", action="store_true",
                   help="Lint de geselecteerde config (object/variant of runlist).")
    p.add_argument("--lint-all", action="store_true",
                   help="Lint alle objecten/varianten onder config/.")
    p.add_argument("--strict", action="store_true",
                   help="Warnings behandelen als errors (exit 1).")
+   p.add_argument("--lint-format", choices=["text","json","sarif"], default="text",
+                  help="Uitvoerformaat voor --lint en --lint-all (default: text; json/sarif voor CI).")
+   p.add_argument("--lint-workers", type=_positive_int, default=None,
+                  help="Aantal parallelle lint-threads voor --lint-all (default: auto).")
+   # REJECT ANALYTICS
+   p.add_argument("--reject-stats", nargs="?", const="", default=None, metavar="PAD",
+                  help="Toon reasons, per-kolom breakdown en top-waarden uit een reject details artifact (bestand of map; default: nieuwste in --logdir).")
+   p.add_argument("--reject-top", type=int, default=10,
+                  help="Aantal reasons in --reject-stats (default: 10).")
+   # WATCH
+   p.add_argument("--watch", action="store_true",
+                  help="Blijf draaien en verwerk nieuwe bestanden in dirs.raw (match op naming.input/input_file).")
+   p.add_argument("--watch-interval", type=float, default=2.0,
+                  help="Poll-interval in seconden (default: 2).")
+   p.add_argument("--watch-settle", type=float, default=3.0,
+                  help="Bestand moet N seconden ongewijzigd zijn voor verwerking (default: 3).")
+   p.add_argument("--watch-workers", type=int, default=2,
+                  help="Max. gelijktijdige jobs in watch-modus (default: 2).")
+   p.add_argument("--watch-existing", action="store_true",
+                  help="Verwerk ook bestanden die al bij start aanwezig zijn.")
    # TRACE & LOGGING
    p.add_argument("--trace-config", action="store_true",
                   help="Toon merge-lagen en gevonden YAML-bestanden.")
@@ -57,6 +95,12 @@ def parse_args():
                   help="Schrijf geen legacy TXT per-record log.")
    p.add_argument("--quiet", action="store_true",
                   help="Minimaliseer console-uitvoer (kernmeldingen + Summary).")
+   p.add_argument("--metrics", action="store_true",
+                  help="Meet tijd/CPU/geheugen per stage; print tabel en schrijf JSON metrics in logdir.")
+   p.add_argument("--profile", nargs="?", const="cprofile", choices=["cprofile","sampling"], default=None,
+                  help="Profileer elke stage (cProfile; 'sampling' = pyinstrument indien geinstalleerd). Dumps + hotspots in logdir.")
+   p.add_argument("--profile-top", type=int, default=20,
+                  help="Aantal hotspots per stage in de profile samenvatting (default: 20).")
    p.add_argument("--classic-summary", action="store_true",
                   help="Print ook het oude blok-achtige summary overzicht (optioneel).")
    # CI & EXIT
@@ -91,39 +135,69 @@ def main():
        args.fail_on_zero_valid = True
    # Scaffold?
    if args.scaffold_object:
+       from .scaffold import scaffold
        scaffold(Path(args.config_dir),
                 args.scaffold_object,
                 Path(args.from_excel) if args.from_excel else None,
-                force=args.force, dry_run=args.dry_run)
+                force=args.force, dry_run=args.dry_run, infer=args.infer_rules,
+                sample_rows=args.sample, sample_mode=args.sample_mode or "head", sample_seed=args.sample_seed)
        return
    # Runlist?
    if args.runlist_path:
+       from .runlist import run_from_runlist
        if args.lint:
+           if args.lint_format != "text":
+               raise SystemExit("--lint-format json/sarif werkt met --lint (object/variant) en --lint-all, niet met --runlist.")
            code = run_from_runlist(Path(args.config_dir), Path(args.runlist_path),
                                    lint_only=True, strict=args.strict, trace=args.trace_config,
                                    global_sample=args.sample, global_report=args.report,
+                                   global_sample_mode=args.sample_mode, global_sample_seed=args.sample_seed,
+                                   global_sample_by=args.sample_by,
                                    global_report_format=args.report_format,
                                    quiet=args.quiet, no_txt_log=args.no_txt_log,
                                    classic_summary=args.classic_summary,
                                    fail_on_rejects=args.fail_on_rejects,
-                                   fail_on_zero_valid=args.fail_on_zero_valid)
+                                   fail_on_zero_valid=args.fail_on_zero_valid,
+                                   global_metrics=args.metrics, log_dir=args.log_dir,
+                                   global_profile=args.profile, profile_top=args.profile_top,
+                                   global_workers=args.workers, global_prefetch=args.prefetch,
+                                   global_memory_budget=args.memory_budget)
            raise SystemExit(code)
        else:
            code = run_from_runlist(Path(args.config_dir), Path(args.runlist_path),
                                    lint_only=False, strict=args.strict, trace=args.trace_config,
                                    global_sample=args.sample, global_report=args.report,
+                                   global_sample_mode=args.sample_mode, global_sample_seed=args.sample_seed,
+                                   global_sample_by=args.sample_by,
                                    global_report_format=args.report_format,
                                    quiet=args.quiet, no_txt_log=args.no_txt_log,
                                    classic_summary=args.classic_summary,
                                    fail_on_rejects=args.fail_on_rejects,
-                                   fail_on_zero_valid=args.fail_on_zero_valid)
+                                   fail_on_zero_valid=args.fail_on_zero_valid,
+                                   global_metrics=args.metrics, log_dir=args.log_dir,
+                                   global_profile=args.profile, profile_top=args.profile_top,
+                                   global_workers=args.workers, global_prefetch=args.prefetch,
+                                   global_memory_budget=args.memory_budget)
            raise SystemExit(code)
+   # Reject stats? (leest alleen het artifact, geen pipeline-run)
+   if args.reject_stats is not None:
+       from .rejects import print_reject_stats
+       raise SystemExit(print_reject_stats(Path(args.reject_stats or args.log_dir), top=args.reject_top))
+   # Watch?
+   if args.watch:
+       from .watch import watch
+       raise SystemExit(watch(args, interval=args.watch_interval, settle=args.watch_settle,
+                              workers=args.watch_workers, process_existing=args.watch_existing))
    # Lint?
    if args.lint_all:
-       raise SystemExit(lint_all(Path(args.config_dir), strict=args.strict))
+       from .linting import lint_all
+       raise SystemExit(lint_all(Path(args.config_dir), strict=args.strict,
+                                 fmt=args.lint_format, workers=args.lint_workers))
    if args.lint:
+       from .linting import lint_config
        raise SystemExit(lint_config(args))
    # Single run
+   from .pipeline import run_pipeline
    res = run_pipeline(args)
    exit_code = 0
    if args.fail_on_rejects and res.get("rejected", 0) > 0:
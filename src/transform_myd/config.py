@@ -1,4 +1,6 @@
 from __future__ import annotations
+import copy
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -31,10 +33,26 @@ def parse_object_variant(obj: Optional[str], var: Optional[str]) -> Tuple[Option
         return left, right
     return obj, var
 
+# Parsed YAML per bestand, gedeeld door lint-all threads en runlist jobs.
+# Key bevat mtime/size zodat een gewijzigde laag vanzelf opnieuw wordt geparsed.
+_YAML_CACHE: Dict[Path, Tuple[int, int, Any]] = {}
+_YAML_LOCK = threading.Lock()
+
 def yaml_load_if_exists(path: Path):
-    if path.exists():
-        return yaml.safe_load(path.read_text(encoding="utf-8"))
-    return None
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    key = path.resolve()
+    with _YAML_LOCK:
+        hit = _YAML_CACHE.get(key)
+    if hit is None or hit[:2] != (st.st_mtime_ns, st.st_size):
+        data = yaml.safe_load(path.read_text(encoding="utf-8"))
+        with _YAML_LOCK:
+            _YAML_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
+    else:
+        data = hit[2]
+    return copy.deepcopy(data)
 
 def assemble_layers(config_root: Path, object_name: Optional[str], variant_name: Optional[str]) -> List[Path]:
     layers = [config_root / "_shared"]
@@ -46,6 +64,17 @@ def assemble_layers(config_root: Path, object_name: Optional[str], variant_name:
             layers.append(config_root / object_name)
     return [p for p in layers if p.exists()]
 
+def discover_targets(config_root: Path) -> List[Tuple[str, Optional[str]]]:
+    """Alle (object, variant) combinaties onder config_root; object zonder varianten → (object, None)."""
+    targets: List[Tuple[str, Optional[str]]] = []
+    for obj_path in sorted([p for p in config_root.iterdir() if p.is_dir() and p.name != "_shared"]):
+        variants = sorted(p.name for p in obj_path.iterdir() if p.is_dir() and p.name != "_shared")
+        if variants:
+            targets.extend((obj_path.name, var) for var in variants)
+        else:
+            targets.append((obj_path.name, None))
+    return targets
+
 def trace_layers(config_root: Path, object_name: Optional[str], variant_name: Optional[str], quiet: bool=False) -> None:
     layers = assemble_layers(config_root, object_name, variant_name)
     _print("• Config layers (least → most specific):", quiet)
@@ -100,7 +129,8 @@ def _join_if_relative(base: Path, maybe_path: str | Path) -> Path:
     p = Path(maybe_path)
     return p if p.is_absolute() else (base / p)
 
-def build_config(args) -> TransformConfig:
+def build_config(args, create_dirs: bool = True) -> TransformConfig:
+    """Merge YAML-lagen en bepaal paden; create_dirs=False maakt niets aan (lint = alleen lezen)."""
     config_root = Path(args.config_dir)
     obj, var = parse_object_variant(args.object_name, args.variant_name)
     if getattr(args, "trace_config", False):
@@ -116,7 +146,8 @@ def build_config(args) -> TransformConfig:
     dirs_defaults = {"raw": "data/raw","out": "data/out","rejects": "data/rejects"}
     dirs = deep_merge(dirs_defaults, (meta.get("dirs") or {}))
     raw_dir, out_dir, rej_dir = Path(dirs["raw"]), Path(dirs["out"]), Path(dirs["rejects"])
-    for d in (raw_dir, out_dir, rej_dir): d.mkdir(parents=True, exist_ok=True)
+    if create_dirs:
+        for d in (raw_dir, out_dir, rej_dir): d.mkdir(parents=True, exist_ok=True)
 
     # Naming (defaults al op underscore-stijl)
     naming = meta.get("naming") or {}
@@ -149,9 +180,11 @@ def build_config(args) -> TransformConfig:
     else:
         reject_file = rej_dir / _expand(pat_rejects, tok)
 
-    log_dir = Path(args.log_dir); log_dir.mkdir(parents=True, exist_ok=True)
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    reject_file.parent.mkdir(parents=True, exist_ok=True)
+    log_dir = Path(args.log_dir)
+    if create_dirs:
+        log_dir.mkdir(parents=True, exist_ok=True)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        reject_file.parent.mkdir(parents=True, exist_ok=True)
 
     return TransformConfig(
         column_map, value_map, value_rules, meta,
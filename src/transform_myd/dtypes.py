@@ -0,0 +1,60 @@
+from __future__ import annotations
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+# meta.engine.string_dtype → pandas dtype voor tekstkolommen
+STRING_DTYPES = {
+    "object": None,                      # legacy: Python str objecten
+    "python": "string[python]",
+    "pyarrow": "string[pyarrow]",
+}
+
+
+def resolve_string_dtype(meta: Optional[Dict[str, Any]]) -> Optional[str]:
+    name = str((((meta or {}).get("engine") or {}).get("string_dtype")) or "object").lower()
+    if name not in STRING_DTYPES:
+        raise SystemExit(f"meta.engine.string_dtype '{name}' onbekend (kies uit {', '.join(STRING_DTYPES)}).")
+    if name == "pyarrow":
+        try:
+            import pyarrow  # noqa: F401  (optioneel)
+        except ImportError:
+            raise SystemExit("meta.engine.string_dtype: pyarrow vereist het pakket 'pyarrow' (pip install pyarrow).")
+    return STRING_DTYPES[name]
+
+
+def is_text_dtype(s: pd.Series) -> bool:
+    """True voor pandas StringDtype (python/pyarrow) en ArrowDtype(string)."""
+    dt = s.dtype
+    if isinstance(dt, pd.StringDtype):
+        return True
+    return isinstance(dt, getattr(pd, "ArrowDtype", ())) and "string" in str(dt)
+
+
+def is_arrow_text(s: pd.Series) -> bool:
+    """Tekstkolom met Arrow-opslag: .str-operaties draaien dan gevectoriseerd in C++."""
+    dt = s.dtype
+    if isinstance(dt, pd.StringDtype):
+        return dt.storage in ("pyarrow", "pyarrow_numpy")
+    return is_text_dtype(s)
+
+
+def as_text(s: pd.Series) -> pd.Series:
+    """Als ``astype(str)``, maar laat string-dtypes (Arrow) ongemoeid i.p.v. ze naar object te kopiëren."""
+    return s if is_text_dtype(s) else s.astype(str)
+
+
+def restore_dtype(s: pd.Series, like: pd.Series) -> pd.Series:
+    """Zet een (object-)resultaat terug naar het string-dtype van de invoer (na custom/apply boundaries)."""
+    if is_text_dtype(like) and s.dtype != like.dtype:
+        return s.astype(like.dtype)
+    return s
+
+
+def apply_string_dtype(df: pd.DataFrame, dtype: Optional[str]) -> pd.DataFrame:
+    if not dtype:
+        return df
+    cols = [c for c in df.columns if df[c].dtype == object or is_text_dtype(df[c])]
+    if not cols:
+        return df
+    return df.astype({c: dtype for c in cols})
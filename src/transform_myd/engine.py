@@ -0,0 +1,145 @@
+from __future__ import annotations
+from argparse import Namespace
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import TransformConfig, build_config, parse_object_variant
+from .dtypes import apply_string_dtype, resolve_string_dtype
+from .mappings import apply_value_maps
+from .metrics import RunMetrics
+from .partition import MIN_PARTITION_ROWS, PartitionedExecutor
+from .rejects import RejectRecords
+from .pipeline import _add_lineage, _carry_lineage, _export_frame, _maybe_sanitize_texts
+from .sampling import SampleSpec, sample_frame
+from .transforms import apply_transforms
+from .validate import apply_unique_keys, apply_value_rules, unique_key_specs
+
+
+@dataclass
+class EngineResult:
+    output: pd.DataFrame                 # export-klaar (doelkolommen), alleen geldige rijen
+    valid: pd.DataFrame                  # geldige rijen, bronkolommen (+ lineage)
+    rejects: pd.DataFrame                # afgekeurde rijen incl. __errors
+    errors: Dict[Any, List[str]]         # rij-index → foutmeldingen
+    error_mask: pd.DataFrame             # bool per (rij, kolom met rules)
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    reject_details: pd.DataFrame = field(default_factory=pd.DataFrame)   # 1 rij per (rij, kolom, rule, melding)
+
+    @property
+    def summary(self) -> Dict[str, int]:
+        return {"total": len(self.valid) + len(self.rejects), "valid": len(self.valid), "rejected": len(self.rejects)}
+
+
+def _error_mask(details: pd.DataFrame, index: pd.Index, columns: List[str]) -> pd.DataFrame:
+    """Bool per (rij, kolom) direct uit de reject details: positioneel, zonder prefix-matching op meldingen."""
+    mask = np.zeros((len(index), len(columns)), dtype=bool)
+    if len(details):
+        rows = index.get_indexer(details["row"])
+        cols = pd.Index(columns).get_indexer(details["column"])
+        ok = (rows >= 0) & (cols >= 0)
+        mask[rows[ok], cols[ok]] = True
+    return pd.DataFrame(mask, index=index, columns=columns)
+
+
+class Engine:
+    """In-memory pipeline: config één keer samenstellen, daarna run(df) zonder disk round-trips.
+
+    >>> eng = Engine.from_config_dir("config", "M140", "BNKA")
+    >>> res = eng.run(df)          # DataFrame of pyarrow.Table
+    >>> res.output, res.rejects, res.error_mask
+    """
+
+    def __init__(self, config: TransformConfig, label: Optional[str] = None, *, lineage: bool = True,
+                 keep_lineage: bool = False, sanitize: bool = True, write_outputs: bool = False,
+                 workers: int = 1, min_partition_rows: int = MIN_PARTITION_ROWS):
+        self.config = config
+        self.label = label or "ENGINE"
+        self.lineage = lineage
+        self.keep_lineage = keep_lineage
+        self.sanitize = sanitize
+        self.write_outputs = write_outputs
+        self.workers = workers
+        self.min_partition_rows = min_partition_rows
+
+    @classmethod
+    def from_config_dir(cls, config_dir: str | Path = "config", object_name: Optional[str] = None,
+                        variant_name: Optional[str] = None, **kw) -> "Engine":
+        obj, var = parse_object_variant(object_name, variant_name)
+        ns = Namespace(object_name=obj, variant_name=var, config_dir=str(config_dir),
+                       input_file=None, output_file=None, reject_file=None, log_dir="logs",
+                       trace_config=False, quiet=True)
+        cfg = build_config(ns, create_dirs=False)
+        label = f"{obj}_{var}" if obj and var else (obj or "UNSPECIFIED")
+        return cls(cfg, label=kw.pop("label", label), **kw)
+
+    def run(self, data: Any, *, sample: int | SampleSpec | None = None, write: Optional[bool] = None,
+            ingest_ts: Optional[datetime] = None) -> EngineResult:
+        """``ingest_ts``: herkomsttijd van ``data`` voor ``__ingest_ts`` (anders leeg: er is geen bronbestand).
+
+        Een niet-unieke index wordt vervangen door 0..n-1 (fouten en details verwijzen naar indexlabels).
+        """
+        cfg = self.config
+        if hasattr(data, "to_pandas"):            # pyarrow.Table / RecordBatch
+            df = data.to_pandas()
+        else:
+            df = data.copy()                      # nooit het frame van de aanroeper muteren
+        if not df.index.is_unique:
+            df = df.reset_index(drop=True)
+        df = df.rename(columns=lambda c: str(c).strip())
+        df = apply_string_dtype(df, resolve_string_dtype(cfg.meta))
+        if sample:
+            df = sample_frame(df, sample if isinstance(sample, SampleSpec) else SampleSpec(int(sample)))
+
+        m = RunMetrics(self.label)
+        px = PartitionedExecutor(cfg, self.workers, self.min_partition_rows)
+        records = RejectRecords()
+        parallel = px.enabled(len(df))
+        try:
+            if self.sanitize:
+                with m.stage("sanitize", rows=len(df)):
+                    df = px.sanitize(df) if parallel else _maybe_sanitize_texts(df, cfg)
+            with m.stage("lineage", rows=len(df)):
+                df = _add_lineage(df, self.label, cfg, Namespace(no_lineage=not self.lineage),
+                                  ingest=ingest_ts, ingest_from_file=False,
+                                  source_rows=bool(sample) and getattr(sample, "mode", "head") != "head")
+            if parallel:
+                with m.stage("partitioned", rows=len(df)):
+                    df, valid_df, reject_df, errors = px.maps_transforms_validate(df, records)
+            else:
+                with m.stage("maps", rows=len(df)):
+                    df = apply_value_maps(df, cfg.value_map)
+                    for col in cfg.column_map:
+                        if col not in df.columns: df[col] = ""
+                with m.stage("transforms", rows=len(df)):
+                    df = apply_transforms(df, cfg.value_rules)
+                with m.stage("validate", rows=len(df)):
+                    valid_df, reject_df, errors = apply_value_rules(df, cfg.value_rules, records)
+            unique_specs = unique_key_specs(cfg.meta)
+            if unique_specs:
+                with m.stage("unique_keys", rows=len(df)):
+                    valid_df, reject_df, errors = apply_unique_keys(df, unique_specs, errors, records)
+        finally:
+            px.close()
+        lineage_cols = _carry_lineage(df, valid_df, reject_df)
+        out_df = _export_frame(valid_df, cfg, lineage_cols, self.keep_lineage)
+        details = records.frame(df)
+        mask = _error_mask(details, df.index, list((cfg.value_rules or {}).keys()))
+
+        if write if write is not None else self.write_outputs:
+            with m.stage("export", rows=len(out_df) + len(reject_df)):
+                self._write(out_df, reject_df)
+        m.close()
+        return EngineResult(out_df, valid_df, reject_df, errors, mask, m.as_dict(), details)
+
+    def _write(self, out_df: pd.DataFrame, reject_df: pd.DataFrame) -> None:
+        cfg = self.config
+        enc_cfg = ((cfg.meta or {}).get("encoding") or {})
+        for path in (cfg.output_file, cfg.reject_file):
+            path.parent.mkdir(parents=True, exist_ok=True)
+        out_df.to_csv(cfg.output_file, index=False, encoding=enc_cfg.get("output") or "utf-8-sig")
+        reject_df.to_csv(cfg.reject_file, index=False, encoding=enc_cfg.get("rejects") or "utf-8-sig")
@@ -0,0 +1,125 @@
+from __future__ import annotations
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+DEFAULT_SAMPLE_ROWS = 1000
+MAX_MAP_VALUES = 20          # value_map concept alleen voor kolommen met weinig verschillende waarden
+MAX_ZFILL_WIDTH = 18
+
+# Tekenklassen voor patroon-kandidaten, van smal naar breed (eerste die alles dekt wint)
+_CLASSES = ("[0-9]", "[A-Z]", "[A-Z0-9]")
+
+
+@dataclass
+class ColumnProfile:
+    column: str
+    rows: int
+    empty: int
+    distinct: int
+    min_len: int
+    max_len: int
+    char_class: Optional[str]            # [0-9] / [A-Z] / [A-Z0-9] als alle gevulde waarden erin passen
+    leading_zero: bool                   # numerieke waarden met voorloopnullen
+    top: List[Tuple[str, int]] = field(default_factory=list)
+
+    @property
+    def empty_rate(self) -> float:
+        return self.empty / self.rows if self.rows else 0.0
+
+    def rule(self) -> Dict[str, Any]:
+        """Concept value_rules entry (alleen wat de sample ondersteunt)."""
+        out: Dict[str, Any] = {}
+        filled = self.rows - self.empty
+        if self.rows and self.empty == 0:
+            out["required"] = True
+        if not filled:
+            return out
+        if self.char_class == "[0-9]" and self.leading_zero and self.max_len <= MAX_ZFILL_WIDTH:
+            out["transforms"] = ["strip", {"zfill": self.max_len}]
+            width = f"{{{self.max_len}}}"          # na zfill hebben alle waarden de volle breedte
+        else:
+            width = f"{{{self.min_len}}}" if self.min_len == self.max_len else f"{{{self.min_len},{self.max_len}}}"
+        if self.char_class:
+            out["pattern"] = f"^{self.char_class}{width}$"
+        out["max_length"] = self.max_len
+        return out
+
+
+def profile_frame(df: pd.DataFrame, top: int = MAX_MAP_VALUES) -> List[ColumnProfile]:
+    """Profiel per kolom op een (kleine) sample; gevectoriseerd per kolom, geen per-cel Python."""
+    profiles: List[ColumnProfile] = []
+    for col in df.columns:
+        s = df[col].astype("string").fillna("").str.strip()
+        filled = s[s != ""]
+        lengths = filled.str.len()
+        char_class = None
+        if len(filled):
+            for cls in _CLASSES:
+                if bool(filled.str.fullmatch(cls + "+").all()):
+                    char_class = cls
+                    break
+        counts = filled.value_counts()
+        profiles.append(ColumnProfile(
+            column=str(col), rows=len(s), empty=int(len(s) - len(filled)), distinct=int(len(counts)),
+            min_len=int(lengths.min()) if len(filled) else 0, max_len=int(lengths.max()) if len(filled) else 0,
+            char_class=char_class,
+            leading_zero=char_class == "[0-9]" and bool(filled.str.startswith("0").any()),
+            top=[(str(v), int(c)) for v, c in counts.head(top).items()],
+        ))
+    return profiles
+
+
+def _q(v: str) -> str:
+    return json.dumps(v, ensure_ascii=False)        # YAML double-quoted scalar
+
+
+def _yaml_value(v: Any) -> str:
+    if isinstance(v, bool):
+        return "true" if v else "false"
+    if isinstance(v, int):
+        return str(v)
+    if isinstance(v, list):
+        return "[" + ", ".join(_yaml_value(x) for x in v) + "]"
+    if isinstance(v, dict):
+        return "{" + ", ".join(f"{k}: {_yaml_value(x)}" for k, x in v.items()) + "}"
+    if isinstance(v, str) and v.startswith("^"):
+        return "'" + v.replace("'", "''") + "'"
+    return str(v)
+
+
+def render_value_rules(profiles: List[ColumnProfile]) -> str:
+    lines = [f"# value_rules.yaml — CONCEPT, afgeleid uit een sample van {profiles[0].rows if profiles else 0} rijen.",
+             "# Controleer elke regel: required/pattern/max_length gelden alleen voor wat in de sample zat."]
+    for p in profiles:
+        lines.append("")
+        lines.append(f"# {_q(p.column)}: leeg {p.empty_rate:.1%}, lengte {p.min_len}..{p.max_len}, {p.distinct} verschillend")
+        rule = p.rule()
+        if not rule:
+            lines.append(f"#{_q(p.column)}: {{}}")
+            continue
+        lines.append(f"{_q(p.column)}:")
+        lines += [f"  {k}: {_yaml_value(v)}" for k, v in rule.items()]
+    return "\n".join(lines) + "\n"
+
+
+def render_value_map(profiles: List[ColumnProfile], max_values: int = MAX_MAP_VALUES) -> str:
+    """Concept value_map: identiteit per waarde (met aantal) voor kolommen met weinig verschillende waarden."""
+    lines = ["# value_map.yaml — CONCEPT: kolommen met weinig verschillende waarden; pas de doelwaarden aan."]
+    body = False
+    for p in profiles:
+        filled = p.rows - p.empty
+        if not (1 < p.distinct <= max_values) or filled < 2 * p.distinct:
+            continue
+        body = True
+        lines.append(f"{_q(p.column)}:")
+        lines += [f"  {_q(v)}: {_q(v)}  # {c}x" for v, c in p.top]
+    return "\n".join(lines) + "\n" if body else "{}\n"
+
+
+def infer_config(df: pd.DataFrame, max_values: int = MAX_MAP_VALUES) -> Tuple[str, str]:
+    """(value_rules.yaml, value_map.yaml) teksten uit een sample frame."""
+    profiles = profile_frame(df, top=max_values)
+    return render_value_rules(profiles), render_value_map(profiles, max_values)
@@ -1,14 +1,139 @@
 from __future__ import annotations
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
 
 from .config import TransformConfig
+from .dtypes import apply_string_dtype, resolve_string_dtype
+from .joins import apply_join, load_source_cached
+from .sampling import SampleSpec, sample_chunks, sample_frame
 
+try:
+    from pandas._libs.parsers import STR_NA_VALUES as _NA_STRINGS
+except Exception:  # pragma: no cover - pandas intern
+    _NA_STRINGS = {"", "#N/A", "#NA", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"}
 
-def _read_excel_df(path: Path, sheet: Any | None, dtype: Any = "string") -> pd.DataFrame:
-    kw = dict(dtype=str if dtype == "string" else dtype, engine="openpyxl")
+STREAM_CHUNK_ROWS = 50_000
+
+
+def _is_csv(path: Path) -> bool:
+    return Path(path).suffix.lower() in (".csv", ".txt")
+
+
+def _read_csv_df(path: Path, dtype: Any = "string", encoding: str = "utf-8-sig", nrows: Optional[int] = None) -> pd.DataFrame:
+    df = pd.read_csv(path, dtype=str if dtype == "string" else dtype, encoding=encoding, nrows=nrows)
+    return df.rename(columns=str.strip)
+
+
+def _excel_cell_str(v: Any) -> Any:
+    # zelfde conversie als pandas' openpyxl reader + dtype=str + default na_values
+    if v is None:
+        return None
+    if isinstance(v, float) and v.is_integer():
+        v = int(v)
+    s = str(v)
+    return None if s in _NA_STRINGS else s
+
+
+def _worksheet(wb: Any, sheet: Any | None) -> Any:
+    return wb.worksheets[sheet or 0] if sheet is None or isinstance(sheet, int) else wb[sheet]
+
+
+def _trim_trailing_empty(rows: Iterator[tuple]) -> Iterator[tuple]:
+    """Als pd.read_excel: lege rijen aan het eind van de sheet vallen weg, lege rijen ertussen blijven."""
+    pending: List[tuple] = []
+    for row in rows:
+        if all(v is None or v == "" for v in row):
+            pending.append(row)
+            continue
+        if pending:
+            yield from pending
+            pending = []
+        yield row
+
+
+@contextmanager
+def _excel_rows(path: Path, sheet: Any | None) -> Iterator[Tuple[List[str], Iterator[tuple]]]:
+    """(header, rij-iterator) van een sheet via openpyxl read-only: rijen worden pas bij gebruik geparsed."""
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        rows = _worksheet(wb, sheet).iter_rows(values_only=True)
+        header = [str(c).strip() if c is not None else f"Unnamed: {i}" for i, c in enumerate(next(rows, ()) or ())]
+        yield header, _trim_trailing_empty(rows)
+    finally:
+        wb.close()
+
+
+def _iter_excel_chunks(path: Path, sheet: Any | None, chunksize: int = STREAM_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Stream een sheet in DataFrame-chunks (openpyxl read-only); index = 0-based datarij."""
+    with _excel_rows(path, sheet) as (header, rows):
+        buf, start = [], 0
+        for row in rows:
+            buf.append([_excel_cell_str(v) for v in row[:len(header)]])
+            if len(buf) >= chunksize:
+                yield pd.DataFrame(buf, columns=header, index=range(start, start + len(buf)), dtype=object)
+                start += len(buf); buf = []
+        if buf:
+            yield pd.DataFrame(buf, columns=header, index=range(start, start + len(buf)), dtype=object)
+
+
+def read_head(path: Path, sheet: Any | None = None, nrows: int = 0, encoding: str = "utf-8-sig") -> pd.DataFrame:
+    """Header + eerste ``nrows`` datarijen; stopt na die rijen (ook bij Excel: geen volledige workbook-parse)."""
+    if _is_csv(path):
+        return _read_csv_df(path, encoding=encoding, nrows=nrows)
+    with _excel_rows(path, sheet) as (header, rows):
+        data = [[_excel_cell_str(v) for v in row[:len(header)]] for row in islice(rows, nrows)]
+    return pd.DataFrame(data, columns=header, dtype=object)
+
+
+def excel_row_count(path: Path, sheet: Any | None = None) -> Optional[int]:
+    """Aantal datarijen volgens de sheet-dimensie (read-only, geen rijen geparsed); None als die ontbreekt."""
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        max_row = _worksheet(wb, sheet).max_row
+        return max(int(max_row) - 1, 0) if max_row else None
+    finally:
+        wb.close()
+
+
+def _iter_csv_chunks(path: Path, encoding: str, chunksize: int = STREAM_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    for chunk in pd.read_csv(path, dtype=str, encoding=encoding, chunksize=chunksize):
+        yield chunk.rename(columns=str.strip)
+
+
+def iter_dataframe_chunks(cfg: TransformConfig, chunksize: int = STREAM_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Enkel-bron config in chunks (index = 0-based bronrij), in meta.engine.string_dtype zoals load_dataframe."""
+    meta = cfg.meta or {}
+    if meta.get("sources"):
+        raise SystemExit("Chunked uitvoering ondersteunt geen meta.sources/joins.")
+    enc_in = (meta.get("encoding") or {}).get("input", "utf-8-sig")
+    path = Path(cfg.input_file)
+    chunks = _iter_csv_chunks(path, enc_in, chunksize) if _is_csv(path) else _iter_excel_chunks(path, meta.get("sheet"), chunksize)
+    dtype = resolve_string_dtype(meta)
+    for chunk in chunks:
+        yield apply_string_dtype(chunk, dtype)
+
+
+def _read_sampled_df(path: Path, sheet: Any | None, spec: SampleSpec, encoding: str = "utf-8-sig") -> pd.DataFrame:
+    """Lees alleen wat de sample nodig heeft: head → nrows, random/stratified → streaming reservoir."""
+    if spec.read_limit is not None:
+        if _is_csv(path):
+            return _read_csv_df(path, encoding=encoding, nrows=spec.read_limit)
+        return _read_excel_df(path, sheet, nrows=spec.read_limit)
+    chunks = _iter_csv_chunks(path, encoding) if _is_csv(path) else _iter_excel_chunks(path, sheet)
+    return sample_chunks(chunks, spec)
+
+
+def _read_excel_df(path: Path, sheet: Any | None, dtype: Any = "string", encoding: str = "utf-8-sig",
+                   nrows: Optional[int] = None) -> pd.DataFrame:
+    if _is_csv(path):
+        return _read_csv_df(path, dtype=dtype, encoding=encoding, nrows=nrows)
+    kw = dict(dtype=str if dtype == "string" else dtype, engine="openpyxl", nrows=nrows)
     if sheet is None:
         df = pd.read_excel(path, sheet_name=0, **kw)
     else:
@@ -19,38 +144,61 @@ def _read_excel_df(path: Path, sheet: Any | None, dtype: Any = "string") -> pd.D
     return df.rename(columns=str.strip)
 
 
-def load_dataframe(cfg: TransformConfig) -> pd.DataFrame:
+def _source_dtype(sources, name: str) -> Any:
+    return next((s.get("dtype", "string") for s in sources if s["name"] == name), "string")
+
+
+def load_dataframe(cfg: TransformConfig, sample: Optional[SampleSpec] = None,
+                   join_stats: Optional[List[Any]] = None) -> pd.DataFrame:
+    """Laad de bron(nen) en zet tekstkolommen in meta.engine.string_dtype (default: object).
+
+    ``join_stats`` (lijst) krijgt per meta.joins entry een JoinStats (match rate, fanout, tijd).
+    """
+    df = _load_dataframe(cfg, sample, join_stats)
+    return apply_string_dtype(df, resolve_string_dtype(cfg.meta))
+
+
+def _load_dataframe(cfg: TransformConfig, sample: Optional[SampleSpec] = None,
+                    join_stats: Optional[List[Any]] = None) -> pd.DataFrame:
+    """Met ``sample`` wordt de basisbron read-limited/streaming gesampled."""
     meta = cfg.meta or {}
+    enc_in = (meta.get("encoding") or {}).get("input", "utf-8-sig")
     sources = meta.get("sources")
     if not sources:
         sheet = meta.get("sheet")
-        return _read_excel_df(cfg.input_file, sheet, dtype="string")
+        if sample is not None:
+            return _read_sampled_df(cfg.input_file, sheet, sample, encoding=enc_in)
+        return _read_excel_df(cfg.input_file, sheet, dtype="string", encoding=enc_in)
 
+    base_name = meta.get("base", sources[0]["name"])
+    filters = meta.get("filters", [])
     dfs: Dict[str, pd.DataFrame] = {}
     for src in sources:
         name = src["name"]
         path = Path(src["path"])
         sheet = src.get("sheet")
         dtype = src.get("dtype", "string")
-        dfs[name] = _read_excel_df(path, sheet, dtype=dtype)
+        enc = src.get("encoding", enc_in)
+        if sample is not None and name == base_name and not filters and dtype == "string":
+            dfs[name] = _read_sampled_df(path, sheet, sample, encoding=enc)
+        elif name != base_name:
+            # lookup-sources: gecached over joins en runlist jobs (zie joins.load_source_cached)
+            dfs[name] = load_source_cached(path, lambda p=path, s=sheet, d=dtype, e=enc: _read_excel_df(p, s, dtype=d, encoding=e),
+                                           sheet, str(dtype), enc)
+        else:
+            dfs[name] = _read_excel_df(path, sheet, dtype=dtype, encoding=enc)
 
-    base_name = meta.get("base", sources[0]["name"])
     df = dfs[base_name]
 
-    for f in meta.get("filters", []):
+    for f in filters:
         df = df.query(f)
+    if sample is not None and (filters or _source_dtype(sources, base_name) != "string"):
+        df = sample_frame(df, sample)
 
     for j in meta.get("joins", []):
-        right = dfs[j["right"]]
-        how = j.get("how", "left")
-        on = j.get("on")
-        left_on = j.get("left_on")
-        right_on = j.get("right_on")
-        suffixes = tuple(j.get("suffixes", ("", "_r")))
-        if on:
-            df = df.merge(right, how=how, on=on, suffixes=suffixes)
-        else:
-            df = df.merge(right, how=how, left_on=left_on, right_on=right_on, suffixes=suffixes)
+        df, stats = apply_join(df, dfs[j["right"]], j)
+        if join_stats is not None:
+            join_stats.append(stats)
 
     return df
 
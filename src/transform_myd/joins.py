@@ -0,0 +1,180 @@
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# meta.joins[].validate → pandas merge validate
+JOIN_VALIDATE = {"one_to_one": "1:1", "many_to_one": "m:1", "one_to_many": "1:m", "many_to_many": None}
+
+# Ingelezen right-sources en hun keyed index, gedeeld door joins en runlist jobs.
+# Key bevat mtime/size zodat een gewijzigde lookup-sheet vanzelf opnieuw wordt ingelezen.
+_SOURCE_CACHE: "OrderedDict[Tuple[Any, ...], Tuple[int, int, pd.DataFrame]]" = OrderedDict()
+_INDEX_CACHE: "OrderedDict[Tuple[Any, ...], Tuple[pd.DataFrame, RightIndex]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+MAX_CACHED_SOURCES = 8
+
+
+@dataclass
+class JoinStats:
+    right: str
+    how: str
+    mode: str                 # lookup (hash-positie + take) | merge
+    rows_left: int
+    rows_out: int
+    matched: int              # linker rijen met minstens 1 match
+    match_rate: float
+    max_fanout: int           # max. aantal right-rijen per gematchte sleutel
+    seconds: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def line(self) -> str:
+        return (f"{self.right} ({self.how}, {self.mode}): {self.matched}/{self.rows_left} match "
+                f"({self.match_rate:.1%}), fanout≤{self.max_fanout}, {self.rows_left}→{self.rows_out} rijen, {self.seconds:.2f}s")
+
+
+def _key_index(df: pd.DataFrame, keys: List[str]) -> pd.Index:
+    if len(keys) == 1:
+        return pd.Index(df[keys[0]])
+    return pd.MultiIndex.from_arrays([df[k] for k in keys])
+
+
+class RightIndex:
+    """Right-source (evt. beperkt tot ``columns``) geïndexeerd op de join-sleutel; tellingen/uniciteit één keer."""
+
+    def __init__(self, df: pd.DataFrame, keys: List[str]):
+        self.keys = keys
+        self.frame = df
+        self.index = _key_index(df, keys)
+        self.counts = self.index.value_counts(dropna=False)
+        self.unique = bool(self.index.is_unique)
+        self._padded: Optional[pd.DataFrame] = None
+
+    @property
+    def padded(self) -> pd.DataFrame:
+        """frame + één lege rij (positie len(frame)) voor niet-gematchte sleutels, zoals merge NaN invult."""
+        if self._padded is None:
+            empty = self.frame.iloc[:1].reindex([None])
+            self._padded = pd.concat([self.frame, empty], ignore_index=True)
+        return self._padded
+
+
+def load_source_cached(path: Path, loader: Callable[[], pd.DataFrame], *key: Any) -> pd.DataFrame:
+    """Lookup-source één keer lezen per (pad, sheet, dtype, encoding) + mtime/size. Niet muteren."""
+    try:
+        st = Path(path).stat(); sig = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return loader()
+    ck = (Path(path).resolve(),) + key
+    with _CACHE_LOCK:
+        hit = _SOURCE_CACHE.get(ck)
+        if hit is not None and hit[:2] == sig:
+            _SOURCE_CACHE.move_to_end(ck)
+            return hit[2]
+    df = loader()
+    with _CACHE_LOCK:
+        _SOURCE_CACHE[ck] = (*sig, df)
+        while len(_SOURCE_CACHE) > MAX_CACHED_SOURCES:
+            _SOURCE_CACHE.popitem(last=False)
+    return df
+
+
+def _right_index(source: pd.DataFrame, keys: List[str], cols: Optional[List[str]]) -> RightIndex:
+    # source is het (gecachte) source-frame zelf: zelfde object over joins/jobs → zelfde index
+    ck = (id(source), tuple(keys), tuple(cols) if cols is not None else None)
+    with _CACHE_LOCK:
+        hit = _INDEX_CACHE.get(ck)
+        if hit is not None and hit[0] is source:
+            _INDEX_CACHE.move_to_end(ck)
+            return hit[1]
+    frame = source if cols is None else source[list(dict.fromkeys(keys + cols))]
+    idx = RightIndex(frame, keys)
+    with _CACHE_LOCK:
+        _INDEX_CACHE[ck] = (source, idx)
+        while len(_INDEX_CACHE) > MAX_CACHED_SOURCES * 2:
+            _INDEX_CACHE.popitem(last=False)
+    return idx
+
+
+def _as_list(v: Any) -> List[str]:
+    return [v] if isinstance(v, str) else list(v or [])
+
+
+def _dup_sample(index: pd.Index, n: int = 3) -> str:
+    return ", ".join(map(str, index[index.duplicated()].unique()[:n]))
+
+
+def _lookup(left: pd.DataFrame, ridx: RightIndex, left_keys: List[str], right_keys: List[str],
+            how: str, suffixes: Tuple[str, str], pos: np.ndarray, hit: np.ndarray) -> pd.DataFrame:
+    """Many-to-one als positionele take; zelfde kolommen, volgorde, suffixes en NaN's als ``merge``."""
+    shared = {rk for lk, rk in zip(left_keys, right_keys) if lk == rk}   # merge houdt die sleutel één keer
+    take = [c for c in ridx.frame.columns if c not in shared]
+    overlap = [c for c in take if c in left.columns]
+    if how == "inner" or hit.all():
+        left, pos = left[hit], pos[hit]
+        part = ridx.frame[take].take(pos)
+    else:
+        part = ridx.padded[take].take(np.where(hit, pos, len(ridx.frame)))
+    part.index = left.index
+    out = pd.concat([left.rename(columns={c: c + suffixes[0] for c in overlap}),
+                     part.rename(columns={c: c + suffixes[1] for c in overlap})], axis=1)
+    return out.reset_index(drop=True)
+
+
+def apply_join(df: pd.DataFrame, right: pd.DataFrame, j: Dict[str, Any]) -> Tuple[pd.DataFrame, JoinStats]:
+    """Eén meta.joins entry; bewaakt kardinaliteit (validate/max_fanout) en meet matches."""
+    t0 = time.perf_counter()
+    how = j.get("how", "left")
+    on = _as_list(j.get("on"))
+    left_keys = on or _as_list(j.get("left_on"))
+    right_keys = on or _as_list(j.get("right_on"))
+    suffixes = tuple(j.get("suffixes", ("", "_r")))
+    name = str(j.get("right"))
+    validate = j.get("validate")
+    if validate is not None and validate not in JOIN_VALIDATE:
+        raise SystemExit(f"join '{name}': validate '{validate}' onbekend (kies uit {', '.join(JOIN_VALIDATE)}).")
+    cols = _as_list(j["columns"]) if j.get("columns") is not None else None
+    if cols is not None:
+        missing = [c for c in cols if c not in right.columns]
+        if missing:
+            raise SystemExit(f"join '{name}': columns niet gevonden in right source: {', '.join(missing)}")
+
+    ridx = _right_index(right, right_keys, cols)
+    left_idx = _key_index(df, left_keys)
+    if ridx.unique:   # één hash-pass geeft zowel match als positie
+        pos = ridx.index.get_indexer(left_idx); hit = pos >= 0
+        fanout = int(hit.any())
+    else:
+        hit = ridx.counts.index.get_indexer(left_idx) >= 0
+        matched_counts = ridx.counts.reindex(left_idx[hit].unique())
+        fanout = int(matched_counts.max()) if len(matched_counts) else 0
+
+    if validate in ("one_to_one", "many_to_one") and not ridx.unique:
+        raise SystemExit(f"join '{name}': validate={validate} maar right-sleutel {'+'.join(right_keys)} is niet uniek "
+                         f"(bv. {_dup_sample(ridx.index)}).")
+    if validate in ("one_to_one", "one_to_many") and not left_idx.is_unique:
+        raise SystemExit(f"join '{name}': validate={validate} maar left-sleutel {'+'.join(left_keys)} is niet uniek "
+                         f"(bv. {_dup_sample(left_idx)}).")
+    max_fanout = j.get("max_fanout")
+    if max_fanout is not None and fanout > int(max_fanout):
+        worst = left_idx[hit][0] if ridx.unique else matched_counts.idxmax()
+        raise SystemExit(f"join '{name}': fanout {fanout} > max_fanout {max_fanout} (sleutel {worst!r}).")
+
+    if ridx.unique and how in ("left", "inner"):
+        out, mode = _lookup(df, ridx, left_keys, right_keys, how, suffixes, pos, hit), "lookup"
+    else:
+        kw = dict(how=how, suffixes=suffixes, validate=JOIN_VALIDATE.get(validate))
+        right = ridx.frame
+        out = df.merge(right, on=on, **kw) if on else df.merge(right, left_on=left_keys, right_on=right_keys, **kw)
+        mode = "merge"
+    matched = int(hit.sum())
+    stats = JoinStats(name, how, mode, len(df), len(out), matched, matched / len(df) if len(df) else 0.0,
+                      fanout, time.perf_counter() - t0)
+    return out, stats
@@ -1,22 +1,53 @@
 from __future__ import annotations
 import importlib
+import json
+import os
 import re
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from .config import build_config
+from .config import TransformConfig, build_config, discover_targets, parse_object_variant
+from .regexes import backtracking_risk, compile_pattern
 
 
 KNOWN_TRANSFORMS = {"strip", "upper", "lower", "zfill", "pad_left", "regex_replace", "to_int", "to_string", "custom"}
+LINT_FORMATS = ("text", "json", "sarif")
 
+Issue = Tuple[str, str, str]
 
-def lint_config(args) -> int:
-    issues: List[Tuple[str, str, str]] = []
+
+@lru_cache(maxsize=None)
+def _check_custom(mod: str, fn: str) -> Optional[Tuple[str, str]]:
+    """Import-cache voor custom modules: elke (module, functie) wordt één keer geresolved."""
     try:
-        cfg = build_config(args)
-    except SystemExit as e:
-        print(f"[E001] {e}")
-        return 1
+        m = importlib.import_module(mod)
+        getattr(m, fn)
+    except ModuleNotFoundError:
+        return ("module", "")
+    except AttributeError:
+        return ("function", "")
+    except Exception as e:
+        return ("error", str(e))
+    return None
+
+
+def _check_pattern(issues: List[Issue], pat: str, where: str) -> None:
+    try:
+        compile_pattern(pat)
+    except re.error as e:
+        issues.append(("ERROR", "E102", f"{where} is ongeldig: {e}"))
+        return
+    risk = backtracking_risk(pat)
+    if risk:
+        issues.append(("WARN", "W106", f"{where} kan catastrophic backtracking geven ({risk}): {pat}"))
+
+
+def collect_issues(cfg: TransformConfig, memory_budget: Any = None) -> List[Issue]:
+    """``memory_budget``: --memory-budget van de run (anders geldt meta.engine.memory_budget)."""
+    issues: List[Issue] = []
 
     targets = [cfg.column_map[k] for k in cfg.column_map.keys()]
     dups = {t for t in targets if targets.count(t) > 1}
@@ -42,10 +73,11 @@ def lint_config(args) -> int:
                 issues.append(("ERROR", "E103", f"max_length voor '{col}' is geen integer"))
         pat = rcfg.get("pattern")
         if pat:
-            try:
-                re.compile(pat)
-            except re.error as e:
-                issues.append(("ERROR", "E102", f"pattern voor '{col}' is ongeldig: {e}"))
+            _check_pattern(issues, pat, f"pattern voor '{col}'")
+        if "in_table" in rcfg:
+            from .reftables import check_reference   # laadt pandas; alleen als er in_table rules zijn
+            for problem in check_reference(rcfg["in_table"]):
+                issues.append(("ERROR", "E107", f"in_table voor '{col}': {problem}"))
         steps = rcfg.get("transforms", [])
         if isinstance(steps, list):
             for s in steps:
@@ -58,23 +90,68 @@ def lint_config(args) -> int:
                     continue
                 if op not in KNOWN_TRANSFORMS:
                     issues.append(("WARN", "W104", f"onbekende transform '{op}' voor kolom '{col}'"))
+                elif op == "regex_replace" and isinstance(s, dict) and (s[op] or {}).get("pattern"):
+                    _check_pattern(issues, s[op]["pattern"], f"regex_replace pattern voor '{col}'")
         if "custom" in rcfg:
             c = rcfg["custom"]
             mod = c.get("module"); fn = c.get("function")
             if not mod or not fn:
                 issues.append(("WARN", "W105", f"custom voor '{col}' mist module/function"))
             else:
-                try:
-                    m = importlib.import_module(mod)
-                    getattr(m, fn)
-                except ModuleNotFoundError:
+                err = _check_custom(mod, fn)
+                kind, detail = err if err else ("", "")
+                if kind == "module":
                     issues.append(("WARN", "W105", f"custom module niet gevonden voor '{col}': {mod}"))
-                except AttributeError:
+                elif kind == "function":
                     issues.append(("WARN", "W105", f"custom functie niet gevonden voor '{col}': {fn} in {mod}"))
-                except Exception as e:
-                    issues.append(("WARN", "W105", f"custom import fout voor '{col}': {e}"))
+                elif kind == "error":
+                    issues.append(("WARN", "W105", f"custom import fout voor '{col}': {detail}"))
 
     meta = cfg.meta or {}
+    if meta.get("unique_keys"):
+        from .validate import UNIQUE_POLICIES, unique_key_specs
+        try:
+            specs = unique_key_specs(meta)
+        except Exception:
+            specs = []
+            issues.append(("ERROR", "E108", f"unique_keys is onleesbaar: {meta.get('unique_keys')!r}"))
+        for spec in specs:
+            if not spec["keys"]:
+                issues.append(("ERROR", "E108", "unique_keys mist 'keys'"))
+            if spec["policy"] not in UNIQUE_POLICIES:
+                issues.append(("ERROR", "E108", f"unique_keys policy '{spec['policy']}' onbekend (kies uit {', '.join(UNIQUE_POLICIES)})"))
+            for k in spec["keys"]:
+                if k not in cfg.column_map:
+                    issues.append(("WARN", "W108", f"unique_keys verwijst naar onbekende kolom '{k}'"))
+    text_cfg = meta.get("text") or {}
+    mj = text_cfg.get("repair_mojibake", False)
+    if not isinstance(mj, bool) and str(mj).lower() != "bulk":
+        issues.append(("WARN", "W109", f"text.repair_mojibake '{mj}' onbekend (true, false of bulk)"))
+    thr = text_cfg.get("mojibake_threshold")
+    if thr is not None and not (isinstance(thr, (int, float)) and 0 < thr <= 1):
+        issues.append(("ERROR", "E109", f"text.mojibake_threshold moet tussen 0 en 1 liggen: {thr!r}"))
+    details = ((meta.get("reports") or {}).get("reject_details"))
+    if details is not None and str(details).lower() not in ("auto", "parquet", "csv", "none", "false", "off"):
+        issues.append(("ERROR", "E110", f"reports.reject_details '{details}' onbekend (parquet, csv of none)"))
+    budget = ((meta.get("engine") or {}).get("memory_budget"))
+    budget_set = False
+    if budget is not None:
+        from .budget import parse_budget
+        try:
+            budget_set = parse_budget(budget) is not None
+        except SystemExit:
+            issues.append(("ERROR", "E111", f"engine.memory_budget '{budget}' ongeldig (bijv. 4GB, 512MB, 2048 of auto)"))
+    if memory_budget is not None:
+        budget_set = str(memory_budget).strip().lower() not in ("", "0", "none", "off")
+    if budget_set and meta.get("unique_keys"):
+        from .validate import unique_key_specs
+        try:
+            reject_all = any(s["policy"] == "reject_all" for s in unique_key_specs(meta))
+        except Exception:
+            reject_all = False
+        if reject_all:
+            issues.append(("WARN", "W111", "unique_keys reject_all met memory_budget: chunken kan niet, "
+                                           "de run blijft in-memory en kan het budget overschrijden"))
     joins = meta.get("joins", [])
     sources = {s["name"] for s in meta.get("sources", [])} if meta.get("sources") else set()
     if joins and not sources:
@@ -85,12 +162,30 @@ def lint_config(args) -> int:
             issues.append(("ERROR", "E301", f"join.right '{r}' bestaat niet in sources"))
         if not (j.get("on") or (j.get("left_on") and j.get("right_on"))):
             issues.append(("ERROR", "E302", f"join mist 'on' of 'left_on/right_on'"))
+        if j.get("validate") is not None and j["validate"] not in ("one_to_one", "many_to_one", "one_to_many", "many_to_many"):
+            issues.append(("ERROR", "E305", f"join '{r}': validate '{j['validate']}' onbekend"))
+        if j.get("max_fanout") is not None and (not isinstance(j["max_fanout"], int) or j["max_fanout"] < 1):
+            issues.append(("ERROR", "E306", f"join '{r}': max_fanout moet een integer >= 1 zijn"))
+        if not j.get("validate") and j.get("max_fanout") is None:
+            issues.append(("WARN", "W305", f"join '{r}' zonder validate/max_fanout: een niet-unieke right-sleutel vermenigvuldigt rijen"))
     for s in meta.get("sources", []):
         if "sheet" not in s or s.get("sheet") in (None, ""):
             issues.append(("WARN", "W304", f"source '{s.get('name')}' mist 'sheet' – default wordt eerste sheet"))
 
     lvl_order = {"ERROR": 0, "WARN": 1}
     issues.sort(key=lambda x: (lvl_order[x[0]], x[1], x[2]))
+    return issues
+
+
+def _exit_code(issues: List[Issue], strict: bool) -> int:
+    if any(lvl == "ERROR" for lvl, _, _ in issues):
+        return 1
+    if strict and issues:
+        return 1
+    return 0
+
+
+def _print_issues(issues: List[Issue]) -> None:
     if issues:
         print("\nLint report:")
         for lvl, code, msg in issues:
@@ -99,46 +194,116 @@ def lint_config(args) -> int:
     else:
         print("Lint: geen issues gevonden.")
 
-    has_error = any(lvl == "ERROR" for lvl, _, _ in issues)
-    if has_error:
-        return 1
-    if getattr(args, "strict", False) and issues:
+
+def lint_config(args) -> int:
+    """--lint: één object/variant; ``args.lint_format`` json/sarif geeft hetzelfde formaat als --lint-all."""
+    fmt = getattr(args, "lint_format", None) or "text"
+    if fmt != "text":
+        obj, var = parse_object_variant(args.object_name, args.variant_name)
+        root = Path(args.config_dir)
+        result = _lint_result(args, f"{obj}_{var}" if var else (obj or "UNSPECIFIED"), obj, var,
+                              root / obj / var if obj and var else root / (obj or ""))
+        return _emit([result], fmt)
+    try:
+        cfg = build_config(args, create_dirs=False)
+    except SystemExit as e:
+        print(f"[E001] {e}")
         return 1
-    return 0
+    issues = collect_issues(cfg, getattr(args, "memory_budget", None))
+    _print_issues(issues)
+    return _exit_code(issues, getattr(args, "strict", False))
+
+
+def _lint_namespace(config_dir: Path, obj: str, var: Optional[str], strict: bool) -> Namespace:
+    return Namespace(
+        object_name=obj, variant_name=var, config_dir=str(config_dir),
+        input_file=None, output_file=None, reject_file=None, log_dir="logs",
+        sample=None, report=False, report_format="md",
+        scaffold_object=None, from_excel=None, force=False, dry_run=False,
+        runlist_path=None, lint=True, lint_all=False, strict=strict,
+        trace_config=False, no_txt_log=False, quiet=False, classic_summary=False,
+        ci=False, fail_on_rejects=False, fail_on_zero_valid=False,
+    )
+
+
+def _lint_result(args, label: str, obj: Optional[str], var: Optional[str], path: Path) -> Dict[str, Any]:
+    base = {"label": label, "object": obj, "variant": var, "path": path.as_posix()}
+    try:
+        cfg = build_config(args, create_dirs=False)
+    except SystemExit as e:
+        issues: List[Issue] = [("ERROR", "E001", str(e))]
+        return {**base, "fatal": True, "issues": issues, "exit_code": 1}
+    issues = collect_issues(cfg, getattr(args, "memory_budget", None))
+    return {**base, "fatal": False, "issues": issues, "exit_code": _exit_code(issues, getattr(args, "strict", False))}
+
+
+def _lint_one(config_dir: Path, obj: str, var: Optional[str], strict: bool) -> Dict[str, Any]:
+    label = f"{obj}_{var}" if var else obj
+    path = config_dir / obj / var if var else config_dir / obj
+    return _lint_result(_lint_namespace(config_dir, obj, var, strict), label, obj, var, path)
 
 
-def lint_all(config_dir: Path, strict: bool = False) -> int:
+def _as_json(results: List[Dict[str, Any]], exit_code: int) -> Dict[str, Any]:
+    return {
+        "exit_code": exit_code,
+        "targets": [
+            {"label": r["label"], "object": r["object"], "variant": r["variant"], "path": r["path"],
+             "exit_code": r["exit_code"],
+             "issues": [{"level": lvl, "code": code, "message": msg} for lvl, code, msg in r["issues"]]}
+            for r in results
+        ],
+    }
+
+
+def _as_sarif(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    from . import __version__
+    codes = sorted({code for r in results for _, code, _ in r["issues"]})
+    sarif_results = []
+    for r in results:
+        for lvl, code, msg in r["issues"]:
+            sarif_results.append({
+                "ruleId": code,
+                "level": "error" if lvl == "ERROR" else "warning",
+                "message": {"text": f"{r['label']}: {msg}"},
+                "locations": [{"physicalLocation": {"artifactLocation": {"uri": r["path"]}}}],
+            })
+    return {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {"driver": {"name": "transform-myd", "version": __version__,
+                                "rules": [{"id": c} for c in codes]}},
+            "results": sarif_results,
+        }],
+    }
+
+
+def lint_all(config_dir: Path, strict: bool = False, fmt: str = "text", workers: Optional[int] = None) -> int:
+    """Lint alle object/varianten parallel; leest alleen (geen data/log dirs)."""
+    targets = discover_targets(config_dir)
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers moet >= 1 zijn, niet {workers}")
+    max_workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        results = list(ex.map(lambda t: _lint_one(config_dir, t[0], t[1], strict), targets))
+    return _emit(results, fmt)
+
+
+def _emit(results: List[Dict[str, Any]], fmt: str) -> int:
+    """Resultaten printen in ``fmt``; geeft de gezamenlijke exit code."""
     exit_code = 0
-    for obj_path in sorted([p for p in config_dir.iterdir() if p.is_dir() and p.name != "_shared"]):
-        variants = [p.name for p in obj_path.iterdir() if p.is_dir()]
-        if variants:
-            for var in sorted(variants):
-                from argparse import Namespace
-                ns = Namespace(
-                    object_name=obj_path.name, variant_name=var, config_dir=str(config_dir),
-                    input_file=None, output_file=None, reject_file=None, log_dir="logs",
-                    sample=None, report=False, report_format="md",
-                    scaffold_object=None, from_excel=None, force=False, dry_run=False,
-                    runlist_path=None, lint=True, lint_all=False, strict=strict,
-                    trace_config=False, no_txt_log=False, quiet=False, classic_summary=False,
-                    ci=False, fail_on_rejects=False, fail_on_zero_valid=False,
-                )
-                print(f"\n== LINT {obj_path.name}_{var} ==")
-                rc = lint_config(ns)
-                exit_code = exit_code or rc
-        else:
-            from argparse import Namespace
-            ns = Namespace(
-                object_name=obj_path.name, variant_name=None, config_dir=str(config_dir),
-                input_file=None, output_file=None, reject_file=None, log_dir="logs",
-                sample=None, report=False, report_format="md",
-                scaffold_object=None, from_excel=None, force=False, dry_run=False,
-                runlist_path=None, lint=True, lint_all=False, strict=strict,
-                trace_config=False, no_txt_log=False, quiet=False, classic_summary=False,
-                ci=False, fail_on_rejects=False, fail_on_zero_valid=False,
-            )
-            print(f"\n== LINT {obj_path.name} ==")
-            rc = lint_config(ns)
-            exit_code = exit_code or rc
-    return exit_code
+    for r in results:
+        exit_code = exit_code or r["exit_code"]
 
+    if fmt == "json":
+        print(json.dumps(_as_json(results, exit_code), ensure_ascii=False, indent=2))
+    elif fmt == "sarif":
+        print(json.dumps(_as_sarif(results), ensure_ascii=False, indent=2))
+    else:
+        for r in results:
+            print(f"\n== LINT {r['label']} ==")
+            if r["fatal"]:
+                print(f"[E001] {r['issues'][0][2]}")
+            else:
+                _print_issues(r["issues"])
+    return exit_code
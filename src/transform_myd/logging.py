@@ -1,7 +1,7 @@
 from __future__ import annotations
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 def _print(msg: str, quiet: bool=False):
     if not quiet: print(msg)
@@ -10,7 +10,8 @@ def log_step(name: str, ok: bool, info: str="", quiet: bool=False):
     symbol = "✓" if ok else "✗"
     _print(f"[{symbol}] {name}{f' – {info}' if info else ''}", quiet)
 
-def write_txt_log(log_dir: Path, label: str, summary_lines: List[str], per_record_lines: List[str], pattern: str | None = None) -> Optional[Path]:
+def write_txt_log(log_dir: Path, label: str, summary_lines: List[str], per_record_lines: Iterable[str], pattern: str | None = None,
+                  encoding: str = "utf-8") -> Optional[Path]:
     """Schrijf legacy TXT-log met uniform default-patroon; respecteer meta.naming.log als meegegeven."""
     now = datetime.now()
     label_lower = label.lower()
@@ -23,6 +24,8 @@ def write_txt_log(log_dir: Path, label: str, summary_lines: List[str], per_recor
         label=label,
     )
     log_file = log_dir / fname
-    with log_file.open("w", encoding="utf-8") as fp:
-        fp.write("\n".join(summary_lines + ["", "# Per-record log"] + per_record_lines))
+    with log_file.open("w", encoding=encoding) as fp:
+        fp.write("\n".join(summary_lines + ["", "# Per-record log"]))
+        for line in per_record_lines:   # mag ook een iterator zijn (chunked: regels uit een spill-bestand)
+            fp.write("\n" + line)
     return log_file
@@ -2,6 +2,8 @@ from __future__ import annotations
 from typing import Any, Dict
 import pandas as pd
 
+from .dtypes import as_text, restore_dtype
+
 
 def apply_value_maps(df: pd.DataFrame, maps: Dict[str, Dict[str, str]]) -> pd.DataFrame:
     if not maps:
@@ -10,7 +12,7 @@ def apply_value_maps(df: pd.DataFrame, maps: Dict[str, Dict[str, str]]) -> pd.Da
         if col not in df.columns:
             continue
         series = df[col]
-        df[col] = series.map(lambda v: mapping.get("" if pd.isna(v) else str(v).strip(),
-                                                  "" if pd.isna(v) else str(v).strip()))
+        # waarde → strip → lookup; niet gevonden = gestripte waarde (NaN → ""); een null-doel (A: ~) blijft null
+        s = as_text(series.where(series.notna(), "")).str.strip()
+        df[col] = restore_dtype(s.map(mapping).where(s.isin(list(mapping)), s), series)
     return df
-
@@ -0,0 +1,182 @@
+from __future__ import annotations
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .logging import _print
+
+
+def _rss_mb() -> Optional[float]:
+    """Huidige RSS in MB (psutil indien aanwezig, anders /proc); None als die niet te meten is."""
+    try:
+        import psutil  # optioneel
+        return psutil.Process().memory_info().rss / 1_048_576
+    except Exception:
+        pass
+    try:
+        with open(f"/proc/{os.getpid()}/statm", "r") as fp:
+            return int(fp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1_048_576
+    except Exception:
+        return None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Piek-RSS van het proces in MB (VmHWM, anders ru_maxrss: KB op Linux, bytes op macOS)."""
+    try:
+        with open(f"/proc/{os.getpid()}/status", "r") as fp:
+            for line in fp:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except Exception:
+        pass
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1_048_576 if sys.platform == "darwin" else peak / 1024
+    except Exception:
+        return None
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    rows: Optional[int] = None
+    rss_mb: Optional[float] = None
+    rss_delta_mb: Optional[float] = None
+    peak_alloc_mb: Optional[float] = None
+
+    @property
+    def rows_per_s(self) -> Optional[float]:
+        if self.rows is None or self.wall_s <= 0:
+            return None
+        return self.rows / self.wall_s
+
+    def as_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["rows_per_s"] = self.rows_per_s
+        return d
+
+
+@dataclass
+class RunMetrics:
+    """Wall/CPU-tijd, rijen/s en geheugen per pipeline-stage."""
+    label: str
+    trace_alloc: bool = False
+    profiler: Optional[Any] = None  # StageProfiler (--profile)
+    started: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+    stages: List[StageMetrics] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._t0 = time.perf_counter(); self._c0 = time.process_time()
+        self._own_tracemalloc = False
+        if self.trace_alloc:
+            self.start_alloc_trace()
+
+    def start_alloc_trace(self) -> None:
+        """Peak-allocaties per stage via tracemalloc (kost merkbaar CPU; alleen op verzoek)."""
+        self.trace_alloc = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(); self._own_tracemalloc = True
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[StageMetrics]:
+        st = StageMetrics(name, rows=rows)
+        rss0 = _rss_mb()
+        if self.trace_alloc and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        t0, c0 = time.perf_counter(), time.process_time()
+        try:
+            with (self.profiler.profile(name) if self.profiler else nullcontext()):
+                yield st
+        finally:
+            st.wall_s = time.perf_counter() - t0
+            st.cpu_s = time.process_time() - c0
+            st.rss_mb = _rss_mb()
+            if rss0 is not None and st.rss_mb is not None:
+                st.rss_delta_mb = st.rss_mb - rss0
+            if self.trace_alloc and tracemalloc.is_tracing():
+                st.peak_alloc_mb = tracemalloc.get_traced_memory()[1] / 1_048_576
+            self.stages.append(st)
+
+    def close(self) -> None:
+        self._end = (time.perf_counter() - self._t0, time.process_time() - self._c0)
+        if self._own_tracemalloc:
+            tracemalloc.stop(); self._own_tracemalloc = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        wall, cpu = getattr(self, "_end", None) or (time.perf_counter() - self._t0, time.process_time() - self._c0)
+        rss, peak = _rss_mb(), _peak_rss_mb()
+        if peak is not None:     # VmHWM loopt iets achter op de RSS-tellers: nooit lager dan een gemeten RSS
+            peak = max([peak] + [v for v in [rss] + [s.rss_mb for s in self.stages] if v is not None])
+        return {
+            "label": self.label,
+            "started": self.started,
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "rss_mb": rss,
+            "peak_rss_mb": peak,
+            "stages": [s.as_dict() for s in self.stages],
+        }
+
+    def summary_lines(self) -> List[str]:
+        def num(v: Optional[float], fmt: str) -> str:
+            return "-" if v is None else format(v, fmt)
+        lines = [f"{'stage':<20} {'wall s':>9} {'cpu s':>9} {'rows':>9} {'rows/s':>11} {'rss MB':>9} {'Δrss MB':>9} {'peak MB':>9}"]
+        for s in self.stages:
+            lines.append(f"{s.name:<20} {s.wall_s:>9.3f} {s.cpu_s:>9.3f} {num(s.rows, 'd'):>9} "
+                         f"{num(s.rows_per_s, ',.0f'):>11} {num(s.rss_mb, '.1f'):>9} "
+                         f"{num(s.rss_delta_mb, '+.1f'):>9} {num(s.peak_alloc_mb, '.1f'):>9}")
+        d = self.as_dict()
+        lines.append(f"{'total':<20} {d['wall_s']:>9.3f} {d['cpu_s']:>9.3f}")
+        return lines
+
+    def print_summary(self, quiet: bool = False) -> None:
+        _print("\n— Metrics —", quiet)
+        for line in self.summary_lines():
+            _print(line, quiet)
+
+
+def aggregate_metrics(label: str, runs: List[Dict[str, Any]], wall_s: Optional[float] = None) -> Dict[str, Any]:
+    """Totaalrecord over meerdere runs: rijen opgeteld, seconden per stage opgeteld, piek-RSS van het proces."""
+    stage_s: Dict[str, float] = {}
+    for r in runs:
+        for st in r.get("stages") or []:
+            stage_s[st["name"]] = stage_s.get(st["name"], 0.0) + float(st.get("wall_s") or 0.0)
+    peaks = [r["peak_rss_mb"] for r in runs if r.get("peak_rss_mb") is not None]
+    now_peak = _peak_rss_mb()
+    if now_peak is not None:
+        peaks.append(now_peak)
+    return {
+        "label": label,
+        "aggregate": True,
+        "jobs": len(runs),
+        "total": sum(int(r.get("total") or 0) for r in runs),
+        "valid": sum(int(r.get("valid") or 0) for r in runs),
+        "rejected": sum(int(r.get("rejected") or 0) for r in runs),
+        "wall_s": wall_s if wall_s is not None else sum(float(r.get("wall_s") or 0.0) for r in runs),
+        "cpu_s": sum(float(r.get("cpu_s") or 0.0) for r in runs),
+        "stage_s": stage_s,
+        "peak_rss_mb": max(peaks) if peaks else None,
+    }
+
+
+def write_metrics_json(path: Path, data: Dict[str, Any]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def append_metrics_ndjson(path: Path, data: Dict[str, Any]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as fp:
+        fp.write(json.dumps(data, ensure_ascii=False) + "\n")
+    return path
@@ -0,0 +1,111 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .dtypes import is_arrow_text, is_text_dtype
+from .regexes import MOJIBAKE_PAIR_RE, MOJIBAKE_SUSPECT_PATTERN, MOJIBAKE_SUSPECT_RE
+
+DEFAULT_SAMPLE = 1000        # cellen per kolom
+DEFAULT_THRESHOLD = 0.2      # bulk: kolom met ≥ 20% verdachte (niet-lege) cellen → hele kolom her-decoderen
+
+
+@dataclass
+class MojibakeRate:
+    column: str
+    sampled: int              # niet-lege cellen in de sample
+    suspects: int
+
+    @property
+    def rate(self) -> float:
+        return self.suspects / self.sampled if self.sampled else 0.0
+
+
+def text_columns(df: pd.DataFrame) -> List[str]:
+    return [c for c in df.columns if not str(c).startswith("__") and (df[c].dtype == object or is_text_dtype(df[c]))]
+
+
+def _sample(s: pd.Series, n: int) -> pd.Series:
+    """Gelijkmatig verspreide cellen over de hele kolom (niet alleen de kop), zonder kopie van de kolom."""
+    if len(s) <= n:
+        return s
+    return s.iloc[np.unique(np.linspace(0, len(s) - 1, n).astype(np.int64))]
+
+
+def _suspect_mask(s: pd.Series) -> np.ndarray:
+    if is_arrow_text(s):
+        return s.str.contains(MOJIBAKE_SUSPECT_PATTERN, regex=True, na=False).to_numpy(dtype=bool)
+    search = MOJIBAKE_SUSPECT_RE.search
+    return np.fromiter((isinstance(v, str) and search(v) is not None for v in s.to_numpy(dtype=object)), dtype=bool, count=len(s))
+
+
+def scan_mojibake(df: pd.DataFrame, sample: int = DEFAULT_SAMPLE, columns: Optional[List[str]] = None) -> List[MojibakeRate]:
+    """Verdachte-mojibake ratio per tekstkolom op een sample van ``sample`` cellen per kolom."""
+    out: List[MojibakeRate] = []
+    for c in (columns if columns is not None else text_columns(df)):
+        part = _sample(df[c], sample)
+        values = part.to_numpy(dtype=object)
+        filled = np.fromiter((isinstance(v, str) and v != "" for v in values), dtype=bool, count=len(values))
+        out.append(MojibakeRate(str(c), int(filled.sum()), int(_suspect_mask(part).sum())))
+    return out
+
+
+def repair_mode(text_cfg: Dict[str, Any]) -> Any:
+    mode = text_cfg.get("repair_mojibake", False)
+    return "bulk" if str(mode).lower() == "bulk" else bool(mode)
+
+
+def _fix_pair(v: Any) -> Any:
+    """Per cel (zoals voorheen): alleen waarden met een Ã-paar, latin1 → utf-8."""
+    if not isinstance(v, str) or not MOJIBAKE_PAIR_RE.search(v):
+        return v
+    try:
+        return v.encode("latin1", "strict").decode("utf-8", "strict")
+    except UnicodeError:
+        return v
+
+
+def _redecode(v: Any) -> Any:
+    """Hele kolom verkeerd gelezen: elke niet-ASCII waarde terug naar utf-8 (cp1252, dan latin1); anders ongewijzigd."""
+    if not isinstance(v, str):
+        return v
+    for enc in ("cp1252", "latin1"):
+        try:
+            return v.encode(enc, "strict").decode("utf-8", "strict")
+        except UnicodeError:
+            continue
+    return v
+
+
+def repair_series(s: pd.Series, bulk: bool = False, threshold: float = DEFAULT_THRESHOLD) -> Tuple[pd.Series, bool]:
+    """Mojibake herstellen op unieke waarden i.p.v. per cel, in één pass over de kolom.
+
+    ``bulk``: de suspect rate komt uit dezelfde kandidaten (alle niet-ASCII waarden, gewogen met hun aantal);
+    ≥ ``threshold`` van de niet-lege cellen → hele kolom her-decoderen, anders per waarde. Geeft (kolom, bulk ja/nee).
+    """
+    if is_arrow_text(s):
+        cand = s.str.contains("[^\\x00-\\x7f]" if bulk else "Ã", regex=bulk, na=False)
+    else:
+        test = (lambda v: not v.isascii()) if bulk else (lambda v: "Ã" in v)
+        cand = pd.Series([isinstance(v, str) and test(v) for v in s.to_numpy(dtype=object)], index=s.index, dtype=bool)
+    if not cand.any():
+        return s, False
+    codes, uniques = pd.factorize(s[cand])
+    whole = False
+    if bulk:
+        suspect = np.array([MOJIBAKE_SUSPECT_RE.search(u) is not None for u in uniques], dtype=bool)
+        suspects = int(np.bincount(codes, minlength=len(uniques))[suspect].sum())
+        filled = int((s.notna() & (s != "")).sum())
+        whole = bool(suspects) and suspects >= threshold * filled
+    fn = _redecode if whole else _fix_pair
+    fixed = np.array([fn(u) for u in uniques], dtype=object)
+    changed = np.array([f != u for f, u in zip(fixed, uniques)], dtype=bool)
+    if not changed.any():
+        return s, whole
+    hit = changed[codes]
+    pos = np.flatnonzero(cand.to_numpy(dtype=bool))[hit]
+    out = s.copy()
+    out.iloc[pos] = fixed[codes[hit]]
+    return out, whole
@@ -0,0 +1,138 @@
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .config import TransformConfig
+from .rejects import RejectRecords
+
+MIN_PARTITION_ROWS = 10_000
+
+# Per worker-proces één keer gezet via de pool-initializer (niet per partitie meesturen)
+_CFG: Optional[TransformConfig] = None
+
+
+def resolve_workers(args, meta: Optional[Dict[str, Any]] = None) -> int:
+    """--workers > meta.engine.workers > 1; 0 of negatief = os.cpu_count()."""
+    n = getattr(args, "workers", None)
+    if n is None:
+        n = (((meta or {}).get("engine") or {}).get("workers"))
+    if n is None:
+        return 1
+    n = int(n)
+    return n if n > 0 else (os.cpu_count() or 1)
+
+
+def partition_bounds(n_rows: int, workers: int, min_rows: int = MIN_PARTITION_ROWS) -> List[Tuple[int, int]]:
+    """Aaneengesloten (start, stop) row ranges; nooit kleiner dan min_rows (behalve de laatste)."""
+    parts = max(1, min(workers, n_rows // max(1, min_rows)))
+    size = -(-n_rows // parts)
+    return [(i, min(i + size, n_rows)) for i in range(0, n_rows, size)] or [(0, 0)]
+
+
+# --- Transport: Arrow IPC (bytes) als pyarrow er is en het frame verliesvrij round-tript
+# (geen object-kolommen: None/NaN en dtype zouden veranderen), anders gewoon pickle van het frame
+
+def _pack(df: pd.DataFrame) -> Any:
+    if any(dt == object for dt in df.dtypes) or df.index.dtype == object:
+        return df
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return df
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _unpack(obj: Any) -> pd.DataFrame:
+    if isinstance(obj, pd.DataFrame):
+        return obj
+    import pyarrow as pa
+    return pa.ipc.open_stream(obj).read_all().to_pandas()
+
+
+def _init_worker(cfg: TransformConfig) -> None:
+    global _CFG
+    _CFG = cfg
+
+
+def _sanitize_part(packed: Any) -> Any:
+    from .pipeline import _maybe_sanitize_texts
+    return _pack(_maybe_sanitize_texts(_unpack(packed), _CFG, repair=False))
+
+
+def _rules_part(packed: Any, collect: bool = True) -> Tuple[Any, Any, Dict[Any, List[str]], Any]:
+    from .mappings import apply_value_maps
+    from .transforms import apply_transforms
+    from .validate import apply_value_rules
+    cfg = _CFG
+    df = apply_value_maps(_unpack(packed), cfg.value_map)
+    for col in cfg.column_map:
+        if col not in df.columns: df[col] = ""
+    df = apply_transforms(df, cfg.value_rules)
+    records = RejectRecords() if collect else None
+    valid_df, reject_df, errors = apply_value_rules(df, cfg.value_rules, records)
+    return _pack(valid_df), _pack(reject_df), errors, _pack(records.frame()) if collect else None
+
+
+def _concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    non_empty = [f for f in frames if len(f)]
+    if not non_empty:
+        return frames[0]
+    return non_empty[0] if len(non_empty) == 1 else pd.concat(non_empty)
+
+
+class PartitionedExecutor:
+    """Row-partitioned uitvoering van sanitize en maps → transforms → validate in een process pool.
+
+    Partities zijn aaneengesloten row ranges; resultaten worden in partitievolgorde samengevoegd,
+    dus in dezelfde (__row_id) volgorde als het seriële pad.
+    """
+
+    def __init__(self, cfg: TransformConfig, workers: int, min_rows: int = MIN_PARTITION_ROWS):
+        self.cfg = cfg
+        self.workers = workers
+        self.min_rows = min_rows
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def enabled(self, n_rows: int) -> bool:
+        return self.workers > 1 and len(partition_bounds(n_rows, self.workers, self.min_rows)) > 1
+
+    def _map(self, fn, df: pd.DataFrame, **kw: Any) -> List[Any]:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.cfg,))
+        parts = [_pack(df.iloc[a:b]) for a, b in partition_bounds(len(df), self.workers, self.min_rows)]
+        return list(self._pool.map(partial(fn, **kw) if kw else fn, parts))
+
+    def sanitize(self, df: pd.DataFrame) -> pd.DataFrame:
+        text_cfg = (self.cfg.meta or {}).get("text") or {}
+        if not text_cfg:
+            return df
+        from .pipeline import _repair_mojibake
+        # mojibake-herstel op het hele frame, niet per partitie (anders hangt de bulk-beslissing af van de partitionering)
+        return _repair_mojibake(_concat([_unpack(p) for p in self._map(_sanitize_part, df)]), text_cfg)
+
+    def maps_transforms_validate(self, df: pd.DataFrame, records: Optional[RejectRecords] = None
+                                 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, Dict[Any, List[str]]]:
+        """Geeft (df na transforms, valid_df, reject_df, errors), gelijk aan het seriële pad; vult ``records`` aan."""
+        if not df.index.is_unique:      # fouten en post.loc[df.index] gaan op indexlabel
+            raise ValueError("PartitionedExecutor vereist een unieke index (reset_index vóór het partitioneren).")
+        valid_parts, reject_parts, errors = [], [], {}
+        for pv, pr, err, rec in self._map(_rules_part, df, collect=records is not None):
+            valid_parts.append(_unpack(pv)); reject_parts.append(_unpack(pr)); errors.update(err)
+            if records is not None:
+                records.extend(_unpack(rec))
+        valid_df, reject_df = _concat(valid_parts), _concat(reject_parts)
+        post = pd.concat([valid_df, reject_df.drop(columns="__errors", errors="ignore")]) if len(reject_df) else valid_df
+        return post.loc[df.index], valid_df, reject_df, errors
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -1,16 +1,30 @@
 from __future__ import annotations
-import hashlib, os, re, unicodedata
+import hashlib, os, sys, tempfile, time, unicodedata
+from argparse import Namespace
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from typing import List
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import pandas as pd
-from .config import build_config, parse_object_variant
-from .io_excel import load_dataframe
+from .config import build_config, parse_object_variant, _tokens, _expand
+from .io_excel import iter_dataframe_chunks, load_dataframe
 from .mappings import apply_value_maps
 from .transforms import apply_transforms
-from .validate import apply_value_rules
-from .reports import generate_report_md, generate_report_html, write_reject_reasons_csv
+from .validate import apply_unique_keys, apply_value_rules, unique_key_indexes, unique_key_specs
+from .reports import (generate_report_md, generate_report_html, reject_details_path, write_reject_details_file,
+                      write_reject_reasons_csv)
+from .rejects import RejectRecords, details_format, reason_frame, reason_tally
 from .logging import log_step, _print, write_txt_log
+from .metrics import RunMetrics, write_metrics_json
+from .dtypes import is_text_dtype
+from .regexes import CTRL_CLASS, CTRL_RE, WS_CLASS, WS_RE
+from .mojibake import DEFAULT_SAMPLE, DEFAULT_THRESHOLD, repair_mode, repair_series, scan_mojibake
+from .sampling import SampleSpec, StreamSampler, sample_frame, sample_spec_from_args
+from .partition import MIN_PARTITION_ROWS, PartitionedExecutor, resolve_workers
+from .budget import REPORT_SAMPLE_ROWS, ExecutionPlan, plan_execution, resolve_budget
 
 def build_label(args) -> str:
    obj, var = parse_object_variant(args.object_name, args.variant_name)
@@ -20,40 +34,69 @@ def _tz(name: str) -> ZoneInfo:
    try: return ZoneInfo(name)
    except Exception: return ZoneInfo("UTC")
 
-def _maybe_sanitize_texts(df: pd.DataFrame, cfg) -> pd.DataFrame:
+def _repair_mojibake(df: pd.DataFrame, text_cfg: Dict[str, Any], cols: Optional[List[str]] = None) -> pd.DataFrame:
+   """Per kolom één pass; de bulk-beslissing valt op de kolom zoals die hier staat (na hygiene, per chunk)."""
+   mode = repair_mode(text_cfg)
+   if not mode: return df
+   threshold = float(text_cfg.get("mojibake_threshold", DEFAULT_THRESHOLD))
+   if cols is None: cols = [c for c in df.columns if df[c].dtype == "object" or is_text_dtype(df[c])]
+   for c in cols:
+       df[c], _ = repair_series(df[c], bulk=mode == "bulk", threshold=threshold)
+   return df
+
+def _maybe_sanitize_texts(df: pd.DataFrame, cfg, repair: bool = True) -> pd.DataFrame:
+   """``repair=False``: mojibake-herstel overslaan (partities: de ouder herstelt daarna het hele frame)."""
    text_cfg = ((cfg.meta or {}).get("text") or {})
    if not text_cfg: return df
    df = df.copy()
    obj_cols = [c for c in df.columns if df[c].dtype == "object"]
+   txt_cols = [c for c in df.columns if is_text_dtype(df[c])]   # vóór de map: object → str kolommen niet 2x
    norm = (text_cfg.get("normalize") or "none").upper()
    strip_ctrl = bool(text_cfg.get("strip_control", False))
    collapse_ws = bool(text_cfg.get("collapse_ws", False))
-   repair_mj = bool(text_cfg.get("repair_mojibake", False))
-   ctrl_re = re.compile(r"[\u0000-\u0008\u000B\u000C\u000E-\u001F\u007F]")
    def fix(s):
        if not isinstance(s, str): return s
        x = s
        if norm in ("NFC","NFKC","NFD","NFKD"): x = unicodedata.normalize(norm, x)
-       if strip_ctrl: x = ctrl_re.sub("", x)
-       if collapse_ws: x = re.sub(r"\s+", " ", x).strip()
-       if repair_mj and "Ã" in x:
-           if re.search(r"Ã[\x80-\xBF]", x):
-               try: x = x.encode("latin1","strict").decode("utf-8","strict")
-               except Exception: pass
+       if strip_ctrl: x = CTRL_RE.sub("", x)
+       if collapse_ws: x = WS_RE.sub(" ", x).strip()
        return x
-   for c in obj_cols: df[c] = df[c].map(fix)
+   if norm in ("NFC","NFKC","NFD","NFKD") or strip_ctrl or collapse_ws:
+       for c in obj_cols: df[c] = df[c].map(fix)
+   # String-dtype (Arrow) kolommen: gevectoriseerd, patronen die zowel re als RE2 (pyarrow) gelijk lezen
+   for c in txt_cols:
+       s = df[c]
+       if norm in ("NFC","NFKC","NFD","NFKD"): s = s.str.normalize(norm)
+       if strip_ctrl: s = s.str.replace(CTRL_CLASS, "", regex=True)
+       if collapse_ws: s = s.str.replace(WS_CLASS + "+", " ", regex=True).str.strip()
+       df[c] = s
+   # Mojibake: per unieke waarde i.p.v. per cel; bulk-kolommen worden als geheel her-gedecodeerd
+   if repair: df = _repair_mojibake(df, text_cfg, obj_cols + txt_cols)
    return df
 
-def _add_lineage(df: pd.DataFrame, label: str, cfg, args) -> pd.DataFrame:
+def _add_lineage(df: pd.DataFrame, label: str, cfg, args, now: Optional[datetime] = None,
+                 ingest: Optional[datetime] = None, ingest_from_file: bool = True,
+                 source_rows: bool = False) -> pd.DataFrame:
+   """``now``: vaste run-tijd (chunked: alle chunks dezelfde __run_id/__transform_ts).
+
+   ``__row_id``: met ``source_rows`` index + 1 (de index is de 0-based bronrij: random/stratified sample, chunks),
+   anders volgnummer 1..N in het geladen frame (ook na ``meta.filters``).
+   ``__ingest_ts``: ``ingest`` indien gegeven, anders de mtime van cfg.input_file (``ingest_from_file``), anders leeg.
+   """
    meta_line = (cfg.meta or {}).get("lineage", {}) or {}
    if getattr(args, "no_lineage", False) or not meta_line.get("enabled", True): return df
    df = df.copy()
-   tz = _tz(meta_line.get("tz", "Europe/Amsterdam")); now = datetime.now(tz)
+   tz = _tz(meta_line.get("tz", "Europe/Amsterdam")); now = now or datetime.now(tz)
    run_id = f"{now:%Y%m%d_%H%M}_{label.lower()}"; df["__run_id"] = run_id
-   df["__row_id"] = range(1, len(df)+1)
-   try: mtime = datetime.fromtimestamp(os.path.getmtime(cfg.input_file), tz)
-   except Exception: mtime = now
-   df["__ingest_ts"] = mtime.isoformat(timespec="seconds")
+   df["__row_id"] = (df.index + 1) if source_rows and pd.api.types.is_integer_dtype(df.index) else range(1, len(df)+1)
+   if ingest is not None:
+       df["__ingest_ts"] = ingest.isoformat(timespec="seconds")
+   elif ingest_from_file:
+       try: mtime = datetime.fromtimestamp(os.path.getmtime(cfg.input_file), tz)
+       except Exception: mtime = now
+       df["__ingest_ts"] = mtime.isoformat(timespec="seconds")
+   else:
+       df["__ingest_ts"] = ""
    df["__transform_ts"] = now.isoformat(timespec="seconds")
    uid_cfg = meta_line.get("uid", {}) or {}
    if uid_cfg.get("enabled") and uid_cfg.get("keys"):
@@ -71,61 +114,15 @@ def _add_lineage(df: pd.DataFrame, label: str, cfg, args) -> pd.DataFrame:
        df["__uid"] = df.apply(row_uid, axis=1)
    return df
 
-def _warn_if_mojibake(df: pd.DataFrame, quiet: bool):
-   suspects = ("Ã¶","Ã¤","Ã¼","ÃŸ","Ã©","Ãª","Ã¡","Ãº","Ã±","Ã¸","Ã¥")
-   try:
-       sample = df.select_dtypes("object").astype("string").stack().astype(str).head(1000)
-       if sample.str.contains("|".join(map(re.escape, suspects)), na=False).any():
-           _print("⚠️  Verdachte mojibake gedetecteerd in tekst. Tip: utf-8-sig aanlaten of text.repair_mojibake=true.", quiet)
-   except Exception:
-       pass
-
-def run_pipeline(args):
-   label = build_label(args); cfg = build_config(args)
-
-   df = load_dataframe(cfg)
-   df = _maybe_sanitize_texts(df, cfg)
-   df = _add_lineage(df, label, cfg, args)
-   _warn_if_mojibake(df, args.quiet)
-   log_step("A. Rijen ingelezen", True, f"{len(df)}", args.quiet)
-
-   if getattr(args, "sample", None) and args.sample > 0:
-       df = df.head(args.sample); log_step("A1. Sample", True, f"eerste {len(df)} rijen", args.quiet)
-
-   # --- Stages bepalen: CLI > meta.reports.stages > default
-   if getattr(args, "reports", None):
-       stages = [s.strip() for s in str(args.reports).split(",") if s.strip()]
-   else:
-       meta_reports = ((cfg.meta or {}).get("reports") or {})
-       stages = meta_reports.get("stages") or ["raw","validation"]
-
-   # --- RAW snapshot vóór maps/transforms
-   raw_df = df.copy()
-   raw_report_paths: List[str] = []
-   if getattr(args, "report", False) and ("raw" in stages):
-       if args.report_format in ("md","both"):   raw_report_paths.append(str(generate_report_md(raw_df.copy(), cfg, label, "raw")))
-       if args.report_format in ("html","both"): raw_report_paths.append(str(generate_report_html(raw_df.copy(), cfg, label, "raw")))
-       if raw_report_paths: log_step("B1. Raw report", True, " / ".join(raw_report_paths[-2:]), args.quiet)
-
-   # --- Maps & Transforms
-   df = apply_value_maps(df, cfg.value_map)
-   for col in cfg.column_map:
-       if col not in df.columns: df[col] = ""
-   df = apply_transforms(df, cfg.value_rules)
-   log_step("E. Transforms toegepast", True, "", args.quiet)
-
-   # --- Post-transform report (+ delta vs RAW)
-   post_report_paths: List[str] = []
-   if getattr(args, "report", False) and ("post" in stages):
-       if args.report_format in ("md","both"):   post_report_paths.append(str(generate_report_md(df.copy(), cfg, label, "post", baseline=raw_df)))
-       if args.report_format in ("html","both"): post_report_paths.append(str(generate_report_html(df.copy(), cfg, label, "post", baseline=raw_df)))
-       if post_report_paths: log_step("E1. Post report", True, " / ".join(post_report_paths[-2:]), args.quiet)
-
-   # --- Validate
-   valid_df, reject_df, errors = apply_value_rules(df, cfg.value_rules)
-   log_step("F. Validatie voltooid", True, f"{len(valid_df)}/{len(df)} geldig", args.quiet)
+def _warn_if_mojibake(df: pd.DataFrame, quiet: bool, sample: int = DEFAULT_SAMPLE) -> Dict[str, float]:
+   """Per kolom een sample (geen stack van het hele frame); geeft suspect rate per verdachte kolom."""
+   rates = sorted((r for r in scan_mojibake(df, sample) if r.suspects), key=lambda r: -r.rate)
+   if rates:
+       top = ", ".join(f"{r.column} {r.rate:.1%}" for r in rates[:5]) + (f" (+{len(rates) - 5})" if len(rates) > 5 else "")
+       _print(f"⚠️  Verdachte mojibake gedetecteerd in tekst: {top}. Tip: utf-8-sig aanlaten of text.repair_mojibake=true|bulk.", quiet)
+   return {r.column: round(r.rate, 4) for r in rates}
 
-   # --- Lineage kolommen borgen in valid/reject
+def _carry_lineage(df: pd.DataFrame, valid_df: pd.DataFrame, reject_df: pd.DataFrame) -> List[str]:
    lineage_cols = [c for c in df.columns if c.startswith("__")]
    for lc in lineage_cols:
        if lc not in valid_df.columns and lc in df.columns:
@@ -134,57 +131,398 @@ def run_pipeline(args):
        if lc not in reject_df.columns and lc in df.columns:
            try: reject_df[lc] = df.loc[reject_df.index, lc]
            except Exception: pass
+   return lineage_cols
 
-   # --- Export (optioneel lineage aan einde)
+def _export_frame(valid_df: pd.DataFrame, cfg, lineage_cols: List[str], keep_lineage: bool=False) -> pd.DataFrame:
    export_cols = list(cfg.column_map.keys())
    meta_lineage = (cfg.meta or {}).get("lineage", {}) or {}
-   keep_lineage = getattr(args, "keep_lineage", False) or bool(meta_lineage.get("keep_in_export", False))
+   keep_lineage = keep_lineage or bool(meta_lineage.get("keep_in_export", False))
    if keep_lineage and lineage_cols:
        export_cols = export_cols + [c for c in lineage_cols if c in valid_df.columns]
-   out_df = valid_df[export_cols].rename(columns=cfg.column_map)
+   return valid_df[export_cols].rename(columns=cfg.column_map)
+
+def _metrics_path(cfg, args) -> Path:
+   obj, var = parse_object_variant(args.object_name, args.variant_name)
+   pattern = ((cfg.meta or {}).get("naming") or {}).get("metrics", "{datetime_hm_u}_{label_lower}_metrics.json")
+   return cfg.log_dir / _expand(pattern, _tokens(obj, var))
+
+@dataclass
+class PrefetchedLoad:
+   df: pd.DataFrame
+   join_stats: List[Any]
+   seconds: float
+   nbytes: int
+
+class ExportWriter:
+   """Runlist: export/reject CSV's in één achtergrondthread, in volgorde van submit.
+
+   drain() wacht op alles wat nog loopt en geeft schrijffouten door; vóór elke synchrone schrijfactie
+   (chunked) aanroepen, zodat een vorige job niet tegelijk naar hetzelfde pad schrijft.
+   """
+
+   def __init__(self):
+       self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="myd-write")
+       self._pending: List[Future] = []
+
+   def submit(self, fn) -> Future:
+       fut = self._pool.submit(fn)
+       self._pending.append(fut)
+       return fut
+
+   def drain(self) -> None:
+       while self._pending:
+           self._pending.pop(0).result()
+
+   def close(self) -> None:
+       try:
+           self.drain()
+       finally:
+           self._pool.shutdown()
+
+def _report_stages(args, cfg) -> List[str]:
+   """Stages: CLI > meta.reports.stages > default."""
+   if getattr(args, "reports", None):
+       return [s.strip() for s in str(args.reports).split(",") if s.strip()]
+   meta_reports = ((cfg.meta or {}).get("reports") or {})
+   return meta_reports.get("stages") or ["raw","validation"]
+
+def _execution_plan(args, cfg, spec, stages: List[str], trace_alloc: bool) -> Optional[ExecutionPlan]:
+   """Alleen met --memory-budget / meta.engine.memory_budget; anders None (altijd in-memory, zoals voorheen)."""
+   budget = resolve_budget(args, cfg.meta)
+   if budget is None: return None
+   report_stages = stages if getattr(args, "report", False) else []
+   return plan_execution(cfg, budget, spec, report_stages, trace_alloc)
+
+def prefetch_load(args) -> Optional[PrefetchedLoad]:
+   """Runlist prefetch (achtergrondthread): config stil opbouwen en de bron(nen) inlezen; print niets.
+
+   None als het geheugenbudget geen volledig tweede frame toelaat (chunked of afgeschaald plan).
+   """
+   t0 = time.perf_counter()
+   cfg = build_config(Namespace(**{**vars(args), "trace_config": False}), create_dirs=False)
+   spec = sample_spec_from_args(args, cfg.meta)
+   plan = _execution_plan(args, cfg, spec, _report_stages(args, cfg), False)
+   if plan is not None and (plan.chunked or plan.downgrades): return None
+   join_stats: List[Any] = []
+   df = load_dataframe(cfg, sample=spec, join_stats=join_stats)
+   return PrefetchedLoad(df, join_stats, time.perf_counter() - t0, int(df.memory_usage(deep=True).sum()))
 
-   # Encodings
+def _encodings(args, cfg) -> Tuple[str, str]:
    enc_cfg = ((cfg.meta or {}).get("encoding") or {})
    enc_out = getattr(args, "encoding_out", None) or enc_cfg.get("output") or "utf-8-sig"
    enc_rej = getattr(args, "encoding_rejects", None) or enc_cfg.get("rejects") or "utf-8-sig"
+   return enc_out, enc_rej
 
-   out_df.to_csv(cfg.output_file, index=False, encoding=enc_out)
-   reject_df.to_csv(cfg.reject_file, index=False, encoding=enc_rej)
+def _record_lines(index, errors: Dict[int, List[str]]) -> List[str]:
+   return [f"Row {i+2}: {'REJECT – ' + ', '.join(errors[i]) if i in errors else 'OK'}" for i in index]
+
+def _txt_log(args, cfg, label, total: int, good: int, bad: int, per_rec: Iterable[str]) -> Optional[Path]:
+   summary_lines = [f"Label             : {label}",
+                    f"Total records     : {total:>6}",
+                    f"Valid records     : {good:>6}",
+                    f"Rejected records  : {bad:>6}", "",
+                    f"Export  : {cfg.output_file} ({good} rijen)",
+                    f"Rejects : {cfg.reject_file} ({bad} rijen)"]
+   log_pattern = ((cfg.meta or {}).get("naming") or {}).get("log")
+   enc_log = ((cfg.meta or {}).get("encoding") or {}).get("log_txt", "utf-8-sig")
+   log_file_path = write_txt_log(cfg.log_dir, label, summary_lines, per_rec, pattern=log_pattern, encoding=enc_log)
+   if log_file_path: log_step("G0. TXT log", True, str(log_file_path), args.quiet)
+   return log_file_path
+
+def _report_frame(df: pd.DataFrame, plan: Optional[ExecutionPlan]) -> pd.DataFrame:
+   """Kopie voor een rapport; onder geheugendruk een random sample (geen exacte profilering)."""
+   if plan is not None and plan.downgraded("report_sample") and len(df) > REPORT_SAMPLE_ROWS:
+       return sample_frame(df, SampleSpec(REPORT_SAMPLE_ROWS, "random", 0))
+   return df.copy()
+
+def _sample_note(part: int, whole: int) -> str:
+   return f" (sample {part} rijen)" if part < whole else ""
+
+def _write_reports(args, cfg, label, stage: str, df: pd.DataFrame, baseline: Optional[pd.DataFrame] = None) -> List[str]:
+   paths: List[str] = []
+   if args.report_format in ("md","both"):   paths.append(str(generate_report_md(df, cfg, label, stage, baseline=baseline)))
+   if args.report_format in ("html","both"): paths.append(str(generate_report_html(df, cfg, label, stage, baseline=baseline)))
+   return paths
+
+def run_pipeline(args, prefetched: Optional["Future[PrefetchedLoad]"] = None, writer: Optional[ExportWriter] = None):
+   """``prefetched``: al (deels) ingelezen bron van de runlist-scheduler; ``writer``: export CSV's asynchroon schrijven."""
+   label = build_label(args)
+   profiler = None
+   if getattr(args, "profile", None):
+       from .profiling import StageProfiler
+       profiler = StageProfiler(args.profile, top_n=getattr(args, "profile_top", None) or 20)
+   m = RunMetrics(label, profiler=profiler)
+   with m.stage("config"):
+       cfg = build_config(args)
+   metrics_cfg = ((cfg.meta or {}).get("metrics") or {})
+   metrics_on = bool(getattr(args, "metrics", False)) or bool(metrics_cfg.get("enabled", False))
+   trace_alloc = metrics_on and bool(metrics_cfg.get("trace_alloc", False))
+
+   spec = sample_spec_from_args(args, cfg.meta)
+   stages = _report_stages(args, cfg)
+   # --- Geheugenbudget: modus kiezen vóór het laden (schatting uit bestandsgrootte/kolommen/kop)
+   plan = _execution_plan(args, cfg, spec, stages, trace_alloc)
+   if plan is not None:
+       log_step("A3. Geheugenbudget", True, plan.line(), args.quiet)
+       if plan.over_budget:   # ook met --quiet zichtbaar: het gevraagde budget wordt niet gehaald
+           msg = f"⚠️  Geheugenbudget {plan.budget / 2**20:.0f}MB niet haalbaar ({plan.mode}, schatting {plan.estimate / 2**20:.0f}MB): {plan.note}"
+           if getattr(args, "strict", False): raise SystemExit(msg + " (--strict)")
+           print(msg, file=sys.stderr)
+   if trace_alloc and not (plan and plan.downgraded("trace_alloc")): m.start_alloc_trace()
+   if plan is not None and plan.chunked:
+       return _run_chunked(args, cfg, label, m, profiler, metrics_on, plan, stages, writer)
+
+   pre = None
+   with m.stage("load") as st:
+       join_stats: List = []
+       if prefetched is not None:   # wacht alleen op het deel dat nog niet in de achtergrond klaar is
+           pre = prefetched.result()
+       if pre is not None:
+           df = pre.df; join_stats = pre.join_stats
+       else:
+           df = load_dataframe(cfg, sample=spec, join_stats=join_stats)
+       st.rows = len(df)
+   for js in join_stats:
+       log_step("A0. Join", True, js.line(), args.quiet)
+   engine_cfg = ((cfg.meta or {}).get("engine") or {})
+   px = PartitionedExecutor(cfg, resolve_workers(args, cfg.meta),
+                            min_rows=int(engine_cfg.get("min_partition_rows", MIN_PARTITION_ROWS)))
+   parallel = px.enabled(len(df))
+   with m.stage("sanitize", rows=len(df)):
+       df = px.sanitize(df) if parallel else _maybe_sanitize_texts(df, cfg)
+   with m.stage("lineage", rows=len(df)):
+       df = _add_lineage(df, label, cfg, args, source_rows=spec is not None and spec.mode != "head")
+   with m.stage("mojibake_scan", rows=len(df)):
+       mojibake_rates = _warn_if_mojibake(df, args.quiet, int(((cfg.meta or {}).get("text") or {}).get("mojibake_sample", DEFAULT_SAMPLE)))
+   log_step("A. Rijen ingelezen", True, f"{len(df)}", args.quiet)
+   if spec is not None:
+       how = f"eerste {len(df)} rijen" if spec.mode == "head" else f"{len(df)} rijen ({spec.mode}{', by ' + spec.by if spec.by else ''}, seed={spec.seed})"
+       log_step("A1. Sample", True, how, args.quiet)
+   if parallel:
+       log_step("A2. Partities", True, f"{px.workers} workers", args.quiet)
+
+   # --- RAW snapshot vóór maps/transforms: alleen vasthouden als het post-rapport er een delta tegen maakt
+   report_on = bool(getattr(args, "report", False))
+   raw_df = df.copy() if report_on and "post" in stages and not (plan and plan.downgraded("post_delta")) else None
+   raw_report_paths: List[str] = []
+   if report_on and ("raw" in stages):
+       with m.stage("report_raw", rows=len(df)):
+           rf = _report_frame(df, plan)
+           raw_report_paths = _write_reports(args, cfg, label, "raw", rf)
+           if raw_report_paths: log_step("B1. Raw report", True, " / ".join(raw_report_paths[-2:]) + _sample_note(len(rf), len(df)), args.quiet)
+
+   # gestructureerde fouten alleen verzamelen als er een details artifact of reasons CSV van komt
+   details_on = details_format(cfg.meta, report_on) is not None
+   records = RejectRecords() if details_on or (report_on and "validation" in stages) else None
+   # --- Maps & Transforms (parallel: maps → transforms → validate per partitie in één pass)
+   if parallel:
+       with m.stage("partitioned", rows=len(df)):
+           df, valid_df, reject_df, errors = px.maps_transforms_validate(df, records)
+       px.close()
+   else:
+       with m.stage("maps", rows=len(df)):
+           df = apply_value_maps(df, cfg.value_map)
+           for col in cfg.column_map:
+               if col not in df.columns: df[col] = ""
+       with m.stage("transforms", rows=len(df)):
+           df = apply_transforms(df, cfg.value_rules)
+   log_step("E. Transforms toegepast", True, "", args.quiet)
+
+   # --- Post-transform report (+ delta vs RAW)
+   post_report_paths: List[str] = []
+   if report_on and ("post" in stages):
+       with m.stage("report_post", rows=len(df)):
+           rf = _report_frame(df, plan)
+           post_report_paths = _write_reports(args, cfg, label, "post", rf, baseline=raw_df)
+           if post_report_paths: log_step("E1. Post report", True, " / ".join(post_report_paths[-2:]) + _sample_note(len(rf), len(df)), args.quiet)
+   raw_df = None
+
+   # --- Validate
+   if not parallel:
+       with m.stage("validate", rows=len(df)):
+           valid_df, reject_df, errors = apply_value_rules(df, cfg.value_rules, records)
+   unique_specs = unique_key_specs(cfg.meta)
+   if unique_specs:
+       with m.stage("unique_keys", rows=len(df)):
+           valid_df, reject_df, errors = apply_unique_keys(df, unique_specs, errors, records)
+   details = records.frame(df) if records is not None else None
+   log_step("F. Validatie voltooid", True, f"{len(valid_df)}/{len(df)} geldig", args.quiet)
+
+   # --- Lineage kolommen borgen in valid/reject
+   lineage_cols = _carry_lineage(df, valid_df, reject_df)
+
+   # --- Export (optioneel lineage aan einde)
+   out_df = _export_frame(valid_df, cfg, lineage_cols, getattr(args, "keep_lineage", False))
+   enc_out, enc_rej = _encodings(args, cfg)
+
+   def _write_outputs() -> None:
+       out_df.to_csv(cfg.output_file, index=False, encoding=enc_out)
+       reject_df.to_csv(cfg.reject_file, index=False, encoding=enc_rej)
+   pending_write = None
+   with m.stage("export", rows=len(out_df) + len(reject_df)):
+       if writer is not None: pending_write = writer.submit(_write_outputs)
+       else: _write_outputs()
+   details_file = None
+   if details_on and len(details):
+       with m.stage("reject_details", rows=len(details)):
+           details_file = write_reject_details_file(details, cfg.log_dir, label, cfg, report_on)
    log_step("G. Output-bestanden", True, f"{len(out_df)}/{len(df)} ✓, rejects {len(reject_df)}", args.quiet)
 
    # Legacy TXT log (met BOM)
+   total, good, bad = len(df), len(valid_df), len(reject_df)
    log_file_path = None
    if not getattr(args, "no_txt_log", False):
-       total, good, bad = len(df), len(valid_df), len(reject_df)
-       summary_lines = [f"Label             : {label}",
-                        f"Total records     : {total:>6}",
-                        f"Valid records     : {good:>6}",
-                        f"Rejected records  : {bad:>6}", "",
-                        f"Export  : {cfg.output_file} ({good} rijen)",
-                        f"Rejects : {cfg.reject_file} ({bad} rijen)"]
-       per_rec = [f"Row {i+2}: {'REJECT – ' + ', '.join(errors[i]) if i in errors else 'OK'}" for i in df.index]
-       log_pattern = ((cfg.meta or {}).get("naming") or {}).get("log")
-       enc_log = enc_cfg.get("log_txt", "utf-8-sig")
-       log_file_path = write_txt_log(cfg.log_dir, label, summary_lines, per_rec, pattern=log_pattern, encoding=enc_log)
-       if log_file_path: log_step("G0. TXT log", True, str(log_file_path), args.quiet)
+       with m.stage("txt_log", rows=len(df)):
+           log_file_path = _txt_log(args, cfg, label, total, good, bad, _record_lines(df.index, errors))
 
    # Reports na validatie
    val_report_paths: List[str] = []
-   if getattr(args, "report", False) and ("validation" in stages):
-       if args.report_format in ("md","both"):   val_report_paths.append(str(generate_report_md(valid_df.copy(), cfg, label, "validation")))
-       if args.report_format in ("html","both"): val_report_paths.append(str(generate_report_html(valid_df.copy(), cfg, label, "validation")))
-       reasons_csv = write_reject_reasons_csv(reject_df, cfg.log_dir, label, cfg)
-       if reasons_csv: log_step("G1. Reject reasons CSV", True, str(reasons_csv), args.quiet)
-       if val_report_paths: log_step("G2. Validation report", True, " / ".join(val_report_paths[-2:]), args.quiet)
+   if report_on and ("validation" in stages):
+       with m.stage("report_validation", rows=len(valid_df) + len(reject_df)):
+           rf = _report_frame(valid_df, plan)
+           val_report_paths = _write_reports(args, cfg, label, "validation", rf)
+           reasons_csv = write_reject_reasons_csv(details, cfg.log_dir, label, cfg)
+           if reasons_csv: log_step("G1. Reject reasons CSV", True, str(reasons_csv), args.quiet)
+           if val_report_paths: log_step("G2. Validation report", True, " / ".join(val_report_paths[-2:]) + _sample_note(len(rf), len(valid_df)), args.quiet)
 
-   total, good, bad = len(df), len(valid_df), len(reject_df)
+   extra: Dict[str, Any] = {}
+   if join_stats: extra["joins"] = [js.as_dict() for js in join_stats]
+   if mojibake_rates: extra["mojibake"] = mojibake_rates
+   if pre is not None: extra["prefetch"] = {"load_s": round(pre.seconds, 3), "frame_mb": round(pre.nbytes / 2**20, 1)}
+   if plan is not None: extra["memory_plan"] = plan.as_dict()
+   return _finish_run(args, cfg, label, m, profiler, metrics_on, (total, good, bad), details_file, log_file_path,
+                      [raw_report_paths, post_report_paths, val_report_paths], extra, pending_write)
+
+def _run_chunked(args, cfg, label, m, profiler, metrics_on, plan: ExecutionPlan, stages: List[str],
+                 writer: Optional[ExportWriter] = None):
+   """Streaming/spill: per chunk sanitize → lineage → maps → transforms → validate → unique keys → append.
+
+   Vast in geheugen blijven alleen de sleutelindex, tellers, report-samples en (streaming) TXT-log regels en
+   reject details; spill schrijft die laatste twee per chunk naar schijf.
+   """
+   text_cfg = ((cfg.meta or {}).get("text") or {})
+   enc_out, enc_rej = _encodings(args, cfg)
+   enc_csv = ((cfg.meta or {}).get("encoding") or {}).get("reports_csv", "utf-8-sig")
+   spill = plan.mode == "spill"
+   keep_txt = not getattr(args, "no_txt_log", False)
+   keep_lineage = getattr(args, "keep_lineage", False)
+   report_on = bool(getattr(args, "report", False))
+   samplers = {s: StreamSampler(SampleSpec(REPORT_SAMPLE_ROWS, "random", 0))
+               for s in ("raw", "post", "validation") if report_on and s in stages}
+   indexes = unique_key_indexes(unique_key_specs(cfg.meta))
+   fmt = details_format(cfg.meta, report_on)
+   details_file = reject_details_path(cfg.log_dir, label, "csv") if spill and fmt else None
+   details_parts: List[pd.DataFrame] = []
+   reasons: Dict[str, int] = {}
+   per_rec: List[str] = []
+   now = datetime.now(_tz((((cfg.meta or {}).get("lineage") or {}).get("tz", "Europe/Amsterdam"))))
+   total = good = bad = chunks = 0
+   mojibake_rates: Dict[str, float] = {}
+   empty_rejects = None
+   with ExitStack() as stack:
+       if writer is not None: writer.drain()             # vorige job kan nog naar hetzelfde pad schrijven
+       out_fp = stack.enter_context(open(cfg.output_file, "w", encoding=enc_out, newline=""))
+       rej_fp = stack.enter_context(open(cfg.reject_file, "w", encoding=enc_rej, newline=""))
+       log_fp = stack.enter_context(tempfile.TemporaryFile("w+", encoding="utf-8", dir=cfg.log_dir)) if spill and keep_txt else None
+       det_fp = None
+       with m.stage(plan.mode) as st:
+           for chunk in iter_dataframe_chunks(cfg, plan.chunk_rows):
+               chunk = _add_lineage(_maybe_sanitize_texts(chunk, cfg), label, cfg, args, now=now, source_rows=True)
+               if not chunks:
+                   mojibake_rates = _warn_if_mojibake(chunk, args.quiet, int(text_cfg.get("mojibake_sample", DEFAULT_SAMPLE)))
+               if "raw" in samplers: samplers["raw"].feed(chunk)
+               chunk = apply_value_maps(chunk, cfg.value_map)
+               for col in cfg.column_map:
+                   if col not in chunk.columns: chunk[col] = ""
+               chunk = apply_transforms(chunk, cfg.value_rules)
+               if "post" in samplers: samplers["post"].feed(chunk)
+               records = RejectRecords() if fmt or "validation" in samplers else None
+               valid_df, reject_df, errors = apply_value_rules(chunk, cfg.value_rules, records)
+               if indexes:
+                   valid_df, reject_df, errors = apply_unique_keys(chunk, [], errors, records, indexes)
+               lineage_cols = _carry_lineage(chunk, valid_df, reject_df)
+               _export_frame(valid_df, cfg, lineage_cols, keep_lineage).to_csv(out_fp, index=False, header=not chunks)
+               if len(reject_df): reject_df.to_csv(rej_fp, index=False, header=not bad)
+               else: empty_rejects = reject_df
+               details = records.frame(chunk) if records is not None else None
+               if details is not None and len(details):
+                   for reason, n in reason_tally(details).items(): reasons[reason] = reasons.get(reason, 0) + n
+                   if details_file is not None:
+                       if det_fp is None: det_fp = stack.enter_context(open(details_file, "w", encoding=enc_csv, newline=""))
+                       details.to_csv(det_fp, index=False, header=det_fp.tell() == 0)
+                   elif fmt:
+                       details_parts.append(details)
+               if keep_txt:
+                   lines = _record_lines(chunk.index, errors)
+                   if log_fp is not None: log_fp.writelines(line + "\n" for line in lines)
+                   else: per_rec.extend(lines)
+               if "validation" in samplers: samplers["validation"].feed(valid_df)
+               total += len(chunk); good += len(valid_df); bad += len(reject_df); chunks += 1
+           if not bad and empty_rejects is not None: empty_rejects.to_csv(rej_fp, index=False)
+           st.rows = total
+       log_step("A. Rijen ingelezen", True, f"{total} ({chunks} chunks)", args.quiet)
+       log_step("F. Validatie voltooid", True, f"{good}/{total} geldig", args.quiet)
+       if details_file is not None and det_fp is None: details_file = None
+       if details_parts:
+           with m.stage("reject_details", rows=sum(reasons.values())):
+               details_file = write_reject_details_file(pd.concat(details_parts, ignore_index=True), cfg.log_dir, label, cfg,
+                                                        report_on)
+           details_parts = []
+       log_step("G. Output-bestanden", True, f"{good}/{total} ✓, rejects {bad}", args.quiet)
+       log_file_path = None
+       if keep_txt:
+           with m.stage("txt_log", rows=total):
+               if log_fp is not None: log_fp.seek(0)
+               lines = (line.rstrip("\n") for line in log_fp) if log_fp is not None else per_rec
+               log_file_path = _txt_log(args, cfg, label, total, good, bad, lines)
+
+   # Rapporten op een sample (exact profileren past niet), post zonder delta
+   report_paths: List[List[str]] = []
+   for stage, step, title in (("raw", "B1", "Raw report"), ("post", "E1", "Post report"), ("validation", "G2", "Validation report")):
+       if stage not in samplers: continue
+       with m.stage(f"report_{stage}"):
+           sample = samplers[stage].result()
+           paths = _write_reports(args, cfg, label, stage, sample)
+           if stage == "validation":
+               reasons_csv = write_reject_reasons_csv(None, cfg.log_dir, label, cfg, counts=reason_frame(reasons))
+               if reasons_csv: log_step("G1. Reject reasons CSV", True, str(reasons_csv), args.quiet)
+           whole = {"raw": total, "post": total, "validation": good}[stage]
+           if paths: log_step(f"{step}. {title}", True, " / ".join(paths[-2:]) + _sample_note(len(sample), whole), args.quiet)
+           report_paths.append(paths)
+
+   extra: Dict[str, Any] = {"memory_plan": plan.as_dict()}
+   if mojibake_rates: extra["mojibake"] = mojibake_rates
+   return _finish_run(args, cfg, label, m, profiler, metrics_on, (total, good, bad), details_file, log_file_path,
+                      report_paths, extra)
+
+def _finish_run(args, cfg, label, m, profiler, metrics_on, counts: Tuple[int, int, int], details_file: Optional[Path],
+                log_file_path: Optional[Path], report_paths: List[List[str]], extra: Dict[str, Any],
+                pending_write: Optional[Future] = None):
+   total, good, bad = counts
+   if pending_write is not None:
+       with m.stage("export_wait"):
+           pending_write.result()                      # summary pas als de bestanden er staan; fouten hier
    _print("\n— Summary —", args.quiet)
    _print(f"Label   : {label}", args.quiet)
    _print(f"Rows    : total={total}, valid={good}, rejected={bad}", args.quiet)
    _print(f"Export  : {cfg.output_file}", args.quiet)
    _print(f"Rejects : {cfg.reject_file}", args.quiet)
+   if details_file: _print(f"Details : {details_file} (--reject-stats)", args.quiet)
    if log_file_path: _print(f"TXT log : {log_file_path}", args.quiet)
-   if raw_report_paths:  _print("Report  : " + " | ".join(raw_report_paths), args.quiet)
-   if post_report_paths: _print("Report  : " + " | ".join(post_report_paths), args.quiet)
-   if val_report_paths:  _print("Report  : " + " | ".join(val_report_paths), args.quiet)
-   return {"total": total, "valid": good, "rejected": bad}
+   for paths in report_paths:   # raw / post / validation
+       if paths: _print("Report  : " + " | ".join(paths), args.quiet)
+
+   m.close()
+   if profiler is not None:
+       obj, var = parse_object_variant(args.object_name, args.variant_name)
+       prof_pattern = ((cfg.meta or {}).get("naming") or {}).get("profile")
+       prof_paths = profiler.write(cfg.log_dir, _tokens(obj, var), pattern=prof_pattern)
+       _print(f"Profile : {prof_paths[-1]} (+{len(prof_paths) - 1} stage dumps)", args.quiet)
+   run_metrics = m.as_dict()
+   run_metrics.update({"total": total, "valid": good, "rejected": bad})
+   run_metrics.update(extra)
+   if metrics_on:
+       m.print_summary(args.quiet)
+       metrics_file = write_metrics_json(_metrics_path(cfg, args), run_metrics)
+       _print(f"Metrics : {metrics_file}", args.quiet)
+   return {"total": total, "valid": good, "rejected": bad, "metrics": run_metrics}
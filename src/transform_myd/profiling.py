@@ -0,0 +1,87 @@
+from __future__ import annotations
+import cProfile
+import io
+import pstats
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config import _expand
+
+PROFILE_MODES = ("cprofile", "sampling")
+
+
+def _stage_pattern(pattern: str) -> str:
+    """Zonder ``{stage}`` zou elke stage-dump de vorige overschrijven: dan ``_{stage}`` vóór de extensie."""
+    if "{stage}" in pattern:
+        return pattern
+    if "{ext}" in pattern:
+        i = pattern.index("{ext}")
+        i -= pattern[i - 1:i] == "."
+        return pattern[:i] + "_{stage}" + pattern[i:]
+    head, dot, tail = pattern.rpartition(".")
+    if dot and head and not any(c in tail for c in "{}/\\"):
+        return f"{head}_{{stage}}.{tail}"
+    return pattern + "_{stage}"
+
+
+class StageProfiler:
+    """Profileert elke pipeline-stage apart (cProfile, of pyinstrument als 'sampling')."""
+
+    def __init__(self, mode: str = "cprofile", top_n: int = 20):
+        self.mode = mode
+        self.top_n = top_n
+        self.results: List[Tuple[str, Any]] = []
+        if mode == "sampling":
+            try:
+                import pyinstrument  # noqa: F401  (optioneel)
+            except ImportError:
+                print("[!] pyinstrument niet geïnstalleerd – val terug op cProfile.")
+                self.mode = "cprofile"
+
+    @contextmanager
+    def profile(self, stage: str) -> Iterator[None]:
+        if self.mode == "sampling":
+            from pyinstrument import Profiler
+            prof = Profiler()
+            prof.start()
+            try:
+                yield
+            finally:
+                prof.stop()
+                self.results.append((stage, prof))
+        else:
+            prof = cProfile.Profile()
+            prof.enable()
+            try:
+                yield
+            finally:
+                prof.disable()
+                self.results.append((stage, prof))
+
+    def _hotspots(self, prof: Any) -> str:
+        if self.mode == "sampling":
+            return prof.output_text(unicode=True, color=False)
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).strip_dirs().sort_stats("tottime").print_stats(self.top_n)
+        return buf.getvalue()
+
+    def write(self, log_dir: Path, tokens: Dict[str, str], pattern: Optional[str] = None) -> List[Path]:
+        """Schrijf per stage een dump (.prof of .html) en één top-N hotspot samenvatting (.txt)."""
+        pattern = _stage_pattern(pattern or "{datetime_hm_u}_{label_lower}_profile_{stage}.{ext}")
+        log_dir.mkdir(parents=True, exist_ok=True)
+        written: List[Path] = []
+        summary: List[str] = [f"# Profile ({self.mode}) – top {self.top_n} per stage", ""]
+        for stage, prof in self.results:
+            if self.mode == "sampling":
+                dump = log_dir / _expand(pattern, {**tokens, "stage": stage, "ext": "html"})
+                dump.write_text(prof.output_html(), encoding="utf-8")
+            else:
+                dump = log_dir / _expand(pattern, {**tokens, "stage": stage, "ext": "prof"})
+                prof.dump_stats(str(dump))
+            written.append(dump)
+            summary += [f"## {stage}  ({dump.name})", self._hotspots(prof), ""]
+        out = log_dir / _expand(pattern, {**tokens, "stage": "summary", "ext": "txt"})
+        out.write_text("\n".join(summary), encoding="utf-8")
+        written.append(out)
+        return written
@@ -0,0 +1,74 @@
+from __future__ import annotations
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+from .dtypes import as_text
+
+# Referentietabellen (in_table rule) één keer laden en hashen, gedeeld door runlist jobs.
+# Key bevat mtime/size zodat een gewijzigd bestand vanzelf opnieuw wordt ingelezen.
+_REF_CACHE: Dict[Tuple[Any, ...], Tuple[int, int, pd.Index]] = {}
+_REF_LOCK = threading.Lock()
+
+
+def table_label(spec: Dict[str, Any]) -> str:
+    """Naam van de tabel in reject reasons: ``name`` of ``bestand:kolom``."""
+    return str(spec.get("name") or f"{Path(str(spec.get('path', ''))).name}:{spec.get('column', '')}")
+
+
+def _read_reference(path: Path, column: str, sheet: Any, encoding: str) -> pd.Series:
+    from .io_excel import _read_excel_df
+    df = _read_excel_df(path, sheet, dtype="string", encoding=encoding)
+    if column not in df.columns:
+        raise SystemExit(f"in_table: kolom '{column}' niet gevonden in {path} (kolommen: {', '.join(map(str, df.columns))}).")
+    return df[column]
+
+
+def reference_index(spec: Dict[str, Any]) -> pd.Index:
+    """Unieke, gestripte waarden van de referentiekolom als hash-index (gecached op pad + mtime/size)."""
+    path = Path(str(spec.get("path", "")))
+    column = str(spec.get("column", ""))
+    sheet = spec.get("sheet")
+    encoding = spec.get("encoding", "utf-8-sig")
+    ignore_case = bool(spec.get("ignore_case", False))
+    try:
+        st = path.stat()
+    except OSError:
+        raise SystemExit(f"in_table: referentietabel niet gevonden: {path}")
+    key = (path.resolve(), column, sheet, encoding, ignore_case)
+    with _REF_LOCK:
+        hit = _REF_CACHE.get(key)
+    if hit is not None and hit[:2] == (st.st_mtime_ns, st.st_size):
+        return hit[2]
+    values = as_text(_read_reference(path, column, sheet, encoding).dropna()).str.strip()
+    if ignore_case:
+        values = values.str.upper()
+    index = pd.Index(values[values != ""].unique())
+    with _REF_LOCK:
+        _REF_CACHE[key] = (st.st_mtime_ns, st.st_size, index)
+    return index
+
+
+def in_table_mask(series: pd.Series, spec: Dict[str, Any]) -> pd.Series:
+    """True waar de (gestripte) waarde in de referentietabel voorkomt; gevectoriseerde hash-lookup."""
+    values = series.str.upper() if spec.get("ignore_case") else series
+    return values.isin(reference_index(spec))
+
+
+def check_reference(spec: Any) -> List[str]:
+    """Lint: problemen met een in_table spec zonder de hele tabel te laden."""
+    if not isinstance(spec, dict) or not spec.get("path") or not spec.get("column"):
+        return ["in_table vereist 'path' en 'column'"]
+    path = Path(str(spec["path"]))
+    if not path.exists():
+        return [f"referentietabel niet gevonden: {path}"]
+    try:
+        from .io_excel import _read_excel_df
+        header = _read_excel_df(path, spec.get("sheet"), encoding=spec.get("encoding", "utf-8-sig"), nrows=0)
+    except Exception as e:
+        return [f"referentietabel niet leesbaar: {path} ({e})"]
+    if str(spec["column"]) not in header.columns:
+        return [f"kolom '{spec['column']}' niet gevonden in {path}"]
+    return []
@@ -0,0 +1,348 @@
+from __future__ import annotations
+import re
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+try:  # Python 3.11+: sre_parse is deprecated ten gunste van re._parser
+    from re import _parser as _sre
+    from re import _constants as _c
+except ImportError:  # pragma: no cover - Python < 3.11
+    import sre_parse as _sre
+    import sre_constants as _c
+
+# Vaste patronen voor sanitize/mojibake: één keer compileren i.p.v. per cel of per run
+WS_RE = re.compile(r"\s+")
+CTRL_RE = re.compile(r"[\u0000-\u0008\u000B\u000C\u000E-\u001F\u007F]")
+# Zelfde klassen als string voor Arrow (RE2): alle tekens waarvoor str.isspace() True is, expliciet
+# (RE2's \s is alleen ASCII)
+WS_CLASS = "[\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]"
+CTRL_CLASS = r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]"
+MOJIBAKE_SUSPECTS = ("Ã¶", "Ã¤", "Ã¼", "ÃŸ", "Ã©", "Ãª", "Ã¡", "Ãº", "Ã±", "Ã¸", "Ã¥")
+MOJIBAKE_PATTERN = "|".join(map(re.escape, MOJIBAKE_SUSPECTS))
+MOJIBAKE_PAIR_RE = re.compile(r"Ã[\x80-\xBF]")
+# Breder (UTF-8 gelezen als latin1/cp1252): Ã/Â + vervolgbyte (ook cp1252's Ÿ, €, ...), of â€ (–, “, ’ ...).
+# Letterlijke tekens (geen escapes), zodat re en RE2 (Arrow) hetzelfde patroon lezen.
+_CONTINUATION = "".join(sorted({bytes([b]).decode(enc, "ignore") for b in range(0x80, 0xC0) for enc in ("latin1", "cp1252")} - {""}))
+MOJIBAKE_SUSPECT_PATTERN = f"[\u00c2\u00c3][{_CONTINUATION}]|\u00e2\u20ac"
+MOJIBAKE_SUSPECT_RE = re.compile(MOJIBAKE_SUSPECT_PATTERN)
+
+_MAX_SET_SIZE = 4096
+_PATTERN_CACHE_SIZE = 1024          # config-patronen: ruim genoeg voor alle objecten/varianten in een runlist
+_CATEGORY_TESTS: Dict[Any, Callable[[str], bool]] = {
+    _c.CATEGORY_DIGIT: str.isdecimal,
+    _c.CATEGORY_NOT_DIGIT: lambda ch: not ch.isdecimal(),
+    _c.CATEGORY_SPACE: str.isspace,
+    _c.CATEGORY_NOT_SPACE: lambda ch: not ch.isspace(),
+    _c.CATEGORY_WORD: lambda ch: ch.isalnum() or ch == "_",
+    _c.CATEGORY_NOT_WORD: lambda ch: not (ch.isalnum() or ch == "_"),
+}
+
+
+@dataclass(frozen=True)
+class CompiledPattern:
+    """Config-pattern, één keer gecompileerd; ``fast`` is een exact equivalent van ``regex.match`` zonder regex-engine.
+
+    ``arrow``/``arrow_sub``: hetzelfde pattern in RE2-syntax met Python-semantiek voor match/replace op
+    Arrow-kolommen, of None als dat niet exact kan; dan loopt ook een Arrow-kolom via het Python-pad.
+    """
+    pattern: str
+    regex: "re.Pattern[str]"
+    fast: Optional[Callable[[str], bool]] = None
+    arrow: Optional[str] = None
+    arrow_sub: Optional[str] = None
+
+    # pandas/numpy pas bij gebruik importeren: lint (compile + backtracking check) blijft zo licht
+    def match(self, s: "pd.Series") -> "pd.Series":
+        """Bool per waarde, zoals ``s.str.match(pattern, na=False)``."""
+        import numpy as np
+        import pandas as pd
+        from .dtypes import is_arrow_text
+        if self.arrow is not None and is_arrow_text(s):
+            return s.str.match(self.arrow, na=False).astype(bool)   # Arrow: gevectoriseerd in C++ (RE2)
+        test = self.fast or (lambda v, _m=self.regex.match: _m(v) is not None)
+        values = s.to_numpy(dtype=object)
+        try:
+            out = np.fromiter(map(test, values), dtype=bool, count=len(values))
+        except (TypeError, AttributeError):               # NaN/niet-strings: als na=False
+            out = np.fromiter((isinstance(v, str) and test(v) for v in values), dtype=bool, count=len(values))
+        return pd.Series(out, index=s.index)
+
+    def replace(self, s: "pd.Series", repl: str) -> "pd.Series":
+        from .dtypes import is_arrow_text
+        if self.arrow_sub is not None and "\\" not in repl and is_arrow_text(s):
+            return s.str.replace(self.arrow_sub, repl, regex=True)
+        return s.str.replace(self.regex, repl, regex=True)
+
+
+# --- Fast paths: ^ATOM{m,n}$ (tekenklasse + lengte) en ^(lit|lit|...)$ (set-lookup)
+
+def _char_test(op, av) -> Optional[Callable[[str], bool]]:
+    """Test voor één teken (LITERAL/ANY/IN), of None als het geen simpele klasse is."""
+    if op is _c.LITERAL:
+        ch = chr(av)
+        return ch.__eq__
+    if op is _c.ANY:
+        return "\n".__ne__
+    if op is not _c.IN:
+        return None
+    negate, chars, tests = False, set(), []
+    for iop, iav in av:
+        if iop is _c.NEGATE:
+            negate = True
+        elif iop is _c.LITERAL:
+            chars.add(chr(iav))
+        elif iop is _c.RANGE and iav[1] - iav[0] < _MAX_SET_SIZE:
+            chars.update(chr(i) for i in range(iav[0], iav[1] + 1))
+        elif iop is _c.CATEGORY and iav in _CATEGORY_TESTS:
+            tests.append(_CATEGORY_TESTS[iav])
+        else:
+            return None
+    allowed = frozenset(chars)
+    if not tests:
+        return (lambda ch: ch not in allowed) if negate else allowed.__contains__
+    if not allowed and len(tests) == 1 and not negate:
+        return tests[0]
+    hit = lambda ch: ch in allowed or any(t(ch) for t in tests)
+    return (lambda ch: not hit(ch)) if negate else hit
+
+
+def _string_test(op, av) -> Optional[Callable[[str], bool]]:
+    """Test voor een hele string die volledig uit tekens van deze klasse bestaat."""
+    if op is _c.IN and av == [(_c.CATEGORY, _c.CATEGORY_DIGIT)]:
+        return str.isdecimal                         # \d: str.isdecimal is exact Unicode Nd
+    negate = op is _c.IN and bool(av) and av[0][0] is _c.NEGATE
+    items = av[1:] if negate else av
+    if op is _c.IN and all(iop in (_c.LITERAL, _c.RANGE) for iop, _ in items) \
+            and sum(1 if iop is _c.LITERAL else iav[1] - iav[0] + 1 for iop, iav in items) <= _MAX_SET_SIZE:
+        chars = frozenset(chr(i) for iop, iav in items
+                          for i in ([iav] if iop is _c.LITERAL else range(iav[0], iav[1] + 1)))
+        return chars.isdisjoint if negate else chars.issuperset
+    ch_ok = _char_test(op, av)
+    if ch_ok is None:
+        return None
+    return lambda v: all(map(ch_ok, v))
+
+
+def _scoped_flags(items) -> bool:
+    """Bevat de subtree een groep met eigen flags ((?i:...), (?s:...))? Die vallen buiten de fast paths."""
+    for op, av in items:
+        if op is _c.SUBPATTERN and (av[1] or av[2] or _scoped_flags(av[-1])):
+            return True
+        if op is _c.BRANCH and any(_scoped_flags(b) for b in av[1]):
+            return True
+        if op in (_c.MAX_REPEAT, _c.MIN_REPEAT) and _scoped_flags(av[2]):
+            return True
+    return False
+
+
+def _literal_alternatives(items) -> Optional[List[str]]:
+    if len(items) == 1 and items[0][0] is _c.SUBPATTERN:
+        items = list(items[0][1][-1])
+    if len(items) == 1 and items[0][0] is _c.BRANCH:
+        out = []
+        for branch in items[0][1][1]:
+            if not all(op is _c.LITERAL for op, _ in branch):
+                return None
+            out.append("".join(chr(av) for _, av in branch))
+        return out
+    if len(items) == 1 and items[0][0] is _c.IN and all(op is _c.LITERAL for op, _ in items[0][1]):
+        return [chr(av) for _, av in items[0][1]]
+    if items and all(op is _c.LITERAL for op, _ in items):
+        return ["".join(chr(av) for _, av in items)]
+    return None
+
+
+def _fast_matcher(pattern: str) -> Optional[Callable[[str], bool]]:
+    try:
+        parsed = _sre.parse(pattern)
+    except Exception:
+        return None
+    if parsed.state.flags & (re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE | re.ASCII | re.LOCALE):
+        return None
+    items = list(parsed)
+    if items and items[0] in ((_c.AT, _c.AT_BEGINNING), (_c.AT, _c.AT_BEGINNING_STRING)):
+        items = items[1:]                              # re.match is al aan het begin verankerd
+    end = None
+    if items and items[-1][0] is _c.AT and items[-1][1] in (_c.AT_END, _c.AT_END_STRING):
+        end = items[-1][1]; items = items[:-1]
+    if any(op is _c.AT for op, _ in items) or _scoped_flags(items):
+        return None
+
+    # Eén platte closure per vorm: elke extra Python-frame per waarde kost meer dan de regex zelf
+    alts = _literal_alternatives(items)
+    if alts is not None:
+        if end is None:
+            return lambda v, _a=tuple(alts): v.startswith(_a)      # zonder $: alleen het begin moet passen
+        options = set(alts)
+        if end == _c.AT_END:
+            options |= {a + "\n" for a in alts}                  # $ matcht ook vóór een afsluitende newline
+        return frozenset(options).__contains__
+    if len(items) != 1:
+        return None
+    op, av = items[0]
+    lo = hi = 1
+    if op in (_c.MAX_REPEAT, _c.MIN_REPEAT) and len(av[2]) == 1:
+        lo, hi, (op, av) = av[0], av[1], av[2][0]
+    if op in (_c.MAX_REPEAT, _c.MIN_REPEAT, _c.SUBPATTERN, _c.BRANCH):
+        return None
+    ok = _string_test(op, av)
+    if ok is None:
+        return None
+    if lo == 0:                                        # ^\d*$ matcht ook "" (str.isdecimal("") is False)
+        ok = lambda v, _ok=ok: not v or _ok(v)
+    if hi is _c.MAXREPEAT or hi == _c.MAXREPEAT:
+        hi = sys.maxsize
+    if end is None:
+        return lambda v: len(v) >= lo and ok(v[:lo])
+    if end == _c.AT_END_STRING:
+        return lambda v: lo <= len(v) <= hi and ok(v)
+    return lambda v: (lo <= len(v) <= hi and ok(v)) or (v[-1:] == "\n" and lo < len(v) <= hi + 1 and ok(v[:-1]))
+
+
+# --- RE2 (Arrow): Python-pattern vertalen als de betekenis exact gelijk blijft, anders None
+# RE2 leest \d als [0-9], $ als absoluut einde en kent geen lookarounds, backrefs, \Z of {,n}.
+
+_RE2_ESCAPES = {"d": r"\p{Nd}", "D": r"\P{Nd}", "A": r"\A", "Z": r"\z"}
+_RE2_KEEP = frozenset("tnrfvax")
+_RE2_MAX_REPEAT = 1000
+
+
+def _re2_pattern(pattern: str, match: bool = True) -> Optional[str]:
+    """Pattern in RE2-syntax met dezelfde uitkomst als ``re.match`` (``match``) of ``re.sub``, of None."""
+    out: List[str] = []
+    i, n, in_class = 0, len(pattern), False
+    while i < n:
+        ch = pattern[i]
+        if ch == "\\":
+            if i + 1 >= n:
+                return None
+            nxt = pattern[i + 1]
+            if nxt in _RE2_ESCAPES:
+                out.append(_RE2_ESCAPES[nxt]); i += 2; continue
+            if nxt == "u" and re.fullmatch(r"[0-9a-fA-F]{4}", pattern[i + 2:i + 6]):
+                out.append(f"\\x{{{pattern[i + 2:i + 6]}}}"); i += 6; continue
+            if nxt.isalnum() and nxt not in _RE2_KEEP:          # \s \w \b, backrefs, octaal, \N{...}
+                return None
+            out.append(pattern[i:i + 2]); i += 2; continue
+        if in_class:
+            if ch == "[" and pattern[i + 1:i + 2] in (":", "=", "."):   # RE2: [[:alpha:]]
+                return None
+            if ch == "]" and out[-1] not in ("[", "[^"):
+                in_class = False
+            out.append(ch); i += 1; continue
+        if ch == "[":
+            in_class = True
+            neg = pattern[i + 1:i + 2] == "^"
+            out.append("[^" if neg else "["); i += 2 if neg else 1; continue
+        if ch == "(" and pattern[i + 1:i + 2] == "?" and pattern[i + 2:i + 3] != ":" \
+                and not (pattern[i + 2:i + 4] == "P<"):
+            return None                                          # lookaround, flags, (?P=..), (?>..)
+        if ch in "*+?}" and pattern[i + 1:i + 2] == "+":
+            return None                                          # possessive quantifier
+        if ch == "{":
+            m = re.match(r"\{(\d*)(,?)(\d*)\}", pattern[i:])
+            if m and ((m.group(2) and not m.group(1))
+                      or any(g and int(g) > _RE2_MAX_REPEAT for g in (m.group(1), m.group(3)))):
+                return None                                      # {,n} of boven de RE2-limiet
+        if ch == "$":
+            if i != n - 1 or not match:
+                return None
+            out.append(r"\n?$"); i += 1; continue           # $ matcht ook vóór een afsluitende newline
+        out.append(ch); i += 1
+    return None if in_class else "".join(out)
+
+
+@lru_cache(maxsize=_PATTERN_CACHE_SIZE)
+def compile_pattern(pattern: str) -> CompiledPattern:
+    """Procesbrede cache: dezelfde patronen over runlist-jobs en configs heen één keer compileren."""
+    regex = re.compile(pattern)
+    arrow = arrow_sub = None
+    if not regex.flags & (re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE | re.ASCII | re.LOCALE):
+        body = _re2_pattern(pattern)
+        arrow = f"^(?:{body})" if body is not None else None     # re.match: elke alternatief aan het begin
+        # lege matches vervangen re.sub en RE2 verschillend
+        arrow_sub = _re2_pattern(pattern, match=False) if regex.fullmatch("") is None else None
+    return CompiledPattern(pattern, regex, _fast_matcher(pattern), arrow, arrow_sub)
+
+
+# --- Lint: patronen met (exponentiële) backtracking
+
+_REPEATS = (_c.MAX_REPEAT, _c.MIN_REPEAT)   # possessive repeats backtracken niet
+
+
+def _repeats_many(hi) -> bool:
+    return hi is _c.MAXREPEAT or hi == _c.MAXREPEAT or hi > 1
+
+
+def _has_repeat(items) -> bool:
+    """Bevat de subtree een quantifier met variabele lengte (a+, a*, a{1,5})?"""
+    for op, av in items:
+        if op in _REPEATS and (av[0] != av[1] or _has_repeat(av[2])):
+            return True
+        if op is _c.SUBPATTERN and _has_repeat(av[-1]):
+            return True
+        if op is _c.BRANCH and any(_has_repeat(b) for b in av[1]):
+            return True
+    return False
+
+
+def _first_chars(items) -> Optional[set]:
+    for op, av in items:
+        if op is _c.LITERAL:
+            return {av}
+        if op is _c.SUBPATTERN:
+            return _first_chars(av[-1])
+        return None
+    return set()
+
+
+def _overlapping_branch(body) -> bool:
+    for bop, bav in body:
+        for sop, sav in (bav[-1] if bop is _c.SUBPATTERN else [(bop, bav)]):
+            if sop is not _c.BRANCH:
+                continue
+            if any(not b for b in sav[1]):
+                return True
+            known = [f for f in (_first_chars(b) for b in sav[1]) if f]
+            if len(known) != len({c for f in known for c in f}):
+                return True
+    return False
+
+
+def _scan(items) -> Optional[str]:
+    prev = None
+    for op, av in items:
+        if op in _REPEATS:
+            lo, hi, body = av
+            if _repeats_many(hi):
+                if _has_repeat(body):
+                    return "geneste quantifier, bv. (a+)+"
+                if _overlapping_branch(body):
+                    return "overlappende alternatieven onder quantifier, bv. (a|ab)*"
+                if prev is not None and prev[0] in _REPEATS and list(prev[1][2]) == list(body) \
+                        and _repeats_many(prev[1][1]) and (hi is _c.MAXREPEAT or hi == _c.MAXREPEAT):
+                    return "aaneengesloten gelijke quantifiers, bv. .*.*"
+            reason = _scan(body)
+            if reason:
+                return reason
+        elif op is _c.SUBPATTERN:
+            reason = _scan(av[-1])
+            if reason:
+                return reason
+        elif op is _c.BRANCH:
+            for b in av[1]:
+                reason = _scan(b)
+                if reason:
+                    return reason
+        prev = (op, av)
+    return None
+
+
+def backtracking_risk(pattern: str) -> Optional[str]:
+    """Reden waarom een pattern catastrophic backtracking kan geven, of None."""
+    try:
+        return _scan(list(_sre.parse(pattern)))
+    except Exception:
+        return None
@@ -0,0 +1,143 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+# Gestructureerde reject-details: één rij per (rij, kolom, rule, melding). Het ``__errors`` veld
+# in de rejects CSV blijft voor mensen; analyses (reasons, per kolom, top-waarden) lezen dit artifact.
+DETAIL_COLUMNS = ["row", "row_id", "column", "rule", "message", "value"]
+DETAILS_SUFFIX = "_reject_details"
+DETAIL_FORMATS = ("parquet", "csv")
+
+
+class RejectRecords:
+    """Verzamelt validatiefouten per rule als blokken (gevectoriseerd), in dezelfde volgorde als ``errors``."""
+
+    def __init__(self) -> None:
+        self._blocks: List[pd.DataFrame] = []
+
+    def add(self, values: pd.Series, column: str, rule: str, message: Union[str, Sequence[str]]) -> None:
+        """``values``: de afgekeurde (gestripte) waarden, geïndexeerd op rij-index."""
+        if not len(values):
+            return
+        self._blocks.append(pd.DataFrame({
+            "row": values.index.to_numpy(),
+            "column": column,
+            "rule": rule,
+            "message": message if isinstance(message, str) else list(message),
+            "value": values.to_numpy(dtype=object),
+        }))
+
+    def extend(self, frame: pd.DataFrame) -> None:
+        if len(frame):
+            self._blocks.append(frame[[c for c in DETAIL_COLUMNS if c != "row_id"]])
+
+    def frame(self, df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Alle records, stabiel gesorteerd op rij; ``row_id`` = lineage ``__row_id`` (bronrij) indien aanwezig."""
+        if not self._blocks:
+            return pd.DataFrame({c: pd.Series(dtype=object) for c in DETAIL_COLUMNS})
+        out = pd.concat(self._blocks, ignore_index=True)
+        out = out.iloc[out["row"].argsort(kind="stable")].reset_index(drop=True)
+        if df is not None and "__row_id" in df.columns:
+            out.insert(1, "row_id", df["__row_id"].reindex(out["row"]).to_numpy())
+        else:
+            out.insert(1, "row_id", out["row"].to_numpy())
+        return out
+
+
+def details_format(cfg_meta: Optional[Dict[str, Any]], report: bool = False) -> Optional[str]:
+    """meta.reports.reject_details: parquet | csv | none; niet ingesteld → alleen met ``report`` (--report),
+    dan parquet als pyarrow er is, anders csv."""
+    fmt = (((cfg_meta or {}).get("reports") or {}).get("reject_details"))
+    fmt = "auto" if fmt is None else str(fmt).lower()
+    if fmt in ("none", "false", "off") or (fmt == "auto" and not report):
+        return None
+    if fmt == "auto":
+        try:
+            import pyarrow  # noqa: F401  (optioneel)
+            return "parquet"
+        except ImportError:
+            return "csv"
+    if fmt not in DETAIL_FORMATS:
+        raise SystemExit(f"meta.reports.reject_details '{fmt}' onbekend (kies uit parquet, csv, none).")
+    return fmt
+
+
+def write_reject_details(details: pd.DataFrame, path: Path, encoding: str = "utf-8-sig") -> Path:
+    if path.suffix == ".parquet":
+        out = details.astype({"column": "category", "rule": "category", "message": "category",
+                              "value": "string"})
+        out.to_parquet(path, index=False)
+    else:
+        details.to_csv(path, index=False, encoding=encoding)
+    return path
+
+
+def find_reject_details(target: Path) -> Path:
+    """Bestand zelf, of het nieuwste ``*_reject_details.*`` in een map."""
+    if target.is_file():
+        return target
+    found = sorted((p for p in target.glob(f"*{DETAILS_SUFFIX}.*") if p.suffix in (".parquet", ".csv")),
+                   key=lambda p: p.stat().st_mtime)
+    if not found:
+        raise SystemExit(f"Geen reject details gevonden in {target} (*{DETAILS_SUFFIX}.parquet/.csv).")
+    return found[-1]
+
+
+def read_reject_details(path: Path) -> pd.DataFrame:
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype={"column": "string", "rule": "string", "message": "string", "value": "string"},
+                       keep_default_na=False, encoding="utf-8-sig")
+
+
+def reason_tally(details: pd.DataFrame) -> Dict[str, int]:
+    """reason → count in volgorde van eerste voorkomen (chunks optellen behoudt die volgorde)."""
+    return {str(k): int(v) for k, v in details["message"].astype(str).value_counts(sort=False).items()}
+
+
+def reason_frame(tally: Dict[str, int]) -> pd.DataFrame:
+    """Aflopend op count; gelijke counts in volgorde van eerste voorkomen (in-memory en chunked gelijk)."""
+    counts = pd.Series(tally, dtype="int64").sort_values(ascending=False, kind="stable")
+    return counts.rename_axis("reason").reset_index(name="count")
+
+
+def reason_counts(details: pd.DataFrame) -> pd.DataFrame:
+    """reason → count (zelfde vorm als de reject reasons CSV)."""
+    return reason_frame(reason_tally(details))
+
+
+def column_breakdown(details: pd.DataFrame) -> pd.DataFrame:
+    """Per (kolom, rule): aantal fouten en aantal geraakte rijen."""
+    g = details.groupby(["column", "rule"], observed=True, sort=False)
+    out = pd.DataFrame({"errors": g.size(), "rows": g["row_id"].nunique()}).reset_index()
+    return out.sort_values(["errors", "column"], ascending=[False, True], kind="stable").reset_index(drop=True)
+
+
+def top_values(details: pd.DataFrame, n: int = 5) -> pd.DataFrame:
+    """Per kolom de n vaakst afgekeurde waarden."""
+    g = details.assign(value=details["value"].astype(str)).groupby(["column", "value"], observed=True, sort=False).size()
+    out = g.rename("count").reset_index().sort_values(["column", "count"], ascending=[True, False], kind="stable")
+    return out.groupby("column", observed=True, sort=False).head(n).reset_index(drop=True)
+
+
+def print_reject_stats(target: Path, top: int = 10) -> int:
+    """--reject-stats: samenvatting van een reject details artifact zonder de pipeline te draaien."""
+    path = find_reject_details(target)
+    details = read_reject_details(path)
+    print(f"Reject details: {path}")
+    print(f"Rijen afgekeurd: {details['row_id'].nunique()}  |  fouten: {len(details)}")
+    if details.empty:
+        return 0
+    print("\nTop reasons:")
+    for reason, count in reason_counts(details).head(top).itertuples(index=False):
+        print(f"  {count:>8}  {reason}")
+    print("\nPer kolom / rule:")
+    for col, rule, errors, rows in column_breakdown(details).itertuples(index=False):
+        print(f"  {col:<24} {rule:<12} {errors:>8} fouten  {rows:>8} rijen")
+    print(f"\nTop waarden per kolom (max {min(top, 5)}):")
+    for col, part in top_values(details, min(top, 5)).groupby("column", observed=True, sort=False):
+        vals = ", ".join(f"'{v}' ({c})" for v, c in zip(part["value"], part["count"]))
+        print(f"  {col}: {vals}")
+    return 0
@@ -4,6 +4,8 @@ from pathlib import Path
 from typing import List, Optional
 import pandas as pd
 from .config import TransformConfig
+from .dtypes import as_text
+from .rejects import DETAILS_SUFFIX, details_format, reason_counts, write_reject_details
 
 def _column_profile_lines(df: pd.DataFrame, cfg: TransformConfig) -> List[str]:
    lines: List[str] = []
@@ -12,18 +14,19 @@ def _column_profile_lines(df: pd.DataFrame, cfg: TransformConfig) -> List[str]:
    for col in ordered:
        s = df[col]; total = len(s)
        non_null = int(s.notna().sum()); nulls = total - non_null
-       empty = int(s.fillna("").astype(str).str.strip().eq("").sum())
+       text = as_text(s.fillna(""))
+       empty = int(text.str.strip().eq("").sum())
        unique = int(s.nunique(dropna=True))
-       lengths = s.fillna("").astype(str).str.len()
+       lengths = text.str.len()
        min_len = int(lengths.min()) if total else 0; max_len = int(lengths.max()) if total else 0
        lines += [f"## {col}",
                  f"- non-null: **{non_null}** / {total}  |  null: **{nulls}**  |  empty (after strip): **{empty}**",
                  f"- unique: **{unique}**  |  len(min/max): **{min_len} / {max_len}**"]
-       vc = s.astype(object).where(s.notna(), "NaN").value_counts(dropna=False).head(5)
+       vc = s.value_counts(dropna=False).head(5)
        if len(vc):
            lines += ["", "| value | count |", "|---|---:|"]
            for v, cnt in vc.items():
-               val = str(v); val = val if len(val) <= 80 else val[:77]+"..."
+               val = "NaN" if pd.isna(v) else str(v); val = val if len(val) <= 80 else val[:77]+"..."
                lines.append(f"| `{val}` | {int(cnt)} |")
        lines.append("")
    return lines
@@ -104,8 +107,9 @@ def generate_report_html(df: pd.DataFrame, cfg: TransformConfig, label: str, sta
    ordered = [c for c in cfg.column_map.keys() if c in df.columns] + [c for c in cols if c not in cfg.column_map]
    for col in ordered:
        s = df[col]; total = len(s); non_null = int(s.notna().sum()); nulls = total - non_null
-       empty = int(s.fillna('').astype(str).str.strip().eq('').sum())
-       unique = int(s.nunique(dropna=True)); lengths = s.fillna('').astype(str).str.len()
+       text = as_text(s.fillna(''))
+       empty = int(text.str.strip().eq('').sum())
+       unique = int(s.nunique(dropna=True)); lengths = text.str.len()
        min_len = int(lengths.min()) if total else 0; max_len = int(lengths.max()) if total else 0
        html.append(f"<h2>{esc(col)}</h2><table>")
        html.append("<tr><th>Metric</th><th>Value</th></tr>")
@@ -114,11 +118,11 @@ def generate_report_html(df: pd.DataFrame, cfg: TransformConfig, label: str, sta
        html.append(f"<tr><td>empty (after strip)</td><td>{empty}</td></tr>")
        html.append(f"<tr><td>unique</td><td>{unique}</td></tr>")
        html.append(f"<tr><td>len(min/max)</td><td>{min_len} / {max_len}</td></tr>")
-       vc = s.astype(object).where(s.notna(), "NaN").value_counts(dropna=False).head(5)
+       vc = s.value_counts(dropna=False).head(5)
        if len(vc):
            html.append("<tr><th colspan='2'>top values</th></tr>")
            for v, cnt in vc.items():
-               val = str(v); val = val if len(val) <= 120 else val[:117]+"..."
+               val = "NaN" if pd.isna(v) else str(v); val = val if len(val) <= 120 else val[:117]+"..."
                html.append(f"<tr><td><code>{esc(val)}</code></td><td>{int(cnt)}</td></tr>")
        html.append("</table>")
    if baseline is not None:
@@ -128,12 +132,22 @@ def generate_report_html(df: pd.DataFrame, cfg: TransformConfig, label: str, sta
    out_path.write_text("".join(html), encoding=_get_enc(cfg, "reports_html", "utf-8-sig"))
    return out_path
 
-def write_reject_reasons_csv(reject_df: pd.DataFrame, log_dir: Path, label: str, cfg: TransformConfig):
-   if "__errors" not in reject_df.columns or reject_df.empty: return None
-   reasons = reject_df["__errors"].fillna("").astype(str).str.split("; ").explode()
-   if reasons.empty: return None
-   top = reasons.value_counts().rename_axis("reason").reset_index(name="count")
+def write_reject_reasons_csv(details: pd.DataFrame, log_dir: Path, label: str, cfg: TransformConfig,
+                            counts: Optional[pd.DataFrame] = None):
+   """Reason counts uit de gestructureerde reject details (geen split/explode van __errors); chunked: ``counts``."""
+   top = counts if counts is not None else (reason_counts(details) if details is not None else None)
+   if top is None or top.empty: return None
    out_path = log_dir / f"{datetime.now():%Y%m%d_%H%M}_{label.lower()}_reject_reasons.csv"
    enc = ((cfg.meta or {}).get("encoding") or {}).get("reports_csv", "utf-8-sig")
    top.to_csv(out_path, index=False, encoding=enc)
    return out_path
+
+def reject_details_path(log_dir: Path, label: str, fmt: str) -> Path:
+   return log_dir / f"{datetime.now():%Y%m%d_%H%M}_{label.lower()}{DETAILS_SUFFIX}.{fmt}"
+
+def write_reject_details_file(details: pd.DataFrame, log_dir: Path, label: str, cfg: TransformConfig,
+                             report: bool = False) -> Optional[Path]:
+   """Reject details artifact (parquet/csv) in logdir; leesbaar met --reject-stats."""
+   fmt = details_format(cfg.meta, report)
+   if fmt is None or details is None or details.empty: return None
+   return write_reject_details(details, reject_details_path(log_dir, label, fmt), encoding=_get_enc(cfg, "reports_csv", "utf-8-sig"))
@@ -1,34 +1,109 @@
 from __future__ import annotations
 from argparse import Namespace
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 import yaml
 
-from .pipeline import run_pipeline
+
+class Prefetcher:
+    """Leest bronnen van komende runlist-jobs in een achtergrondthread (in volgorde, 1 tegelijk).
+
+    depth = max. aantal jobs vooruit; budget = max. bytes aan ingelezen maar nog niet verwerkte frames
+    (daarboven wacht de prefetch tot de huidige job zijn frame heeft opgepakt); skip = jobs die niet vooruit
+    gelezen mogen worden (hun bron is de uitvoer van een eerdere job).
+    """
+
+    def __init__(self, runs: List[Namespace], depth: int = 1, budget: Optional[int] = None,
+                 skip: Optional[Set[int]] = None):
+        self.runs = runs
+        self.depth = max(0, depth)
+        self.budget = budget
+        self.skip = skip or set()
+        self._futures: Dict[int, Future] = {}
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="myd-prefetch") if self.depth else None
+
+    def _pending_bytes(self) -> int:
+        return sum(f.result().nbytes for f in self._futures.values() if f.done() and not f.exception())
+
+    def fill(self, start: int) -> None:
+        if self._pool is None:
+            return
+        from .pipeline import prefetch_load
+        for k in range(start, min(start + self.depth, len(self.runs))):
+            if k in self._futures or k in self.skip:
+                continue
+            if self.budget is not None and self._futures and self._pending_bytes() >= self.budget:
+                break
+            self._futures[k] = self._pool.submit(prefetch_load, self.runs[k])
+
+    def take(self, k: int) -> Optional[Future]:
+        return self._futures.pop(k, None)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+def chained_jobs(runs: List[Namespace]) -> Set[int]:
+    """Jobs waarvan de bron het export- of rejectbestand van een eerdere job is (niet prefetchen)."""
+    from .config import build_config
+    produced: Set[Path] = set()
+    chained: Set[int] = set()
+    for k, ns in enumerate(runs):
+        try:
+            cfg = build_config(Namespace(**{**vars(ns), "trace_config": False}), create_dirs=False)
+        except SystemExit:
+            continue
+        if Path(cfg.input_file).resolve() in produced:
+            chained.add(k)
+        produced.update(Path(p).resolve() for p in (cfg.output_file, cfg.reject_file) if p)
+    return chained
 
 
 def run_from_runlist(config_root: Path, runlist_path: Path, lint_only: bool = False, strict: bool = False,
                      trace: bool = False, global_sample: Optional[int] = None, global_report: bool = False,
                      global_report_format: str = "md", quiet: bool = False, no_txt_log: bool = False,
-                     classic_summary: bool = False, fail_on_rejects: bool = False, fail_on_zero_valid: bool = False) -> int:
+                     classic_summary: bool = False, fail_on_rejects: bool = False, fail_on_zero_valid: bool = False,
+                     global_metrics: bool = False, log_dir: str = "logs",
+                     global_profile: Optional[str] = None, profile_top: int = 20,
+                     global_sample_mode: Optional[str] = None, global_sample_seed: Optional[int] = None,
+                     global_sample_by: Optional[str] = None, global_workers: Optional[int] = None,
+                     global_prefetch: Optional[int] = None, global_memory_budget: Optional[str] = None) -> int:
     data = yaml.safe_load(runlist_path.read_text(encoding="utf-8"))
-    jobs = data.get("jobs", [])
+    jobs = data.get("jobs") or data.get("runs") or []
     exit_code = 0
+    job_metrics: List[Dict[str, Any]] = []
+    runs: List[Tuple[str, Namespace]] = []
     for j in jobs:
         job_sample = j.get("sample", None)
         job_report = j.get("report", None)
         job_report_format = j.get("report_format", None)
+        job_reports = j.get("reports", None)
+        if isinstance(job_reports, list):
+            job_reports = ",".join(job_reports)
         job_quiet = j.get("quiet", None)
+        job_metrics_on = j.get("metrics", None)
+        job_profile = j.get("profile", None)
+        if job_profile is True:
+            job_profile = "cprofile"
 
         ns = Namespace(
             object_name=j.get("object"),
             variant_name=j.get("variant"),
             config_dir=str(config_root),
-            input_file=j.get("input_file"),
+            input_file=j.get("input_file") or j.get("input"),
             output_file=j.get("output_file"),
             reject_file=j.get("reject_file"),
-            log_dir=j.get("log_dir", "logs"),
+            log_dir=j.get("log_dir", log_dir),
             sample=job_sample if job_sample is not None else global_sample,
+            sample_mode=j.get("sample_mode", global_sample_mode),
+            sample_seed=j.get("sample_seed", global_sample_seed),
+            sample_by=j.get("sample_by", global_sample_by),
+            reports=job_reports,
             report=job_report if job_report is not None else global_report,
             report_format=job_report_format if job_report_format is not None else global_report_format,
             scaffold_object=None, from_excel=None, force=False, dry_run=False,
@@ -37,19 +112,55 @@ def run_from_runlist(config_root: Path, runlist_path: Path, lint_only: bool = Fa
             quiet=job_quiet if job_quiet is not None else quiet,
             classic_summary=classic_summary,
             ci=False, fail_on_rejects=fail_on_rejects, fail_on_zero_valid=fail_on_zero_valid,
+            metrics=job_metrics_on if job_metrics_on is not None else global_metrics,
+            profile=(job_profile or None) if job_profile is not None else global_profile,
+            profile_top=profile_top,
+            workers=j.get("workers", global_workers),
+            memory_budget=j.get("memory_budget", global_memory_budget),
         )
         label = f"{j.get('object')}_{j.get('variant')}" if j.get("variant") else j.get("object")
-        if lint_only:
+        runs.append((label, ns))
+
+    if lint_only:
+        from .linting import lint_config
+        for label, ns in runs:
             print(f"\n=== LINT {label} ===")
-            from .linting import lint_config
             rc = lint_config(ns)
             exit_code = exit_code or rc
-        else:
+        return exit_code
+
+    from .pipeline import ExportWriter, run_pipeline
+    pipe = data.get("pipeline") or {}
+    depth = int(global_prefetch if global_prefetch is not None else pipe.get("prefetch", 1))
+    budget_mb = pipe.get("memory_budget_mb")
+    jobs_ns = [ns for _, ns in runs]
+    prefetcher = Prefetcher(jobs_ns, depth, int(budget_mb * 2**20) if budget_mb else None,
+                            skip=chained_jobs(jobs_ns) if depth > 0 else None)
+    writer = ExportWriter() if depth > 0 and pipe.get("async_writes", True) else None
+    t0 = time.perf_counter()
+    try:
+        for k, (label, ns) in enumerate(runs):
             print(f"\n=== RUN {label} ===")
-            res = run_pipeline(ns)
+            loaded = prefetcher.take(k)
+            prefetcher.fill(k + 1)               # volgende job(s) inlezen terwijl deze rekent
+            res = run_pipeline(ns, prefetched=loaded, writer=writer)   # export is klaar als dit terugkomt
+            if ns.metrics and res.get("metrics"):
+                job_metrics.append(res["metrics"])
             if fail_on_rejects and res["rejected"] > 0:
                 exit_code = 1
             if fail_on_zero_valid and res["valid"] == 0:
                 exit_code = 1
+    finally:
+        prefetcher.close()
+        if writer is not None:
+            writer.close()                       # schrijffouten niet inslikken
+    if job_metrics:
+        from .metrics import aggregate_metrics, append_metrics_ndjson
+        agg = Path(log_dir) / f"{datetime.now():%Y%m%d_%H%M}_runlist_{runlist_path.stem.lower()}_metrics.ndjson"
+        for jm in job_metrics:
+            append_metrics_ndjson(agg, jm)
+        append_metrics_ndjson(agg, aggregate_metrics(f"runlist:{runlist_path.stem}", job_metrics,
+                                                     wall_s=time.perf_counter() - t0))
+        print(f"\nRunlist metrics: {agg}")
     return exit_code
 
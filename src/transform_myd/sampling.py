@@ -0,0 +1,122 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+SAMPLE_MODES = ("head", "random", "stratified")
+
+
+@dataclass(frozen=True)
+class SampleSpec:
+    n: int
+    mode: str = "head"          # head | random (reservoir) | stratified
+    seed: Optional[int] = None
+    by: Optional[str] = None    # sleutelkolom voor stratified
+
+    @property
+    def read_limit(self) -> Optional[int]:
+        """Aantal datarijen dat de loader hoeft te parsen (None = alles streamen)."""
+        return self.n if self.mode == "head" else None
+
+
+def sample_spec_from_args(args, meta: Optional[Dict[str, Any]] = None) -> Optional[SampleSpec]:
+    n = getattr(args, "sample", None)
+    if not n or n <= 0:
+        return None
+    scfg = ((meta or {}).get("sample") or {})
+    mode = getattr(args, "sample_mode", None) or scfg.get("mode") or "head"
+    seed = getattr(args, "sample_seed", None)
+    seed = seed if seed is not None else scfg.get("seed")
+    by = getattr(args, "sample_by", None) or scfg.get("by")
+    if mode == "stratified" and not by:
+        raise SystemExit("--sample-mode stratified vereist --sample-by <KOLOM> (of meta.sample.by).")
+    if mode not in SAMPLE_MODES:
+        raise SystemExit(f"Onbekende sample mode '{mode}' (kies uit {', '.join(SAMPLE_MODES)}).")
+    return SampleSpec(int(n), mode, seed, by)
+
+
+class StreamSampler:
+    """Sample uit een stroom DataFrame-chunks zonder alles vast te houden.
+
+    random: bottom-k op een uniforme sleutel per rij (= reservoir sample, chunk-onafhankelijk bij vaste seed).
+    stratified: bottom-k per stratum + tellingen; op het eind proportionele quota (largest remainder).
+    De index van elke chunk moet de oorspronkelijke rijpositie zijn; het resultaat is daarop gesorteerd.
+    """
+
+    def __init__(self, spec: SampleSpec):
+        self.spec = spec
+        self.rng = np.random.default_rng(spec.seed)
+        self.keep: Optional[pd.DataFrame] = None
+        self.counts: Dict[Any, int] = {}
+        self.seen = 0
+
+    @property
+    def done(self) -> bool:
+        return self.spec.mode == "head" and self.keep is not None and len(self.keep) >= self.spec.n
+
+    def feed(self, chunk: pd.DataFrame) -> None:
+        self.seen += len(chunk)
+        if self.spec.mode == "head":
+            need = self.spec.n - (0 if self.keep is None else len(self.keep))
+            if need > 0:
+                part = chunk.head(need)
+                self.keep = part if self.keep is None else pd.concat([self.keep, part])
+            return
+        keys = pd.Series(self.rng.random(len(chunk)), index=chunk.index, name="__sample_key")
+        cand = chunk.assign(__sample_key=keys)
+        if self.keep is not None:
+            cand = pd.concat([self.keep, cand])
+        if self.spec.mode == "random":
+            self.keep = cand.nsmallest(self.spec.n, "__sample_key")
+        else:
+            by = self.spec.by
+            if by not in chunk.columns:
+                raise SystemExit(f"sample_by kolom '{by}' niet gevonden in bron.")
+            strata = chunk[by].fillna("")
+            for k, c in strata.value_counts().items():
+                self.counts[k] = self.counts.get(k, 0) + int(c)
+            cand = cand.sort_values("__sample_key", kind="stable")
+            self.keep = cand.groupby(cand[by].fillna(""), sort=False).head(self.spec.n)
+
+    def result(self) -> pd.DataFrame:
+        if self.keep is None:
+            return pd.DataFrame()
+        out = self.keep
+        if self.spec.mode == "stratified" and self.counts:
+            out = out.sort_values("__sample_key", kind="stable")
+            strata = out[self.spec.by].fillna("")
+            rank = out.groupby(strata, sort=False).cumcount()
+            out = out[rank < strata.map(self._quota()).fillna(0)]
+        if "__sample_key" in out.columns:
+            out = out.drop(columns="__sample_key")
+        return out.sort_index()
+
+    def _quota(self) -> Dict[Any, int]:
+        n, total = self.spec.n, sum(self.counts.values())
+        # elk stratum minstens 1 rij als dat past, rest proportioneel (largest remainder)
+        base = 1 if n >= len(self.counts) else 0
+        rest = n - base * len(self.counts)
+        raw = {k: rest * c / total for k, c in self.counts.items()}
+        q = {k: base + int(v) for k, v in raw.items()}
+        left = n - sum(q.values())
+        for k, _ in sorted(raw.items(), key=lambda kv: kv[1] - int(kv[1]), reverse=True):
+            if left <= 0: break
+            q[k] += 1; left -= 1
+        return {k: min(v, self.counts[k]) for k, v in q.items()}
+
+
+def sample_chunks(chunks: Iterable[pd.DataFrame], spec: SampleSpec) -> pd.DataFrame:
+    sampler = StreamSampler(spec)
+    for chunk in chunks:
+        sampler.feed(chunk)
+        if sampler.done:
+            break
+    return sampler.result()
+
+
+def sample_frame(df: pd.DataFrame, spec: SampleSpec, chunksize: int = 100_000) -> pd.DataFrame:
+    if spec.mode == "head":
+        return df.head(spec.n)
+    return sample_chunks((df.iloc[i:i + chunksize] for i in range(0, len(df), chunksize)), spec)
@@ -1,7 +1,6 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import Optional, Tuple
-import pandas as pd
 
 
 COLUMN_MAP_TEMPLATE = """# column_map.yaml — bron→doel kolommen
@@ -36,23 +35,42 @@ def _scaffold_paths(config_root: Path, object_or_combo: str) -> Tuple[Path, str]
     return base, stem
 
 
+def _read_sample(path: Path, rows: int, mode: str = "head", seed: Optional[int] = None):
+    """Header + sample: head leest alleen de eerste rijen (read-only streaming), random streamt een reservoir."""
+    from .io_excel import _read_sampled_df, read_head
+    if mode == "head" or rows <= 0:
+        return read_head(path, nrows=max(rows, 0))
+    from .sampling import SampleSpec
+    return _read_sampled_df(path, None, SampleSpec(rows, mode, seed))
+
+
 def scaffold(config_root: Path, object_or_combo: str, from_excel: Optional[Path],
-             force: bool = False, dry_run: bool = False) -> None:
+             force: bool = False, dry_run: bool = False, infer: bool = False,
+             sample_rows: Optional[int] = None, sample_mode: str = "head", sample_seed: Optional[int] = None) -> None:
+    """Met ``infer`` (en ``from_excel``) ook concept value_rules/value_map uit een sample van de bron."""
     base, stem = _scaffold_paths(config_root, object_or_combo)
     body = '# SOURCE1: "TARGET1"\n# SOURCE2: "TARGET2"\n'
+    value_map, value_rules = VALUE_MAP_TEMPLATE, VALUE_RULES_TEMPLATE
     if from_excel:
         try:
-            df = pd.read_excel(from_excel, nrows=0, engine="openpyxl")
+            from .infer import DEFAULT_SAMPLE_ROWS, infer_config   # pandas pas hier: scaffold zonder bron blijft licht
+            rows = (sample_rows or DEFAULT_SAMPLE_ROWS) if infer else 0
+            df = _read_sample(from_excel, rows, sample_mode, sample_seed)
             cols = [str(c).strip() for c in df.columns]
             if cols:
                 body = "\n".join(f'{c}: "{c}"' for c in cols) + "\n"
+            if infer and len(df):
+                value_rules, value_map = infer_config(df)
+                print(f"  profiel: {len(df)} rijen x {len(cols)} kolommen ({sample_mode})")
         except Exception as e:
             print(f"[!] Waarschuwing: kon kolommen niet lezen uit {from_excel}: {e}")
+    elif infer:
+        print("[!] --infer-rules heeft --from-excel nodig; alleen templates geschreven.")
 
     files = {
         base / "column_map.yaml": COLUMN_MAP_TEMPLATE.format(BODY=body),
-        base / "value_map.yaml": VALUE_MAP_TEMPLATE,
-        base / "value_rules.yaml": VALUE_RULES_TEMPLATE,
+        base / "value_map.yaml": value_map,
+        base / "value_rules.yaml": value_rules,
         base / "meta.yaml": META_TEMPLATE_SINGLE.format(stem=stem, stem_lower=stem.lower()),
     }
 
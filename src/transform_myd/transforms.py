@@ -3,6 +3,9 @@ from typing import Any, Dict
 import importlib
 import pandas as pd
 
+from .dtypes import as_text, restore_dtype
+from .regexes import compile_pattern
+
 
 def _to_int_str(val: Any) -> str:
     s = "" if pd.isna(val) else str(val).strip()
@@ -23,7 +26,8 @@ def apply_transforms(df: pd.DataFrame, rules: Dict[str, Dict[str, Any]]) -> pd.D
             continue
         if col not in df.columns:
             df[col] = ""
-        s = df[col].where(~df[col].isna(), "")
+        orig = df[col]
+        s = orig.where(~orig.isna(), "")
 
         def ensure_str(x):
             return "" if pd.isna(x) else str(x)
@@ -37,19 +41,21 @@ def apply_transforms(df: pd.DataFrame, rules: Dict[str, Dict[str, Any]]) -> pd.D
                 continue
 
             if op == "strip":
-                s = s.astype(str).str.strip()
+                s = as_text(s).str.strip()
             elif op == "upper":
-                s = s.astype(str).str.upper()
+                s = as_text(s).str.upper()
             elif op == "lower":
-                s = s.astype(str).str.lower()
+                s = as_text(s).str.lower()
             elif op == "zfill":
-                s = s.astype(str).apply(lambda v: v.zfill(int(arg)) if v.strip() != "" else "")
+                s = as_text(s)
+                s = s.str.zfill(int(arg)).where(s.str.strip() != "", "")
             elif op == "pad_left":
-                s = s.astype(str).apply(lambda v: v.rjust(int(arg.get("width", 0)), str(arg.get("fillchar", " "))) if v.strip() != "" else "")
+                s = as_text(s)
+                s = s.str.pad(int(arg.get("width", 0)), side="left", fillchar=str(arg.get("fillchar", " "))).where(s.str.strip() != "", "")
             elif op == "regex_replace":
                 pat = arg.get("pattern"); repl = arg.get("repl", "")
                 if pat:
-                    s = s.astype(str).str.replace(pat, repl, regex=True)
+                    s = compile_pattern(pat).replace(as_text(s), repl)
             elif op == "to_int":
                 s = s.apply(_to_int_str)
             elif op == "to_string":
@@ -60,6 +66,6 @@ def apply_transforms(df: pd.DataFrame, rules: Dict[str, Dict[str, Any]]) -> pd.D
             else:
                 pass
 
-        df[col] = s
+        df[col] = restore_dtype(s, orig)
     return df
 
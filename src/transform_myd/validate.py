@@ -1,10 +1,26 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 import importlib
+import numpy as np
 import pandas as pd
 
+from .dtypes import as_text
+from .reftables import in_table_mask, table_label
+from .regexes import compile_pattern
+from .rejects import RejectRecords
 
-def apply_value_rules(df: pd.DataFrame, rules: Dict[str, Dict[str, Any]]) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[int, List[str]]]:
+
+def _reject(errors: Dict[int, List[str]], records: Optional[RejectRecords], bad: pd.Series,
+            col: str, rule: str, message: str) -> None:
+    for i in bad.index:
+        errors.setdefault(i, []).append(message)
+    if records is not None:
+        records.add(bad, col, rule, message)
+
+
+def apply_value_rules(df: pd.DataFrame, rules: Dict[str, Dict[str, Any]], records: Optional[RejectRecords] = None
+                      ) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[int, List[str]]]:
+    """Met ``records`` worden alle fouten ook gestructureerd vastgelegd (rij, kolom, rule, melding, waarde)."""
     if not rules:
         return df.copy(), df.iloc[0:0].copy(), {}
 
@@ -13,37 +29,46 @@ def apply_value_rules(df: pd.DataFrame, rules: Dict[str, Dict[str, Any]]) -> Tup
         if col not in df.columns:
             series = pd.Series([""] * len(df), index=df.index, dtype="string")
         else:
-            series = df[col].fillna("").astype(str).str.strip()
+            series = as_text(df[col].fillna("")).str.strip()
 
         if cfg.get("required"):
-            bad_idx = series[series == ""].index
-            for i in bad_idx:
-                errors.setdefault(i, []).append(f"{col} is required")
+            _reject(errors, records, series[series == ""], col, "required", f"{col} is required")
 
         pat = cfg.get("pattern")
         if pat:
-            mism = series[(series != "") & (~series.str.match(pat, na=False))].index
-            for i in mism:
-                errors.setdefault(i, []).append(f"{col} mismatches {pat}")
+            mism = series[(series != "") & (~compile_pattern(pat).match(series))]
+            _reject(errors, records, mism, col, "pattern", f"{col} mismatches {pat}")
 
         if "max_length" in cfg:
             ml = int(cfg["max_length"])
-            too_long = series[series.str.len() > ml].index
-            for i in too_long:
-                errors.setdefault(i, []).append(f"{col} longer than {ml}")
+            _reject(errors, records, series[series.str.len() > ml], col, "max_length", f"{col} longer than {ml}")
+
+        ref = cfg.get("in_table")
+        if ref:
+            absent = series[(series != "") & ~in_table_mask(series, ref)]
+            _reject(errors, records, absent, col, "in_table", f"{col} not in {table_label(ref)}")
 
         custom = cfg.get("custom")
         if custom:
             mod = importlib.import_module(custom["module"]); fn = getattr(mod, custom["function"])
+            failed: Dict[Any, str] = {}
             for i, v in series.items():
                 try:
                     if v == "" and not cfg.get("required", False):
                         continue
                     if not fn(v):
-                        errors.setdefault(i, []).append(f"{col} custom failed")
+                        failed[i] = f"{col} custom failed"
                 except Exception as e:
-                    errors.setdefault(i, []).append(f"{col} custom error: {e}")
+                    failed[i] = f"{col} custom error: {e}"
+            for i, msg in failed.items():
+                errors.setdefault(i, []).append(msg)
+            if records is not None and failed:
+                records.add(series.loc[list(failed)], col, "custom", list(failed.values()))
 
+    return _split(df, errors)
+
+
+def _split(df: pd.DataFrame, errors: Dict[int, List[str]]) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[int, List[str]]]:
     error_idx = pd.Index([i for i in errors.keys() if isinstance(i, int) and i in df.index])
     valid_mask = ~df.index.isin(error_idx)
     valid_df = df.loc[valid_mask].copy()
@@ -52,3 +77,106 @@ def apply_value_rules(df: pd.DataFrame, rules: Dict[str, Dict[str, Any]]) -> Tup
         reject_df["__errors"] = reject_df.index.map(lambda i: "; ".join(errors.get(i, [])))
     return valid_df, reject_df, errors
 
+
+# --- Row-set rules: unieke sleutels over alle rijen (meta.unique_keys)
+
+UNIQUE_POLICIES = ("keep_first", "reject_all")
+_KEY_SEP = "\x1f"   # unit separator: komt na sanitize (strip_control) niet in waarden voor
+
+
+def unique_key_specs(meta: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """meta.unique_keys: [A, B] | {keys: [A, B], policy: ...} | lijst daarvan → genormaliseerde specs."""
+    raw = (meta or {}).get("unique_keys")
+    if not raw:
+        return []
+    if isinstance(raw, dict) or all(isinstance(k, str) for k in raw):
+        raw = [raw]
+    specs = []
+    for item in raw:
+        spec = {"keys": list(item)} if isinstance(item, (list, tuple)) else dict(item)
+        spec["keys"] = [spec["keys"]] if isinstance(spec.get("keys"), str) else list(spec.get("keys") or [])
+        spec["policy"] = str(spec.get("policy", "keep_first")).lower()
+        specs.append(spec)
+    return specs
+
+
+class UniqueKeyIndex:
+    """Hash-index over samengestelde sleutels; chunk voor chunk te voeden in bronvolgorde.
+
+    feed() geeft meteen fouten voor herhalingen (2e, 3e, ... rij van een sleutel, ook over chunks heen);
+    finish() geeft bij reject_all daarnaast de eerste rij van elke dubbele groep.
+    Rijen met een lege sleutelwaarde tellen niet mee (onvolledige sleutel; daarvoor is ``required``).
+    De index blijft staan tussen chunks: per feed() alleen werk voor de rijen van die chunk.
+    """
+
+    def __init__(self, keys: List[str], policy: str = "keep_first"):
+        self.keys = keys
+        self.policy = policy
+        self.name = "+".join(keys)
+        self._first: Dict[str, Any] = {}                # sleutel → indexlabel van de eerste rij
+        self._dup_keys: Set[str] = set()                 # sleutels met minstens één herhaling
+
+    def _composite(self, df: pd.DataFrame) -> pd.Series:
+        parts = [as_text(df[k].fillna("")).str.strip() if k in df.columns
+                 else pd.Series("", index=df.index, dtype="string") for k in self.keys]
+        key = parts[0]
+        empty = parts[0] == ""
+        for p in parts[1:]:
+            key = key.str.cat(p, sep=_KEY_SEP)
+            empty |= p == ""
+        return key[~empty.astype(bool)]
+
+    def key_values(self, df: pd.DataFrame) -> pd.Series:
+        """Sleutel als ``v1|v2`` per rij (waarde in de reject details)."""
+        return self._composite(df).str.replace(_KEY_SEP, "|", regex=False)
+
+    def _message(self, key: str) -> str:
+        return f"{self.name} duplicate key {key.replace(_KEY_SEP, '|')}"
+
+    def feed(self, df: pd.DataFrame) -> Dict[Any, str]:
+        key = self._composite(df)
+        values = key.to_numpy(dtype=object)
+        first = self._first
+        seen = np.fromiter((k in first for k in values), dtype=bool, count=len(values))
+        repeat = key.duplicated(keep="first").to_numpy() | seen
+        new = ~repeat
+        first.update(zip(values[new], key.index[new]))
+        dups = key[repeat]
+        self._dup_keys.update(values[repeat])
+        return {i: self._message(k) for i, k in dups.items()}
+
+    def finish(self) -> Dict[Any, str]:
+        if self.policy != "reject_all":
+            return {}
+        return {self._first[k]: self._message(k) for k in self._dup_keys}
+
+
+def unique_key_indexes(specs: List[Dict[str, Any]]) -> List[UniqueKeyIndex]:
+    for spec in specs:
+        if spec["policy"] not in UNIQUE_POLICIES:
+            raise SystemExit(f"unique_keys policy '{spec['policy']}' onbekend (kies uit {', '.join(UNIQUE_POLICIES)}).")
+    return [UniqueKeyIndex(spec["keys"], spec["policy"]) for spec in specs]
+
+
+def apply_unique_keys(df: pd.DataFrame, specs: List[Dict[str, Any]], errors: Dict[int, List[str]],
+                      records: Optional[RejectRecords] = None, indexes: Optional[List[UniqueKeyIndex]] = None
+                      ) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[int, List[str]]]:
+    """Vul errors aan met dubbele sleutels en split opnieuw in valid/reject.
+
+    Alleen rijen die de value_rules doorstaan tellen mee: een om een andere reden afgekeurde rij
+    claimt zijn sleutel niet (keep_first houdt dan de eerste géldige rij).
+    ``indexes``: doorlopende indexen over chunks (chunked uitvoering; alleen keep_first, geen finish()).
+    """
+    chunked = indexes is not None
+    candidates = df[~df.index.isin(list(errors))] if errors else df
+    for index in (indexes if chunked else unique_key_indexes(specs)):
+        found = index.feed(candidates)
+        if not chunked:
+            found.update(index.finish())
+        hit = df.index[df.index.isin(list(found))]
+        for i in hit:
+            errors.setdefault(i, []).append(found[i])
+        if records is not None and len(hit):
+            records.add(index.key_values(df.loc[hit]), index.name, "unique_key", [found[i] for i in hit])
+    return _split(df, errors)
+
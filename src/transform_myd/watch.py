@@ -0,0 +1,243 @@
+from __future__ import annotations
+import fnmatch
+import sys
+import threading
+import time
+from argparse import Namespace
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, TextIO, Tuple
+
+from .config import _expand, _tokens, build_config, discover_targets, parse_object_variant
+
+# Tokens die per run verschillen: in een input-patroon worden ze een wildcard.
+_TIME_TOKENS = ("date", "time", "datetime", "time_hm", "datetime_hm", "datetime_hm_u")
+
+
+@dataclass(frozen=True)
+class WatchTarget:
+    object_name: str
+    variant_name: Optional[str]
+    raw_dir: Path
+    pattern: str
+    exclusive: bool = False   # tracemalloc/profiler zijn proces-breed: nooit naast andere jobs
+
+    @property
+    def label(self) -> str:
+        return f"{self.object_name}_{self.variant_name}" if self.variant_name else self.object_name
+
+
+def _input_glob(meta: Dict, obj: str, var: Optional[str]) -> Optional[str]:
+    tok = _tokens(obj, var)
+    tok.update({k: "*" for k in _TIME_TOKENS})
+    naming = meta.get("naming") or {}
+    if naming.get("input"):
+        return _expand(str(naming["input"]), tok)
+    if meta.get("input_file"):
+        return Path(_expand(str(meta["input_file"]), tok)).name
+    return None
+
+
+def _config_signature(config_root: Path) -> Tuple[Tuple[str, int], ...]:
+    files = sorted(list(config_root.rglob("*.yaml")) + list(config_root.rglob("*.yml")))
+    sig = []
+    for f in files:
+        try: sig.append((str(f), f.stat().st_mtime_ns))
+        except OSError: pass
+    return tuple(sig)
+
+
+def _tagged(path: Path, tag: str) -> Path:
+    return path if tag in path.stem else path.with_name(f"{path.stem}_{tag}{path.suffix}")
+
+
+def _job_namespace(base: Namespace, target: WatchTarget, path: Path) -> Namespace:
+    """Per bronbestand eigen export/reject-namen en logmap: twee bestanden binnen dezelfde minuut
+    (naming met {datetime_hm_u}) overschrijven elkaars uitvoer dan niet."""
+    ns = Namespace(**vars(base))
+    ns.object_name = target.object_name
+    ns.variant_name = target.variant_name
+    ns.input_file = str(path)
+    ns.watch = False
+    ns.trace_config = False
+    cfg = build_config(ns, create_dirs=False)
+    ns.output_file = str(_tagged(Path(cfg.output_file), path.stem))
+    ns.reject_file = str(_tagged(Path(cfg.reject_file), path.stem))
+    ns.log_dir = str(Path(cfg.log_dir) / path.stem)
+    return ns
+
+
+class _JobOutput:
+    """stdout voor watch: regels van jobthreads krijgen ``[label] `` als prefix en gaan heel, onder een lock."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def job(self, label: str, fn, *args):
+        self._local.label, self._local.buf = label, ""
+        try:
+            return fn(*args)
+        finally:
+            self.flush_job()
+            self._local.label = None
+
+    def write(self, text: str) -> int:
+        label = getattr(self._local, "label", None)
+        if label is None:
+            with self._lock:
+                return self.stream.write(text)
+        *lines, self._local.buf = (self._local.buf + text).split("\n")
+        if lines:
+            with self._lock:
+                self.stream.write("".join(f"[{label}] {line}\n" for line in lines))
+        return len(text)
+
+    def flush_job(self) -> None:
+        if getattr(self._local, "buf", ""):
+            self.write("\n")
+
+    def flush(self) -> None:
+        with self._lock:
+            self.stream.flush()
+
+
+def load_targets(args) -> List[WatchTarget]:
+    config_root = Path(args.config_dir)
+    if args.object_name:
+        pairs = [parse_object_variant(args.object_name, args.variant_name)]
+    else:
+        pairs = discover_targets(config_root)
+    targets: List[WatchTarget] = []
+    for obj, var in pairs:
+        probe = Namespace(**vars(args)); probe.object_name = obj; probe.variant_name = var
+        probe.input_file = None; probe.trace_config = False
+        try:
+            cfg = build_config(probe, create_dirs=False)
+        except SystemExit as e:
+            print(f"[!] watch: {obj}_{var or ''} overgeslagen: {e}")
+            continue
+        meta = cfg.meta or {}
+        pattern = _input_glob(meta, obj, var)
+        if not pattern:
+            print(f"[!] watch: {obj}_{var or ''} heeft geen naming.input of input_file – overgeslagen.")
+            continue
+        raw_dir = Path(((meta.get("dirs") or {}).get("raw")) or "data/raw")
+        mcfg = meta.get("metrics") or {}
+        trace_alloc = (bool(getattr(args, "metrics", False)) or bool(mcfg.get("enabled", False))) \
+            and bool(mcfg.get("trace_alloc", False))
+        targets.append(WatchTarget(obj, var, raw_dir, pattern, exclusive=trace_alloc))
+    return targets
+
+
+def watch(args, interval: float = 2.0, settle: float = 3.0, workers: int = 2, process_existing: bool = False,
+          stop: Optional[threading.Event] = None) -> int:
+    """Houd configs/modules warm en verwerk nieuwe bestanden in dirs.raw zodra ze 'stil' staan.
+
+    Per target draait hooguit één job tegelijk; export/rejects krijgen de naam van het bronbestand erbij en
+    logs een eigen map (zie _job_namespace). Met --profile of meta.metrics.trace_alloc draait een job alleen.
+    Jobuitvoer krijgt ``[label]`` als prefix. ``stop``: netjes stoppen vanuit een andere thread (tests).
+    """
+    from .pipeline import run_pipeline  # één keer: pandas/openpyxl blijven geladen
+
+    config_root = Path(args.config_dir)
+    sig = _config_signature(config_root)
+    targets = load_targets(args)
+    for t in targets:
+        print(f"• watch {t.label}: {t.raw_dir / t.pattern}")
+
+    seen: Dict[Tuple[Path, str], Tuple[int, int]] = {}  # (pad, label) → (mtime_ns, size) laatst verwerkt
+    pending: Dict[Path, Tuple[int, int, float]] = {}  # pad → (mtime_ns, size, sinds)
+    running: Dict[Tuple[Path, str], Future] = {}
+    exclusive: Dict[Tuple[Path, str], bool] = {}
+    failures = 0
+    if getattr(args, "profile", None) and workers > 1:
+        print("[!] watch: --profile meet proces-breed – jobs draaien serieel.")
+        workers = 1
+
+    def can_start(t: WatchTarget) -> bool:
+        if any(label == t.label for _, label in running):
+            return False                                # zelfde target: zelfde uitvoernamen
+        if running and (t.exclusive or any(exclusive.values())):
+            return False
+        return True
+
+    def collect() -> int:
+        """Afgeronde jobs melden; geeft het aantal mislukte terug."""
+        failed = 0
+        for k, fut in list(running.items()):
+            if not fut.done(): continue
+            running.pop(k)
+            exclusive.pop(k, None)
+            pending.pop(k[0], None)
+            try:
+                res = fut.result()
+                print(f"✓ {k[1]}: {k[0].name} – valid={res['valid']} rejected={res['rejected']}")
+            except BaseException as e:
+                failed += 1
+                print(f"✗ {k[1]}: {k[0].name} – {e}")
+        return failed
+
+    def scan() -> Set[Tuple[Path, WatchTarget]]:
+        hits: Set[Tuple[Path, WatchTarget]] = set()
+        for t in targets:
+            if not t.raw_dir.exists(): continue
+            for p in t.raw_dir.iterdir():
+                if p.is_file() and fnmatch.fnmatch(p.name, t.pattern) and not p.name.startswith("~$"):
+                    hits.add((p, t))
+        return hits
+
+    if not process_existing:
+        for p, t in scan():
+            st = p.stat(); seen[(p, t.label)] = (st.st_mtime_ns, st.st_size)
+
+    ex = ThreadPoolExecutor(max_workers=max(1, workers))
+    out = _JobOutput(sys.stdout)
+    sys.stdout = out
+    print(f"Watching ({len(targets)} targets, {workers} workers) – Ctrl+C om te stoppen.")
+    try:
+        while stop is None or not stop.is_set():
+            new_sig = _config_signature(config_root)
+            if new_sig != sig:
+                sig = new_sig
+                targets = load_targets(args)
+                print(f"↻ Config gewijzigd – {len(targets)} targets herladen.")
+
+            now = time.monotonic()
+            for p, t in scan():
+                try: st = p.stat()
+                except OSError: continue
+                key = (st.st_mtime_ns, st.st_size)
+                if seen.get((p, t.label)) == key: continue
+                prev = pending.get(p)
+                if prev is None or prev[:2] != key:
+                    pending[p] = (key[0], key[1], now)   # nieuw of nog aan het groeien
+                    continue
+                if now - prev[2] < settle: continue
+                try:
+                    with p.open("rb"): pass             # nog gelockt door schrijver?
+                except OSError:
+                    continue
+                if (p, t.label) in running or not can_start(t): continue
+                seen[(p, t.label)] = key
+                try:
+                    ns = _job_namespace(args, t, p)
+                except SystemExit as e:
+                    failures += 1
+                    print(f"✗ {t.label}: {p.name} – {e}")
+                    continue
+                print(f"→ {t.label}: {p.name}")
+                running[(p, t.label)] = ex.submit(out.job, t.label, run_pipeline, ns)
+                exclusive[(p, t.label)] = t.exclusive
+
+            failures += collect()
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nWatch gestopt; lopende jobs afronden…")
+    finally:
+        ex.shutdown(wait=True)
+        failures += collect()
+        sys.stdout = out.stream
+    return 1 if failures else 0
@@ -0,0 +1,20 @@
+from pathlib import Path
+
+import pytest
+
+from helpers import FIXTURE_ROWS, generate_rows
+
+
+@pytest.fixture(scope="session")
+def source_csv(tmp_path_factory) -> Path:
+    path = tmp_path_factory.mktemp("src") / "bank_raw.csv"
+    generate_rows(FIXTURE_ROWS).to_csv(path, index=False, encoding="utf-8-sig")
+    return path
+
+
+@pytest.fixture(scope="session")
+def source_xlsx(tmp_path_factory) -> Path:
+    pytest.importorskip("openpyxl")
+    path = tmp_path_factory.mktemp("src") / "bank_raw.xlsx"
+    generate_rows(FIXTURE_ROWS // 2, seed=11).to_excel(path, index=False)
+    return path
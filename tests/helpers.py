@@ -0,0 +1,103 @@
+"""Gedeelde testhelpers: gegenereerde config/bron en de artifacts van één run."""
+import csv
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+import yaml
+
+COUNTRIES = ["NL", "BE", "DE", "FR", "GB", "XX", ""]
+CITIES = ["Amsterdam", "Brussel", "Köln", "Lille", "Zürich", "Gent", "Utrecht", "Mons 2", ""]
+FIXTURE_ROWS = 12_000          # > 2x MIN_CHUNK_ROWS: een klein budget geeft meerdere chunks
+VOLATILE = ("__run_id", "__transform_ts", "__ingest_ts")   # lineage per run/minuut
+
+META = {
+    "input_file": "bank_raw.csv",
+    "unique_keys": {"keys": ["BANKS", "BANKL"], "policy": "keep_first"},
+    "reports": {"reject_details": "csv"},
+    "engine": {"min_partition_rows": 2_000, "string_dtype": "object"},
+}
+COLUMN_MAP = {"BANKS": "BANKS(k/*)", "BANKL": "BANKL(k/*)", "BANKA": "BANKA(*)", "ORT01": "ORT01",
+              "SWIFT": "SWIFT", "PROVZ": "PROVZ"}
+VALUE_MAP = {"BANKS": {"GB": "UK"}, "BANKA": {"Fortis": "BNP Paribas"}}
+VALUE_RULES = {
+    "BANKS": {"required": True, "pattern": "^(NL|BE|DE|FR)$"},
+    "BANKL": {"required": True, "transforms": ["strip", {"zfill": 8}], "pattern": r"^\d{8}$"},
+    "ORT01": {"pattern": "^[^0-9]*$"},
+    "SWIFT": {"pattern": "^[A-Z0-9]{8,11}$"},
+    "PROVZ": {"max_length": 3},
+}
+
+
+def generate_rows(n: int, seed: int = 7) -> pd.DataFrame:
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        cc = rnd.choice(COUNTRIES)
+        rows.append({
+            "BANKS": cc,
+            "BANKL": str(rnd.randint(1, 4_000)) if rnd.random() > 0.02 else "",
+            "BANKA": rnd.choice(["Fortis", "ING", "Rabobank", "Crédit Agricole"]) + f" {i % 97}",
+            "ORT01": rnd.choice(CITIES),
+            "SWIFT": (rnd.choice(["RABO", "INGB", "ABNA"]) + cc + "2U") if rnd.random() > 0.1 else "bad",
+            "PROVZ": str(rnd.randint(1, 1200)),
+        })
+    return pd.DataFrame(rows, dtype=object)
+
+
+def write_config(root: Path, meta: Optional[Dict] = None, variant: str = "V1", column_map: Optional[Dict] = None,
+                 value_map: Optional[Dict] = None, value_rules: Optional[Dict] = None) -> Path:
+    base = root / "config" / "M1" / variant
+    base.mkdir(parents=True, exist_ok=True)
+    for name, data in (("meta", {**META, **(meta or {})}),
+                       ("column_map", COLUMN_MAP if column_map is None else column_map),
+                       ("value_map", VALUE_MAP if value_map is None else value_map),
+                       ("value_rules", VALUE_RULES if value_rules is None else value_rules)):
+        (base / f"{name}.yaml").write_text(yaml.safe_dump(data, allow_unicode=True, sort_keys=False), encoding="utf-8")
+    return root / "config"
+
+
+def cli_args(config: Path, input_file: Path, out: Path, *extra: str):
+    """Namespace zoals de CLI die bouwt; uitvoer per run in een eigen map."""
+    from transform_myd.cli import parse_args
+    out.mkdir(parents=True, exist_ok=True)
+    argv = ["myd-transform", "-c", str(config), "-o", "M1", "-v", "V1", "-i", str(input_file),
+            "--output", str(out / "export.csv"), "--rejects", str(out / "rejects.csv"),
+            "--logdir", str(out / "logs"), "--quiet", *extra]
+    old = sys.argv
+    try:
+        sys.argv = argv
+        return parse_args()
+    finally:
+        sys.argv = old
+
+
+def _only(out: Path, pattern: str) -> Path:
+    hits = sorted(out.glob(pattern))
+    assert len(hits) == 1, f"{pattern}: {hits}"
+    return hits[0]
+
+
+def _mask_volatile(path: Path) -> List[List[str]]:
+    with path.open(encoding="utf-8-sig", newline="") as fp:
+        rows = list(csv.reader(fp))
+    idx = [i for i, c in enumerate(rows[0]) if c in VOLATILE] if rows else []
+    for r in rows[1:]:
+        for i in idx:
+            r[i] = ""
+    return rows
+
+
+def run_artifacts(out: Path) -> Dict[str, object]:
+    """Export, rejects, reject details/reasons en de TXT-logregels van één run (tijdsafhankelijke lineage gemaskeerd)."""
+    log = _only(out / "logs", "*_log.txt").read_text(encoding="utf-8-sig").splitlines()
+    counts = [line for line in log if line.split(":")[0].strip().endswith("records")]
+    return {
+        "export": (out / "export.csv").read_bytes(),
+        "rejects": _mask_volatile(out / "rejects.csv"),
+        "details": _only(out / "logs", "*_reject_details.csv").read_bytes(),
+        "reasons": [p.read_bytes() for p in (out / "logs").glob("*_reject_reasons.csv")],   # alleen met --report
+        "log": counts + log[log.index("# Per-record log"):],
+    }
@@ -0,0 +1,40 @@
+"""Benchmark: main() is herbruikbaar vanuit tests (cwd blijft staan) en vergelijkt met een baseline."""
+import importlib.util
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+BENCH = Path(__file__).resolve().parents[1] / "benchmarks" / "bench_pipeline.py"
+
+
+@pytest.fixture(scope="module")
+def bench():
+    spec = importlib.util.spec_from_file_location("bench_pipeline", BENCH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_main_restores_cwd_and_compares_baseline(bench, tmp_path):
+    cwd = os.getcwd()
+    base = tmp_path / "baseline.json"
+    argv = ["--rows", "200", "--formats", "csv,xlsx", "--no-reports", "--workdir", str(tmp_path / "work"),
+            "--baseline", str(base)]
+    assert bench.main(argv + ["--save-baseline"]) == 0
+    assert os.getcwd() == cwd
+    assert set(json.loads(base.read_text(encoding="utf-8"))["cases"]) == {"csv_200", "xlsx_200"}
+    assert bench.main(argv + ["--threshold", "1000", "--min-abs", "60", "--out", str(tmp_path / "res.json")]) == 0
+    assert os.getcwd() == cwd
+    res = json.loads((tmp_path / "res.json").read_text(encoding="utf-8"))["cases"]
+    assert res["csv_200"]["rows"] == res["xlsx_200"]["rows"] == 200
+
+
+def test_main_restores_cwd_on_error(bench, tmp_path, monkeypatch):
+    cwd = os.getcwd()
+    monkeypatch.setattr(bench, "run_pipeline", lambda ns: (_ for _ in ()).throw(RuntimeError("boom")))
+    with pytest.raises(RuntimeError):
+        bench.main(["--rows", "50", "--formats", "csv", "--workdir", str(tmp_path / "work"),
+                    "--baseline", str(tmp_path / "none.json")])
+    assert os.getcwd() == cwd
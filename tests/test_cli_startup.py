@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+BUDGET_S = 1.0          # --help/--lint horen licht te blijven: geen pandas/openpyxl (~0.1-0.25s lokaal)
+
+_DRIVER = """
+import json, sys, time
+t0 = time.perf_counter()
+from transform_myd.cli import main
+sys.argv = ["myd-transform"] + json.loads(sys.argv[1])
+try:
+    main()
+except SystemExit:
+    pass
+print(json.dumps({"elapsed": time.perf_counter() - t0,
+                  "heavy": sorted(m for m in ("pandas", "openpyxl", "pyarrow") if m in sys.modules)}))
+"""
+
+
+def _run(argv):
+    env = {**os.environ, "PYTHONPATH": str(ROOT / "src")}
+    proc = subprocess.run([sys.executable, "-c", _DRIVER, json.dumps(argv)], cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("argv", [
+    ["--help"],
+    ["-c", "config", "-o", "M140", "-v", "BNKA", "--lint"],
+], ids=["help", "lint"])
+def test_light_cli_paths_skip_pandas(argv):
+    res = _run(argv)
+    assert res["heavy"] == []
+    assert res["elapsed"] < BUDGET_S
@@ -0,0 +1,58 @@
+"""Engine.run op een in-memory frame: split, foutmasker, index en gelijkheid met de CLI-run."""
+from datetime import datetime
+
+import pandas as pd
+
+from transform_myd.engine import Engine
+from transform_myd.pipeline import run_pipeline
+
+from helpers import COLUMN_MAP, VALUE_RULES, cli_args, generate_rows, write_config
+
+ROWS = 3_000
+
+
+def _engine(tmp_path, **kw) -> Engine:
+    return Engine.from_config_dir(write_config(tmp_path), "M1", "V1", **kw)
+
+
+def test_run_on_dataframe_splits_valid_and_rejects(tmp_path):
+    src = generate_rows(ROWS)
+    res = _engine(tmp_path).run(src)
+    assert list(res.output.columns) == list(COLUMN_MAP.values())
+    assert len(res.output) == len(res.valid) and len(res.valid) + len(res.rejects) == ROWS
+    assert res.valid.index.intersection(res.rejects.index).empty
+    assert set(res.errors) == set(res.rejects.index)
+    assert list(res.error_mask.columns) == list(VALUE_RULES)
+    assert not res.error_mask.loc[res.valid.index].to_numpy().any()
+    value_rejects = set(res.reject_details["row"])
+    assert res.error_mask.any(axis=1)[lambda s: s].index.isin(list(value_rejects)).all()
+    assert src.equals(generate_rows(ROWS))                # invoer niet gemuteerd
+
+
+def test_non_unique_index_is_reset(tmp_path):
+    src = generate_rows(ROWS)
+    dup = src.set_axis([i // 2 for i in range(ROWS)])
+    eng = _engine(tmp_path)
+    res, ref = eng.run(dup), eng.run(src)
+    assert res.summary == ref.summary
+    assert res.error_mask.equals(ref.error_mask)
+    assert res.output.reset_index(drop=True).equals(ref.output.reset_index(drop=True))
+
+
+def test_ingest_ts_explicit_or_empty(tmp_path):
+    (tmp_path / "bank_raw.csv").write_text("stale", encoding="utf-8")   # bronbestand uit meta telt niet mee
+    eng = _engine(tmp_path, keep_lineage=True)
+    assert set(eng.run(generate_rows(50)).valid["__ingest_ts"]) == {""}
+    ts = datetime(2024, 5, 1, 12, 30)
+    assert set(eng.run(generate_rows(50), ingest_ts=ts).valid["__ingest_ts"]) == {ts.isoformat(timespec="seconds")}
+
+
+def test_matches_cli_output(tmp_path):
+    config = write_config(tmp_path)
+    src = tmp_path / "bank_raw.csv"
+    generate_rows(ROWS).to_csv(src, index=False, encoding="utf-8-sig")
+    cli = run_pipeline(cli_args(config, src, tmp_path / "cli"))
+    res = Engine.from_config_dir(config, "M1", "V1").run(pd.read_csv(src, dtype=str, keep_default_na=False))
+    assert res.summary == {k: cli[k] for k in ("total", "valid", "rejected")}
+    exported = pd.read_csv(tmp_path / "cli" / "export.csv", dtype=str, keep_default_na=False)
+    assert exported.equals(res.output.reset_index(drop=True).astype(str))
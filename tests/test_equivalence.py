@@ -0,0 +1,60 @@
+"""Uitvoeringsvarianten moeten dezelfde export, rejects, reject details en TXT-logregels geven als de seriële in-memory run."""
+import pytest
+import yaml
+
+from transform_myd.pipeline import run_pipeline
+from transform_myd.runlist import run_from_runlist
+
+from helpers import cli_args, run_artifacts, write_config
+
+
+def _stages(res):
+    return {s["name"] for s in res["metrics"]["stages"]}
+
+
+@pytest.mark.parametrize("source, budget", [
+    ("source_csv", "12MB"), ("source_csv", "2MB"), ("source_xlsx", "2MB"),
+])
+def test_memory_budget_matches_in_memory(request, tmp_path, source, budget):
+    src = request.getfixturevalue(source)
+    config = write_config(tmp_path)
+    full = run_pipeline(cli_args(config, src, tmp_path / "in_memory", "--report"))
+    small = run_pipeline(cli_args(config, src, tmp_path / "budget", "--report", "--memory-budget", budget))
+    assert "memory_plan" not in full["metrics"]
+    assert small["metrics"]["memory_plan"]["mode"] in ("streaming", "spill")
+    expected = run_artifacts(tmp_path / "in_memory")
+    assert expected["reasons"] and expected["log"]
+    assert run_artifacts(tmp_path / "budget") == expected
+
+
+def test_partitioned_matches_serial(tmp_path, source_csv):
+    config = write_config(tmp_path)
+    serial = run_pipeline(cli_args(config, source_csv, tmp_path / "serial", "--workers", "1"))
+    parted = run_pipeline(cli_args(config, source_csv, tmp_path / "parted", "--workers", "3"))
+    assert "partitioned" in _stages(parted) and "partitioned" not in _stages(serial)
+    assert run_artifacts(tmp_path / "parted") == run_artifacts(tmp_path / "serial")
+
+
+@pytest.mark.parametrize("prefetch", [0, 1])
+def test_runlist_prefetch_matches_single_runs(tmp_path, source_csv, source_xlsx, prefetch):
+    config = write_config(tmp_path)
+    sources = {"csv": source_csv, "xlsx": source_xlsx}
+    jobs = [{"object": "M1", "variant": "V1", "input_file": str(src), "quiet": True,
+             "output_file": str(tmp_path / name / "export.csv"), "reject_file": str(tmp_path / name / "rejects.csv"),
+             "log_dir": str(tmp_path / name / "logs")} for name, src in sources.items()]
+    runlist = tmp_path / "runlist.yaml"
+    runlist.write_text(yaml.safe_dump({"jobs": jobs}), encoding="utf-8")
+    for name in sources:
+        (tmp_path / name).mkdir()
+    assert run_from_runlist(config, runlist, quiet=True, global_prefetch=prefetch) == 0
+    for name, src in sources.items():
+        run_pipeline(cli_args(config, src, tmp_path / f"{name}_single"))
+        assert run_artifacts(tmp_path / name) == run_artifacts(tmp_path / f"{name}_single")
+
+
+def test_pyarrow_string_dtype_matches_object(tmp_path, source_csv):
+    pytest.importorskip("pyarrow")
+    run_pipeline(cli_args(write_config(tmp_path / "object"), source_csv, tmp_path / "object_run"))
+    arrow = write_config(tmp_path / "arrow", meta={"engine": {"min_partition_rows": 2_000, "string_dtype": "pyarrow"}})
+    run_pipeline(cli_args(arrow, source_csv, tmp_path / "arrow_run"))
+    assert run_artifacts(tmp_path / "arrow_run") == run_artifacts(tmp_path / "object_run")
@@ -0,0 +1,34 @@
+import pandas as pd
+import yaml
+
+from transform_myd.infer import infer_config
+from transform_myd.mappings import apply_value_maps
+from transform_myd.transforms import apply_transforms
+from transform_myd.validate import apply_value_rules
+
+
+def _sample() -> pd.DataFrame:
+    n = 60
+    return pd.DataFrame({
+        "BANKS": ["NL", "BE", "DE"] * (n // 3),
+        "Bank: naam": [f"Bank {i}" for i in range(n)],
+        "#ref": [f"{i:06d}" for i in range(n)],
+        "- land": ["yes", "no"] * (n // 2),
+        "a'b \"c\"": [""] * n,
+        "on": [str(i % 4) for i in range(n)],
+    }, dtype=object)
+
+
+def test_drafts_parse_and_accept_their_own_sample():
+    df = _sample()
+    rules_text, map_text = infer_config(df)
+    rules = yaml.safe_load(rules_text)
+    maps = yaml.safe_load(map_text)
+    assert set(rules) == set(df.columns) - {"a'b \"c\""}
+    assert "- land" in maps and "on" in maps
+    assert all(isinstance(k, str) for k in list(rules) + list(maps))
+
+    out = apply_transforms(apply_value_maps(df.copy(), maps), rules)
+    valid, reject, errors = apply_value_rules(out, rules)
+    assert errors == {}
+    assert len(valid) == len(df) and reject.empty
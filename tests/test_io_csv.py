@@ -0,0 +1,58 @@
+"""CSV/TXT-bronnen: dispatch op extensie, zelfde frame als xlsx, encoding per bron en nrows."""
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from transform_myd.io_excel import _read_excel_df, load_dataframe
+
+from helpers import generate_rows
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+def _normalized(df: pd.DataFrame) -> pd.DataFrame:
+    return df.astype(object).where(df.notna(), None).reset_index(drop=True)
+
+
+def _cfg(input_file, meta=None):
+    return SimpleNamespace(input_file=input_file, meta=meta or {})
+
+
+@pytest.fixture
+def rows():
+    df = generate_rows(40, seed=3)
+    df.loc[5, "ORT01"] = "Liège"
+    return df
+
+
+@pytest.mark.parametrize("name", ["bank.csv", "bank.txt", "BANK.CSV"])
+def test_csv_dispatch_matches_xlsx(tmp_path, rows, name):
+    rows.rename(columns={"BANKS": " BANKS "}).to_csv(tmp_path / name, index=False, encoding="utf-8-sig")
+    rows.to_excel(tmp_path / "bank.xlsx", index=False, engine="openpyxl")
+    got = _read_excel_df(tmp_path / name, None)
+    want = _read_excel_df(tmp_path / "bank.xlsx", None)
+    assert list(got.columns) == list(rows.columns)                 # kopnamen gestript, zoals bij xlsx
+    assert _normalized(got).equals(_normalized(want))
+    assert len(_read_excel_df(tmp_path / name, None, nrows=7)) == 7
+
+
+def test_input_encoding_from_meta(tmp_path, rows):
+    path = tmp_path / "bank.csv"
+    rows.to_csv(path, index=False, encoding="cp1252")
+    with pytest.raises(UnicodeDecodeError):
+        load_dataframe(_cfg(path))                                 # default utf-8-sig
+    df = load_dataframe(_cfg(path, {"encoding": {"input": "cp1252"}}))
+    assert df.loc[5, "ORT01"] == "Liège"
+
+
+def test_per_source_encoding_for_csv_lookup(tmp_path, rows):
+    rows.to_csv(tmp_path / "base.csv", index=False, encoding="utf-8-sig")
+    lookup = pd.DataFrame({"BANKS": ["NL", "BE"], "LAND": ["Nederland", "België"]})
+    lookup.to_csv(tmp_path / "land.txt", index=False, encoding="latin1")
+    meta = {"sources": [{"name": "base", "path": str(tmp_path / "base.csv")},
+                        {"name": "land", "path": str(tmp_path / "land.txt"), "encoding": "latin1"}],
+            "joins": [{"right": "land", "on": "BANKS", "columns": ["LAND"], "validate": "many_to_one"}]}
+    df = load_dataframe(_cfg(None, meta))
+    assert len(df) == len(rows)
+    assert set(df.loc[df["BANKS"] == "BE", "LAND"]) == {"België"}
@@ -0,0 +1,55 @@
+"""Streaming Excel reader gelijk aan pd.read_excel (ook lege rijen), en partitioneren vereist een unieke index."""
+import pandas as pd
+import pytest
+
+from transform_myd.io_excel import _iter_excel_chunks, read_head
+from transform_myd.partition import PartitionedExecutor
+
+from helpers import generate_rows
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+def _normalized(df: pd.DataFrame) -> pd.DataFrame:
+    return df.astype(object).where(df.notna(), None).reset_index(drop=True)
+
+
+@pytest.fixture
+def sheet(tmp_path):
+    """Datarijen met een lege rij ertussen en opgemaakte (lege) rijen aan het eind."""
+    from openpyxl.styles import Font
+    rows = generate_rows(30)
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(list(rows.columns))
+    for i, rec in enumerate(rows.itertuples(index=False)):
+        ws.append(list(rec) if i != 10 else [None] * len(rows.columns))
+    ws.append([12345, 1.0, None, "NA", "x", ""])                  # getallen en na-strings zoals read_excel
+    for r in range(ws.max_row + 1, ws.max_row + 6):
+        ws.cell(row=r, column=1).font = Font(bold=True)         # bestaat, maar zonder waarde
+    path = tmp_path / "bank.xlsx"
+    wb.save(path)
+    return path
+
+
+@pytest.mark.parametrize("chunksize", [7, 1_000])
+def test_streaming_chunks_match_read_excel(sheet, chunksize):
+    want = pd.read_excel(sheet, dtype=str, engine="openpyxl")
+    chunks = list(_iter_excel_chunks(sheet, None, chunksize))
+    got = pd.concat(chunks)
+    assert len(got) == len(want) == 31                          # lege rij 11 blijft, lege staart niet
+    assert list(got.index) == list(range(len(want)))
+    assert _normalized(got).equals(_normalized(want))
+
+
+def test_read_head_matches_read_excel_nrows(sheet):
+    want = pd.read_excel(sheet, dtype=str, engine="openpyxl", nrows=12)
+    assert _normalized(read_head(sheet, nrows=12)).equals(_normalized(want))
+    assert len(read_head(sheet, nrows=500)) == 31
+
+
+def test_partitioning_requires_unique_index():
+    cfg = type("Cfg", (), {"meta": {}, "value_map": {}, "value_rules": {}, "column_map": {}})()
+    df = generate_rows(10).set_axis([0] * 10)
+    with pytest.raises(ValueError, match="unieke index"):
+        PartitionedExecutor(cfg, workers=2, min_rows=1).maps_transforms_validate(df)
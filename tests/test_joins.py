@@ -0,0 +1,118 @@
+"""meta.joins: lookup-pad gelijk aan merge, kardinaliteitscontroles en de source-cache."""
+import os
+
+import pandas as pd
+import pytest
+
+from transform_myd import joins
+from transform_myd.joins import MAX_CACHED_SOURCES, apply_join, load_source_cached
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    joins._SOURCE_CACHE.clear(); joins._INDEX_CACHE.clear()
+    yield
+    joins._SOURCE_CACHE.clear(); joins._INDEX_CACHE.clear()
+
+
+@pytest.fixture(params=["object", "str"])
+def frames(request):
+    left = pd.DataFrame({"BANKS": ["NL", "BE", "DE", "NL", None, "FR"], "NR": ["1", "2", "3", "4", "5", "6"],
+                         "OMS": ["a", "b", "c", "d", "e", "f"]})
+    right = pd.DataFrame({"BANKS": ["NL", "BE", "FR", "LU"], "OMS": ["Nederland", "België", "Frankrijk", "Lux"],
+                          "REGIO": ["N", "W", "W", "W"]})
+    return left.astype(request.param), right.astype(request.param)
+
+
+@pytest.mark.parametrize("how", ["left", "inner"])
+def test_lookup_equals_merge_with_duplicate_and_missing_left_keys(frames, how):
+    left, right = frames
+    out, stats = apply_join(left, right, {"right": "land", "on": "BANKS", "how": how})
+    assert stats.mode == "lookup"
+    want = left.merge(right, on="BANKS", how=how, suffixes=("", "_r"))
+    pd.testing.assert_frame_equal(out, want)
+    assert (stats.matched, stats.rows_out, stats.max_fanout) == (4, len(want), 1)
+
+
+def test_lookup_equals_merge_with_left_on_right_on_and_columns(frames):
+    left, right = frames
+    right = right.rename(columns={"BANKS": "LAND"})
+    j = {"right": "land", "left_on": "BANKS", "right_on": "LAND", "columns": ["REGIO"], "suffixes": ["_l", "_r"]}
+    out, stats = apply_join(left, right, j)
+    assert stats.mode == "lookup"
+    want = left.merge(right[["LAND", "REGIO"]], left_on="BANKS", right_on="LAND", how="left", suffixes=("_l", "_r"))
+    pd.testing.assert_frame_equal(out, want)
+
+
+def test_lookup_equals_merge_on_multi_key():
+    left = pd.DataFrame({"A": ["1", "1", "2", "3"], "B": ["x", "y", "x", "x"]})
+    right = pd.DataFrame({"A": ["1", "2", "2"], "B": ["x", "x", "y"], "V": ["p", "q", "r"]})
+    out, stats = apply_join(left, right, {"right": "r", "on": ["A", "B"]})
+    assert stats.mode == "lookup" and stats.matched == 2
+    pd.testing.assert_frame_equal(out, left.merge(right, on=["A", "B"], how="left"))
+
+
+def test_duplicate_right_keys_fall_back_to_merge(frames):
+    left, right = frames
+    right = pd.concat([right, right.iloc[[0, 0]]], ignore_index=True)       # NL drie keer
+    out, stats = apply_join(left, right, {"right": "land", "on": "BANKS"})
+    assert stats.mode == "merge" and stats.max_fanout == 3
+    pd.testing.assert_frame_equal(out, left.merge(right, on="BANKS", how="left", suffixes=("", "_r")))
+
+
+def test_cardinality_checks(frames):
+    left, right = frames
+    dup_right = pd.concat([right, right.iloc[[1]]], ignore_index=True)
+    with pytest.raises(SystemExit, match="many_to_one.*niet uniek.*BE"):
+        apply_join(left, dup_right, {"right": "land", "on": "BANKS", "validate": "many_to_one"})
+    with pytest.raises(SystemExit, match="one_to_one.*left-sleutel.*NL"):
+        apply_join(left, right, {"right": "land", "on": "BANKS", "validate": "one_to_one"})
+    with pytest.raises(SystemExit, match="fanout 2 > max_fanout 1.*BE"):
+        apply_join(left, dup_right, {"right": "land", "on": "BANKS", "max_fanout": 1})
+    with pytest.raises(SystemExit, match="validate 'm:1' onbekend"):
+        apply_join(left, right, {"right": "land", "on": "BANKS", "validate": "m:1"})
+    with pytest.raises(SystemExit, match="columns niet gevonden.*NAAM"):
+        apply_join(left, right, {"right": "land", "on": "BANKS", "columns": ["NAAM"]})
+    out, _ = apply_join(left, right, {"right": "land", "on": "BANKS", "validate": "many_to_one", "max_fanout": 1})
+    assert len(out) == len(left)
+
+
+def test_right_index_reused_for_same_source(frames):
+    left, right = frames
+    apply_join(left, right, {"right": "land", "on": "BANKS"})
+    apply_join(left.iloc[:2], right, {"right": "land", "on": "BANKS"})
+    assert len(joins._INDEX_CACHE) == 1
+    apply_join(left, right.copy(), {"right": "land", "on": "BANKS"})      # ander frame → eigen index
+    assert len(joins._INDEX_CACHE) == 2
+
+
+def test_source_cache_reloads_changed_file(tmp_path):
+    path = tmp_path / "land.csv"
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return pd.read_csv(path, dtype=str)
+    pd.DataFrame({"BANKS": ["NL", "BE"]}).to_csv(path, index=False)
+    first = load_source_cached(path, loader, None, "string", "utf-8-sig")
+    assert load_source_cached(path, loader, None, "string", "utf-8-sig") is first and len(calls) == 1
+    load_source_cached(path, loader, None, "string", "latin1")              # andere key
+    assert len(calls) == 2
+
+    st = path.stat()
+    pd.DataFrame({"BANKS": ["NL", "FR"]}).to_csv(path, index=False)         # zelfde grootte
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    fresh = load_source_cached(path, loader, None, "string", "utf-8-sig")
+    assert fresh["BANKS"].tolist() == ["NL", "FR"] and len(calls) == 3
+
+
+def test_source_cache_is_bounded(tmp_path):
+    paths = []
+    for i in range(MAX_CACHED_SOURCES + 2):
+        paths.append(tmp_path / f"s{i}.csv")
+        pd.DataFrame({"K": [str(i)]}).to_csv(paths[-1], index=False)
+        load_source_cached(paths[-1], lambda p=paths[-1]: pd.read_csv(p, dtype=str))
+    assert len(joins._SOURCE_CACHE) == MAX_CACHED_SOURCES
+    cached = {k[0] for k in joins._SOURCE_CACHE}
+    assert paths[0].resolve() not in cached and paths[-1].resolve() in cached   # oudste eruit
+    assert load_source_cached(tmp_path / "nope.csv", lambda: "geladen") == "geladen"        # niet te statten: niet cachen
@@ -0,0 +1,85 @@
+"""Lint: --lint-workers validatie, JSON/SARIF schema (ook voor --lint) en parallel gelijk aan serieel."""
+import json
+import sys
+
+import pytest
+
+from transform_myd.cli import main, parse_args
+from transform_myd.linting import lint_all
+
+from helpers import VALUE_RULES, write_config
+
+
+@pytest.fixture
+def config(tmp_path):
+    write_config(tmp_path, variant="V1")
+    write_config(tmp_path, variant="V2", value_rules={**VALUE_RULES, "SWIFT": {"pattern": "^(a+)+$"}})   # W106
+    write_config(tmp_path, variant="V3", value_rules={"BANKS": {"pattern": "^(NL"}})                      # E102
+    (tmp_path / "config" / "M1" / "V4").mkdir()                                                           # geen meta: E001
+    return tmp_path / "config"
+
+
+def _cli(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["myd-transform", *argv])
+    with pytest.raises(SystemExit) as e:
+        main()
+    return e.value.code
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "x"])
+def test_lint_workers_must_be_positive(monkeypatch, capsys, value):
+    monkeypatch.setattr(sys, "argv", ["myd-transform", "--lint-all", "--lint-workers", value])
+    with pytest.raises(SystemExit) as e:
+        parse_args()
+    assert e.value.code == 2 and "--lint-workers" in capsys.readouterr().err
+
+
+def test_lint_all_json_schema(config, capsys):
+    assert lint_all(config, fmt="json", workers=2) == 1
+    doc = json.loads(capsys.readouterr().out)
+    assert doc["exit_code"] == 1
+    assert [t["label"] for t in doc["targets"]] == ["M1_V1", "M1_V2", "M1_V3", "M1_V4"]
+    for t in doc["targets"]:
+        assert set(t) == {"label", "object", "variant", "path", "exit_code", "issues"}
+        assert all(set(i) == {"level", "code", "message"} for i in t["issues"])
+    codes = {t["variant"]: {i["code"] for i in t["issues"]} for t in doc["targets"]}
+    assert "W106" in codes["V2"] and "E102" in codes["V3"] and codes["V4"] == {"E001"}
+    assert [t["exit_code"] for t in doc["targets"]] == [0, 0, 1, 1]
+
+
+def test_lint_all_sarif_schema(config, capsys):
+    lint_all(config, fmt="sarif", workers=2)
+    doc = json.loads(capsys.readouterr().out)
+    assert doc["version"] == "2.1.0" and len(doc["runs"]) == 1
+    run = doc["runs"][0]
+    rules = {r["id"] for r in run["tool"]["driver"]["rules"]}
+    assert run["tool"]["driver"]["name"] == "transform-myd"
+    assert {r["ruleId"] for r in run["results"]} == rules >= {"W106", "E102", "E001"}
+    for r in run["results"]:
+        assert r["level"] in ("error", "warning") and r["message"]["text"].startswith("M1_")
+        assert r["locations"][0]["physicalLocation"]["artifactLocation"]["uri"].startswith(config.as_posix())
+
+
+@pytest.mark.parametrize("fmt", ["text", "json", "sarif"])
+def test_lint_all_parallel_matches_serial(config, capsys, fmt):
+    outputs = []
+    for workers in (1, 4):
+        assert lint_all(config, fmt=fmt, workers=workers) == 1
+        outputs.append(capsys.readouterr().out)
+    assert outputs[0] == outputs[1] and "M1_V4" in outputs[0]
+
+
+def test_single_lint_honours_format(config, monkeypatch, capsys):
+    assert _cli(monkeypatch, "-c", str(config), "-o", "M1", "-v", "V2", "--lint", "--lint-format", "json") == 0
+    doc = json.loads(capsys.readouterr().out)
+    assert [t["label"] for t in doc["targets"]] == ["M1_V2"]
+    assert doc["targets"][0]["path"] == (config / "M1" / "V2").as_posix()
+    assert _cli(monkeypatch, "-c", str(config), "-o", "M1", "-v", "V3", "--lint", "--lint-format", "sarif") == 1
+    assert {r["ruleId"] for r in json.loads(capsys.readouterr().out)["runs"][0]["results"]} == {"E102"}
+
+
+def test_runlist_lint_rejects_machine_format(config, monkeypatch, tmp_path):
+    runlist = tmp_path / "runlist.yaml"
+    runlist.write_text("jobs: []\n", encoding="utf-8")
+    code = _cli(monkeypatch, "-c", str(config), "--runlist", str(runlist), "--lint", "--lint-format", "json")
+    assert "--lint-format" in str(code)
@@ -0,0 +1,18 @@
+import pandas as pd
+import pytest
+
+from transform_myd.mappings import apply_value_maps
+
+MAPPING = {"A": "Alpha", "B": None, "": "leeg"}
+
+
+@pytest.mark.parametrize("dtype", [object, "string[python]", "string[pyarrow]"])
+def test_value_map_lookup_and_null_target(dtype):
+    if dtype == "string[pyarrow]":
+        pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"C": pd.Series([" A", "B", "C ", None, "", "b"], dtype=dtype)})
+    out = apply_value_maps(df, {"C": MAPPING})["C"]
+    if dtype is not object:
+        assert out.dtype == dtype
+    values = [None if pd.isna(v) else v for v in out]
+    assert values == ["Alpha", None, "C", "leeg", "leeg", "b"]       # B: ~ blijft null, onbekend = gestript
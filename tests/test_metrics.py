@@ -0,0 +1,100 @@
+"""Metrics: stage-timing, RSS vs piek-RSS, NDJSON-aggregaat van een runlist en de TXT-log encoding."""
+import json
+import time
+
+import yaml
+
+from transform_myd.logging import write_txt_log
+from transform_myd.metrics import RunMetrics, aggregate_metrics, append_metrics_ndjson
+from transform_myd.runlist import run_from_runlist
+
+from helpers import write_config
+
+
+def test_stage_records_time_rows_and_rss():
+    m = RunMetrics("T")
+    with m.stage("sleep", rows=500):
+        time.sleep(0.05)
+    with m.stage("cpu", rows=0):
+        sum(range(200_000))
+    m.close()
+    d = m.as_dict()
+    sleep, cpu = d["stages"]
+    assert sleep["name"] == "sleep" and sleep["wall_s"] >= 0.05 and sleep["cpu_s"] < sleep["wall_s"]
+    assert 0 < sleep["rows_per_s"] <= 500 / 0.05
+    assert cpu["rows_per_s"] is None or cpu["rows_per_s"] == 0
+    assert d["wall_s"] >= sleep["wall_s"] + cpu["wall_s"]
+    assert sleep["rss_mb"] > 0 and sleep["rss_delta_mb"] is not None
+
+
+def test_peak_rss_is_at_least_current_rss():
+    m = RunMetrics("T")
+    with m.stage("alloc"):
+        block = bytearray(64 * 2**20)
+        block[::4096] = b"x" * len(block[::4096])       # pagina's echt aanraken
+    del block
+    d = m.as_dict()
+    assert d["peak_rss_mb"] >= d["rss_mb"] > 0
+    assert d["peak_rss_mb"] >= d["stages"][0]["rss_mb"]
+
+
+def test_trace_alloc_reports_stage_peak():
+    m = RunMetrics("T", trace_alloc=True)
+    with m.stage("alloc"):
+        block = [0] * 2_000_000
+    del block
+    m.close()
+    assert m.stages[0].peak_alloc_mb >= 10
+
+
+def test_aggregate_sums_jobs_and_stages():
+    runs = [
+        {"total": 10, "valid": 8, "rejected": 2, "wall_s": 1.0, "cpu_s": 0.5, "peak_rss_mb": 1e6,
+         "stages": [{"name": "load", "wall_s": 0.25}, {"name": "validate", "wall_s": 0.5}]},
+        {"total": 5, "valid": 5, "rejected": 0, "wall_s": 2.0, "cpu_s": 1.5, "peak_rss_mb": None,
+         "stages": [{"name": "load", "wall_s": 0.75}]},
+    ]
+    agg = aggregate_metrics("runlist:x", runs)
+    assert agg["aggregate"] and agg["jobs"] == 2
+    assert (agg["total"], agg["valid"], agg["rejected"]) == (15, 13, 2)
+    assert (agg["wall_s"], agg["cpu_s"]) == (3.0, 2.0)
+    assert agg["stage_s"] == {"load": 1.0, "validate": 0.5}
+    assert agg["peak_rss_mb"] == 1e6                    # max over jobs en het proces
+    assert aggregate_metrics("x", runs, wall_s=1.5)["wall_s"] == 1.5
+
+
+def test_append_ndjson_appends_lines(tmp_path):
+    path = tmp_path / "logs" / "m.ndjson"
+    append_metrics_ndjson(path, {"label": "a", "naam": "één"})
+    append_metrics_ndjson(path, {"label": "b"})
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(l)["label"] for l in lines] == ["a", "b"] and "één" in lines[0]
+
+
+def test_runlist_writes_job_lines_and_aggregate(tmp_path, source_csv):
+    config = write_config(tmp_path)
+    jobs = []
+    for name in ("a", "b"):
+        out = tmp_path / name
+        out.mkdir()
+        jobs.append({"object": "M1", "variant": "V1", "input_file": str(source_csv), "quiet": True,
+                     "output_file": str(out / "export.csv"), "reject_file": str(out / "rejects.csv"),
+                     "log_dir": str(out / "logs")})
+    runlist = tmp_path / "runlist.yaml"
+    runlist.write_text(yaml.safe_dump({"jobs": jobs}), encoding="utf-8")
+    logs = tmp_path / "runlist_logs"
+    assert run_from_runlist(config, runlist, global_metrics=True, quiet=True, log_dir=str(logs)) == 0
+    (path,) = logs.glob("*_runlist_runlist_metrics.ndjson")
+    *per_job, agg = [json.loads(l) for l in path.read_text(encoding="utf-8").splitlines()]
+    assert len(per_job) == 2 and not any(j.get("aggregate") for j in per_job)
+    assert agg["aggregate"] and agg["jobs"] == 2 and agg["label"] == "runlist:runlist"
+    assert agg["total"] == sum(j["total"] for j in per_job) > 0
+    assert agg["valid"] + agg["rejected"] == agg["total"]
+    assert agg["stage_s"]["validate"] == sum(s["wall_s"] for j in per_job for s in j["stages"] if s["name"] == "validate")
+    assert agg["peak_rss_mb"] >= max(j["peak_rss_mb"] for j in per_job)
+
+
+def test_txt_log_honours_encoding(tmp_path):
+    path = write_txt_log(tmp_path, "M1_V1", ["Résumé"], ["rij 1: ongeldig"], encoding="utf-8-sig")
+    assert path.read_bytes().startswith(b"\xef\xbb\xbf")
+    assert path.read_text(encoding="utf-8-sig").startswith("Résumé")
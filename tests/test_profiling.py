@@ -0,0 +1,13 @@
+from transform_myd.profiling import StageProfiler
+
+
+def test_pattern_without_stage_token_keeps_one_dump_per_stage(tmp_path):
+    prof = StageProfiler("cprofile", top_n=5)
+    for stage in ("load", "validate"):
+        with prof.profile(stage):
+            sum(range(1000))
+    written = prof.write(tmp_path, {"label_lower": "m140_bnka"}, pattern="{label_lower}_profile.{ext}")
+    names = sorted(p.name for p in written)
+    assert names == ["m140_bnka_profile_load.prof", "m140_bnka_profile_summary.txt",
+                     "m140_bnka_profile_validate.prof"]
+    assert all(p.exists() for p in written)
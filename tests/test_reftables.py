@@ -0,0 +1,87 @@
+"""in_table: hash-index per referentietabel, gecached tot het bestand wijzigt."""
+import os
+
+import pandas as pd
+import pytest
+
+from transform_myd import reftables
+from transform_myd.reftables import check_reference, in_table_mask, reference_index
+from transform_myd.validate import apply_value_rules
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    reftables._REF_CACHE.clear()
+    yield
+    reftables._REF_CACHE.clear()
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    calls = []
+    real = reftables._read_reference
+
+    def counting(*a):
+        calls.append(a)
+        return real(*a)
+    monkeypatch.setattr(reftables, "_read_reference", counting)
+    return calls
+
+
+def _write(path, codes, encoding="utf-8-sig"):
+    pd.DataFrame({"CODE": codes, "OMS": ["x"] * len(codes)}).to_csv(path, index=False, encoding=encoding)
+
+
+def test_mask_strips_and_ignores_case(tmp_path):
+    _write(tmp_path / "land.csv", [" NL", "be ", "", None])
+    s = pd.Series(["NL", "BE", "be", "DE", ""])
+    assert in_table_mask(s, {"path": str(tmp_path / "land.csv"), "column": "CODE"}).tolist() == [True, False, True, False, False]
+    spec = {"path": str(tmp_path / "land.csv"), "column": "CODE", "ignore_case": True}
+    assert in_table_mask(s, spec).tolist() == [True, True, True, False, False]
+
+
+def test_rule_rejects_values_not_in_table(tmp_path):
+    _write(tmp_path / "land.csv", ["NL", "BE"])
+    df = pd.DataFrame({"LAND": ["NL", " BE ", "DE", ""]})
+    rules = {"LAND": {"in_table": {"path": str(tmp_path / "land.csv"), "column": "CODE", "name": "landen"}}}
+    valid, rejects, errors = apply_value_rules(df, rules)
+    assert list(valid.index) == [0, 1, 3] and list(rejects.index) == [2]
+    assert errors == {2: ["LAND not in landen"]}
+
+
+def test_cached_until_file_changes(tmp_path, reads):
+    path = tmp_path / "land.csv"
+    spec = {"path": str(path), "column": "CODE"}
+    _write(path, ["NL", "BE"])
+    first = reference_index(spec)
+    assert reference_index(spec) is first and len(reads) == 1
+    assert reference_index({**spec, "path": str(tmp_path / "." / "land.csv")}) is first   # zelfde bestand
+
+    _write(path, ["NL", "BE", "DE"])                          # andere grootte
+    assert sorted(reference_index(spec)) == ["BE", "DE", "NL"] and len(reads) == 2
+
+    st = path.stat()
+    _write(path, ["NL", "BE", "FR"])                          # zelfde grootte, nieuwe mtime
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert sorted(reference_index(spec)) == ["BE", "FR", "NL"] and len(reads) == 3
+
+
+def test_cache_key_includes_column_and_case(tmp_path, reads):
+    path = tmp_path / "land.csv"
+    _write(path, ["nl"])
+    spec = {"path": str(path), "column": "CODE"}
+    assert list(reference_index(spec)) == ["nl"]
+    assert list(reference_index({**spec, "ignore_case": True})) == ["NL"]
+    assert list(reference_index({**spec, "column": "OMS"})) == ["x"]
+    assert len(reads) == 3
+
+
+def test_missing_table_or_column(tmp_path):
+    _write(tmp_path / "land.csv", ["NL"])
+    with pytest.raises(SystemExit, match="niet gevonden"):
+        reference_index({"path": str(tmp_path / "nope.csv"), "column": "CODE"})
+    with pytest.raises(SystemExit, match="kolom 'LAND'"):
+        reference_index({"path": str(tmp_path / "land.csv"), "column": "LAND"})
+    assert check_reference({"path": str(tmp_path / "land.csv"), "column": "CODE"}) == []
+    assert check_reference({"path": str(tmp_path / "land.csv"), "column": "LAND"}) == [f"kolom 'LAND' niet gevonden in {tmp_path / 'land.csv'}"]
+    assert check_reference({"column": "CODE"}) == ["in_table vereist 'path' en 'column'"]
@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+from transform_myd.regexes import compile_pattern
+
+PATTERNS = [
+    r"^(?i:nl|be)$",
+    r"(?i)^nl$",
+    r"^\d*$",
+    r"^\d+$",
+    r"^\d{4}$",
+    r"^[A-Z0-9]{8,11}$",
+    r"^[A-Z]{2}",
+    r"^(NL|BE|DE)$",
+    r"^NL|BE$",
+    r"^[^0-9]*$",
+    r"^.{0,3}$",
+    r"^\w+$",
+    r"^\s*$",
+    r"^[a-z]*\Z",
+    r"abc",
+    r"NL",
+    r"(?:NL|BE)",
+    r"^(?s:.)*$",
+    r"^\d{2}$",
+    r"^[\dA-F]+$",
+    r"abc$",
+    r"^a|bc",
+    r"^caf\u00e9$",
+    r"^[^\d]{0,3}\Z",
+    r"^(?P<cc>NL|BE)\d*",
+    r"^(?=N)\w+",
+]
+
+VALUES = ["", "NL", "nl", "be", "Be", "XX", "NLX", "12", "1234", "١٢", "abc", "abc\n", "ABCDEFGH",
+          "ABCDEFGH123", " ", "\n", "a_b", "é", "BE", None, "xbc", "café", "NL١", "١A"]
+
+
+@pytest.mark.parametrize("dtype", [object, "string[python]", "string[pyarrow]", "str"])
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_compile_pattern_matches_python_re(pattern, dtype):
+    """Ook op Arrow-kolommen (RE2) dezelfde uitkomst als ``re.match``: \\d is Unicode, $ ook vóór een newline."""
+    if dtype in ("string[pyarrow]", "str"):
+        pytest.importorskip("pyarrow")
+    got = compile_pattern(pattern).match(pd.Series(VALUES, dtype=dtype))
+    want = pd.Series(VALUES, dtype=object).str.match(pattern).fillna(False).astype(bool)
+    assert list(got) == list(want)
+
+
+@pytest.mark.parametrize("pattern, repl", [
+    (r"\d+", "#"), (r"[^A-Z]", ""), (r"^NL", "XX"), (r"x*", "-"), (r"c$", "C"), (r"(B)E", r"\1"),
+])
+def test_replace_object_and_arrow_identical(pattern, repl):
+    pytest.importorskip("pyarrow")
+    cp = compile_pattern(pattern)
+    values = [v for v in VALUES if v is not None]
+    want = cp.replace(pd.Series(values, dtype=object), repl)
+    assert list(cp.replace(pd.Series(values, dtype="string[pyarrow]"), repl)) == list(want)
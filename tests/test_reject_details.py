@@ -0,0 +1,64 @@
+"""Reject details artifact: alleen met --report of expliciete meta, parquet→csv fallback, --reject-stats en reasons."""
+import sys
+
+import pandas as pd
+import pytest
+
+from transform_myd.pipeline import run_pipeline
+from transform_myd.rejects import details_format, print_reject_stats, read_reject_details
+
+from helpers import cli_args, write_config
+
+AUTO = {"reports": {}}                       # geen expliciete reject_details: default gedrag
+
+
+def _details(out):
+    return sorted((out / "logs").glob("*_reject_details.*"))
+
+
+def test_details_only_with_report_or_explicit_meta(tmp_path, source_csv):
+    config = write_config(tmp_path, meta=AUTO)
+    run_pipeline(cli_args(config, source_csv, tmp_path / "plain"))
+    assert _details(tmp_path / "plain") == []
+    run_pipeline(cli_args(config, source_csv, tmp_path / "report", "--report"))
+    assert [p.suffix for p in _details(tmp_path / "report")] == [".parquet"]
+    explicit = write_config(tmp_path / "explicit")                     # META: reject_details csv
+    run_pipeline(cli_args(explicit, source_csv, tmp_path / "explicit_run"))
+    assert [p.suffix for p in _details(tmp_path / "explicit_run")] == [".csv"]
+
+
+def test_details_format_falls_back_to_csv_without_pyarrow(monkeypatch):
+    assert details_format(AUTO) is None
+    assert details_format(AUTO, report=True) == "parquet"
+    monkeypatch.setitem(sys.modules, "pyarrow", None)                 # import pyarrow → ImportError
+    assert details_format(AUTO, report=True) == "csv"
+    assert details_format({"reports": {"reject_details": "none"}}, report=True) is None
+    with pytest.raises(SystemExit):
+        details_format({"reports": {"reject_details": "xlsx"}})
+
+
+def test_reject_stats_reads_latest_artifact(tmp_path, source_csv, capsys):
+    config = write_config(tmp_path, meta=AUTO)
+    res = run_pipeline(cli_args(config, source_csv, tmp_path / "run", "--report"))
+    capsys.readouterr()
+    assert print_reject_stats(tmp_path / "run" / "logs", top=3) == 0
+    out = capsys.readouterr().out
+    details = read_reject_details(_details(tmp_path / "run")[0])
+    assert f"Rijen afgekeurd: {res['rejected']}  |  fouten: {len(details)}" in out
+    assert "Top reasons:" in out and "Per kolom / rule:" in out
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    with pytest.raises(SystemExit, match="Geen reject details"):
+        print_reject_stats(empty)
+
+
+@pytest.mark.parametrize("budget", [None, "2MB"])
+def test_reasons_csv_matches_per_row_errors(tmp_path, source_csv, budget):
+    config = write_config(tmp_path)
+    extra = ("--memory-budget", budget) if budget else ()
+    run_pipeline(cli_args(config, source_csv, tmp_path / "run", "--report", *extra))
+    reasons = pd.read_csv(next((tmp_path / "run" / "logs").glob("*_reject_reasons.csv")), keep_default_na=False)
+    rejects = pd.read_csv(tmp_path / "run" / "rejects.csv", dtype=str, keep_default_na=False)
+    per_row = rejects["__errors"].str.split("; ").explode().value_counts()      # oude berekening
+    assert dict(zip(reasons["reason"], reasons["count"])) == per_row.to_dict()
+    assert reasons["count"].is_monotonic_decreasing
@@ -0,0 +1,91 @@
+import time
+
+import pandas as pd
+import pytest
+import yaml
+
+from transform_myd.pipeline import ExportWriter, run_pipeline
+from transform_myd.runlist import chained_jobs, run_from_runlist
+
+from helpers import COLUMN_MAP, cli_args, write_config
+
+
+def _job(src, out, variant="V1", **extra):
+    out.mkdir(parents=True, exist_ok=True)
+    return {"object": "M1", "variant": variant, "input_file": str(src), "quiet": True,
+            "output_file": str(out / "export.csv"), "reject_file": str(out / "rejects.csv"),
+            "log_dir": str(out / "logs"), **extra}
+
+
+def _runlist(tmp_path, jobs):
+    path = tmp_path / "runlist.yaml"
+    path.write_text(yaml.safe_dump({"jobs": jobs}), encoding="utf-8")
+    return path
+
+
+class SlowWriter(ExportWriter):
+    def submit(self, fn):
+        def slow():
+            time.sleep(0.3)
+            fn()
+        return super().submit(slow)
+
+
+def test_summary_waits_for_async_export(tmp_path, source_csv, capsys):
+    config = write_config(tmp_path)
+    args = cli_args(config, source_csv, tmp_path / "out")
+    args.quiet = False
+    writer = SlowWriter()
+    try:
+        res = run_pipeline(args, writer=writer)
+        assert (tmp_path / "out" / "export.csv").exists() and (tmp_path / "out" / "rejects.csv").exists()
+        assert len(pd.read_csv(tmp_path / "out" / "export.csv")) == res["valid"]
+        assert "export_wait" in {s["name"] for s in res["metrics"]["stages"]}
+    finally:
+        writer.close()
+    assert "Export  :" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("prefetch", [0, 1])
+def test_write_error_fails_the_job(tmp_path, source_csv, capsys, prefetch):
+    config = write_config(tmp_path)
+    job = _job(source_csv, tmp_path / "bad", quiet=False)
+    (tmp_path / "bad" / "export.csv").mkdir()                     # schrijven naar een map faalt
+    with pytest.raises(OSError):
+        run_from_runlist(config, _runlist(tmp_path, [job]), global_prefetch=prefetch)
+    assert "Export  :" not in capsys.readouterr().out
+
+
+def test_chained_job_reads_fresh_output_with_prefetch(tmp_path, source_csv):
+    config = write_config(tmp_path)
+    targets = list(COLUMN_MAP.values())
+    write_config(tmp_path, {"unique_keys": None}, variant="V2", column_map={t: t for t in targets},
+                 value_map={}, value_rules={})
+    first = tmp_path / "first"
+    first.mkdir()
+    pd.DataFrame([["stale"] * len(targets)], columns=targets).to_csv(first / "export.csv", index=False)
+    jobs = [_job(source_csv, first), _job(first / "export.csv", tmp_path / "second", variant="V2")]
+    runlist = _runlist(tmp_path, jobs)
+
+    runs = [cli_args(config, source_csv, first), cli_args(config, first / "export.csv", tmp_path / "second")]
+    runs[1].variant_name = "V2"
+    assert chained_jobs(runs) == {1}
+
+    assert run_from_runlist(config, runlist, global_prefetch=1) == 0
+    valid_first = len(pd.read_csv(first / "export.csv"))
+    second = pd.read_csv(tmp_path / "second" / "export.csv")
+    assert valid_first > 1 and len(second) == valid_first
+
+
+def test_chunked_job_waits_for_previous_async_write_to_same_path(tmp_path, source_csv, source_xlsx):
+    config = write_config(tmp_path)
+    shared = tmp_path / "shared"
+    jobs = [_job(source_csv, shared), _job(source_xlsx, shared, memory_budget="2MB")]
+    assert run_from_runlist(config, _runlist(tmp_path, jobs), global_prefetch=1) == 0
+    single = run_pipeline(cli_args(config, source_xlsx, tmp_path / "single", "--memory-budget", "2MB"))
+    assert single["metrics"]["memory_plan"]["mode"] in ("streaming", "spill")
+    for name in ("export.csv", "rejects.csv"):
+        got = pd.read_csv(shared / name, dtype=str, keep_default_na=False)
+        want = pd.read_csv(tmp_path / "single" / name, dtype=str, keep_default_na=False)
+        got, want = (f.drop(columns=[c for c in f.columns if c in ("__run_id", "__transform_ts")]) for f in (got, want))
+        pd.testing.assert_frame_equal(got, want)
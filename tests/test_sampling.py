@@ -0,0 +1,87 @@
+"""--sample: reservoir/stratified determinisme, grootte, quota per stratum, head read-limit en __row_id."""
+from argparse import Namespace
+
+import pandas as pd
+import pytest
+
+from transform_myd.config import build_config
+from transform_myd.io_excel import load_dataframe
+from transform_myd.pipeline import run_pipeline
+from transform_myd.sampling import SampleSpec, sample_frame
+
+from helpers import COUNTRIES, cli_args, generate_rows, write_config
+
+ROWS = 5_000
+
+
+@pytest.fixture(scope="module")
+def rows() -> pd.DataFrame:
+    return generate_rows(ROWS)
+
+
+def _cfg(config, src):
+    ns = Namespace(object_name="M1", variant_name="V1", config_dir=str(config), input_file=str(src),
+                   output_file=None, reject_file=None, log_dir="logs", trace_config=False, quiet=True)
+    return build_config(ns, create_dirs=False)
+
+
+def test_random_is_seeded_and_chunk_independent(rows):
+    spec = SampleSpec(300, "random", seed=5)
+    a = sample_frame(rows, spec, chunksize=700)
+    assert len(a) == 300 and a.index.is_monotonic_increasing
+    assert a.equals(sample_frame(rows, spec, chunksize=700))
+    assert a.equals(sample_frame(rows, spec, chunksize=ROWS))
+    assert a.equals(rows.loc[a.index])                        # index = bronrij
+    assert not a.index.equals(sample_frame(rows, SampleSpec(300, "random", seed=6)).index)
+
+
+def test_random_larger_than_source_keeps_all(rows):
+    assert sample_frame(rows.head(50), SampleSpec(300, "random", seed=1)).equals(rows.head(50))
+
+
+def test_stratified_allocation(rows):
+    spec = SampleSpec(70, "stratified", seed=3, by="BANKS")
+    out = sample_frame(rows, spec, chunksize=600)
+    assert len(out) == 70 and out.equals(sample_frame(rows, spec))
+    got = out["BANKS"].value_counts()
+    share = rows["BANKS"].value_counts() / ROWS * 70
+    assert set(got.index) == set(COUNTRIES)                   # elk stratum minstens 1 rij
+    assert ((got - share.reindex(got.index)).abs() <= 1.5).all()
+
+
+def test_stratified_more_strata_than_rows(rows):
+    out = sample_frame(rows, SampleSpec(3, "stratified", seed=3, by="BANKS"))
+    assert len(out) == 3 and out["BANKS"].is_unique
+
+
+def test_head_sample_reads_only_the_limit(tmp_path, rows):
+    src = tmp_path / "bank_raw.csv"
+    rows.head(100).to_csv(src, index=False)
+    with open(src, "a", encoding="utf-8") as fp:
+        fp.write("te,veel,velden,in,deze,rij,voor,de,parser\n")    # wordt bij een volledige read een ParserError
+    cfg = _cfg(write_config(tmp_path), src)
+    with pytest.raises(pd.errors.ParserError):
+        load_dataframe(cfg)
+    head = load_dataframe(cfg, sample=SampleSpec(40))
+    assert len(head) == 40 and head["BANKL"].tolist() == rows["BANKL"].head(40).tolist()
+
+
+def _row_ids(out) -> pd.Series:
+    rej = pd.read_csv(out / "rejects.csv", dtype=str, keep_default_na=False)
+    exp = pd.read_csv(out / "export.csv", dtype=str, keep_default_na=False)
+    return pd.concat([rej["__row_id"], exp["__row_id"]]).astype(int).sort_values(ignore_index=True)
+
+
+def test_row_id_source_rows_only_for_random_samples(tmp_path, rows):
+    src = tmp_path / "bank_raw.csv"
+    rows.to_csv(src, index=False)
+    config = write_config(tmp_path, meta={"sources": [{"name": "bank", "path": str(src)}], "base": "bank",
+                                          "filters": ["BANKS == 'NL'"]})
+    run_pipeline(cli_args(config, src, tmp_path / "filtered", "--keep-lineage"))
+    nl = rows.index[rows["BANKS"] == "NL"]
+    assert _row_ids(tmp_path / "filtered").tolist() == list(range(1, len(nl) + 1))
+
+    run_pipeline(cli_args(config, src, tmp_path / "random", "--keep-lineage",
+                          "--sample", "50", "--sample-mode", "random", "--sample-seed", "2"))
+    ids = _row_ids(tmp_path / "random")
+    assert len(ids) == 50 and set(ids - 1) <= set(nl)
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from transform_myd.validate import (apply_unique_keys, apply_value_rules, unique_key_indexes,
+                                    unique_key_specs)
+
+RULES = {"SWIFT": {"pattern": "^[A-Z0-9]{8}$"}}
+
+
+def _frame():
+    return pd.DataFrame({
+        "BANKL": ["1", "1", "1", "2", "2", "3", ""],
+        "SWIFT": ["bad", "RABONL2U", "INGBNL2A", "RABONL2U", "RABONL2U", "INGBNL2A", "RABONL2U"],
+    }, dtype=object)
+
+
+def _run(df, policy, indexes=None):
+    valid, reject, errors = apply_value_rules(df, RULES)
+    specs = unique_key_specs({"unique_keys": {"keys": ["BANKL"], "policy": policy}})
+    return apply_unique_keys(df, [] if indexes else specs, errors, indexes=indexes)
+
+
+def test_keep_first_keeps_first_row_that_passes_value_rules():
+    valid, reject, errors = _run(_frame(), "keep_first")
+    assert list(valid.index) == [1, 3, 5, 6]                 # rij 0 faalt op SWIFT en claimt "1" niet
+    assert errors[0] == ["SWIFT mismatches ^[A-Z0-9]{8}$"]
+    assert errors[2] == ["BANKL duplicate key 1"] and errors[4] == ["BANKL duplicate key 2"]
+
+
+def test_reject_all_groups_only_valid_rows():
+    valid, reject, errors = _run(_frame(), "reject_all")
+    assert list(valid.index) == [5, 6]
+    assert errors[0] == ["SWIFT mismatches ^[A-Z0-9]{8}$"]      # geen duplicate-melding: telde niet mee
+    assert all(errors[i] == ["BANKL duplicate key 1"] for i in (1, 2))
+    assert all(errors[i] == ["BANKL duplicate key 2"] for i in (3, 4))
+
+
+def test_chunked_feed_matches_single_pass():
+    df = pd.DataFrame({"K": [str(i % 37) for i in range(1000)], "SWIFT": "RABONL2U"}, dtype=object)
+    specs = unique_key_specs({"unique_keys": ["K"]})
+    whole = apply_unique_keys(df, specs, {})[2]
+    indexes = unique_key_indexes(specs)
+    chunked = {}
+    for start in range(0, len(df), 64):
+        chunked.update(apply_unique_keys(df.iloc[start:start + 64], [], {}, indexes=indexes)[2])
+    assert chunked == whole and len(whole) == 1000 - 37
+    assert len(indexes[0]._first) == 37
@@ -0,0 +1,49 @@
+import pytest
+
+from transform_myd.config import build_config
+from transform_myd.linting import collect_issues
+from transform_myd.pipeline import run_pipeline
+
+from helpers import cli_args, run_artifacts, write_config
+
+
+@pytest.mark.parametrize("budget, mode", [("12MB", "streaming"), ("2MB", "spill")])
+def test_keep_first_chunked_matches_in_memory(tmp_path, source_csv, budget, mode):
+    config = write_config(tmp_path)
+    full = run_pipeline(cli_args(config, source_csv, tmp_path / "in_memory"))
+    chunked = run_pipeline(cli_args(config, source_csv, tmp_path / "chunked", "--memory-budget", budget))
+    assert chunked["metrics"]["memory_plan"]["mode"] == mode
+    assert (full["valid"], full["rejected"]) == (chunked["valid"], chunked["rejected"])
+    expected = run_artifacts(tmp_path / "in_memory")
+    assert b"duplicate key" in expected["details"]          # duplicaten over chunkgrenzen heen
+    assert run_artifacts(tmp_path / "chunked") == expected
+
+
+@pytest.mark.parametrize("budget, expect", [(None, False), ("2MB", True), ("none", False)])
+def test_reject_all_with_memory_budget_warns(tmp_path, source_csv, budget, expect):
+    config = write_config(tmp_path, {"unique_keys": {"keys": ["BANKS", "ORT01"], "policy": "reject_all"}})
+    cfg = build_config(cli_args(config, source_csv, tmp_path / "lint"), create_dirs=False)
+    codes = {code for _, code, _ in collect_issues(cfg, budget)}
+    assert ("W111" in codes) is expect
+
+
+def test_reject_all_stays_in_memory_and_warns(tmp_path, source_csv, capsys):
+    config = write_config(tmp_path, {"unique_keys": {"keys": ["BANKS", "ORT01"], "policy": "reject_all"}})
+    res = run_pipeline(cli_args(config, source_csv, tmp_path / "out", "--memory-budget", "2MB"))
+    plan = res["metrics"]["memory_plan"]
+    assert plan["mode"] == "in_memory" and "reject_all" in plan["note"] and plan["over_budget"]
+    assert "Geheugenbudget 2MB niet haalbaar" in capsys.readouterr().err   # ook met --quiet
+
+
+def test_reject_all_over_budget_fails_with_strict(tmp_path, source_csv):
+    config = write_config(tmp_path, {"unique_keys": {"keys": ["BANKS", "ORT01"], "policy": "reject_all"}})
+    with pytest.raises(SystemExit, match="niet haalbaar"):
+        run_pipeline(cli_args(config, source_csv, tmp_path / "out", "--memory-budget", "2MB", "--strict"))
+
+
+def test_chunked_plan_has_no_workers_downgrade(tmp_path, source_csv, capsys):
+    config = write_config(tmp_path)
+    res = run_pipeline(cli_args(config, source_csv, tmp_path / "out", "--memory-budget", "12MB", "--workers", "3"))
+    plan = res["metrics"]["memory_plan"]
+    assert plan["mode"] == "streaming" and "workers" not in plan["downgrades"] and not plan["over_budget"]
+    assert "niet haalbaar" not in capsys.readouterr().err
@@ -0,0 +1,129 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from transform_myd.watch import load_targets, watch
+
+from helpers import cli_args, generate_rows, write_config
+
+
+def _setup(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    dirs = {"raw": str(raw), "out": str(tmp_path / "out"), "rejects": str(tmp_path / "rej")}
+    config = write_config(tmp_path, {"input_file": "in_*.csv", "dirs": dirs})
+    args = cli_args(config, raw / "unused.csv", tmp_path / "cli")
+    args.input_file, args.output_file, args.reject_file = None, None, None
+    args.log_dir = str(tmp_path / "logs")
+    return raw, args
+
+
+def _until(cond, timeout=10.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if cond():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class FakeRuns:
+    def __init__(self, seconds=0.0):
+        self.seconds = seconds
+        self.calls = []
+        self.active = self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, ns, *a, **k):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.calls.append((ns, open(ns.input_file, encoding="utf-8").read()))
+        print(f"run {ns.input_file}")
+        time.sleep(self.seconds)
+        with self._lock:
+            self.active -= 1
+        return {"valid": 1, "rejected": 0}
+
+
+@pytest.fixture
+def watching(monkeypatch):
+    threads = []
+
+    def start(args, fake, **kw):
+        monkeypatch.setattr("transform_myd.pipeline.run_pipeline", fake)
+        stop, rc = threading.Event(), []
+        th = threading.Thread(target=lambda: rc.append(watch(args, interval=0.02, stop=stop, **kw)))
+        th.start()
+        threads.append((th, stop))
+        return stop, rc
+
+    yield start
+    for th, stop in threads:
+        stop.set()
+        th.join(10)
+
+
+def test_settle_waits_until_file_is_stable_and_dedupes(tmp_path, watching):
+    raw, args = _setup(tmp_path)
+    fake = FakeRuns()
+    watching(args, fake, settle=0.3)
+    f = raw / "in_1.csv"
+    f.write_text("a", encoding="utf-8")
+    time.sleep(0.15)
+    with f.open("a", encoding="utf-8") as fp:
+        fp.write("b")                                    # groeit nog: settle-timer begint opnieuw
+    assert _until(lambda: len(fake.calls) == 1)
+    assert fake.calls[0][1] == "ab"
+    time.sleep(0.5)
+    assert len(fake.calls) == 1                           # ongewijzigd bestand: niet opnieuw
+    f.write_text("abc", encoding="utf-8")
+    assert _until(lambda: len(fake.calls) == 2)
+    assert fake.calls[1][1] == "abc"
+
+
+def test_same_target_runs_serially_with_unique_names(tmp_path, watching, capsys):
+    raw, args = _setup(tmp_path)
+    for i in range(3):
+        (raw / f"in_{i}.csv").write_text(str(i), encoding="utf-8")
+    fake = FakeRuns(seconds=0.2)
+    stop, rc = watching(args, fake, settle=0.05, workers=3, process_existing=True)
+    assert _until(lambda: len(fake.calls) == 3 and fake.active == 0)
+    stop.set()
+    assert _until(lambda: rc == [0])
+    assert fake.peak == 1
+    spaces = [ns for ns, _ in fake.calls]
+    for attr in ("output_file", "reject_file", "log_dir"):
+        assert len({getattr(ns, attr) for ns in spaces}) == 3
+    assert all(Path(ns.input_file).stem in Path(ns.output_file).name for ns in spaces)
+    out = capsys.readouterr().out
+    assert all(f"[M1_V1] run {raw / f'in_{i}.csv'}" in out for i in range(3))
+
+
+def test_load_targets_creates_no_directories(tmp_path):
+    raw, args = _setup(tmp_path)
+    targets = load_targets(args)
+    assert [t.label for t in targets] == ["M1_V1"]
+    assert not (tmp_path / "out").exists() and not (tmp_path / "rej").exists() and not (tmp_path / "logs").exists()
+
+
+def test_two_files_in_one_minute_keep_their_own_output(tmp_path):
+    raw, args = _setup(tmp_path)
+    for i, seed in enumerate((1, 2)):
+        generate_rows(50, seed=seed).to_csv(raw / f"in_{i}.csv", index=False)
+    stop = threading.Event()
+    rc = []
+    th = threading.Thread(target=lambda: rc.append(watch(args, interval=0.02, settle=0.05, process_existing=True,
+                                                         stop=stop)))
+    th.start()
+    try:
+        assert _until(lambda: len(list((tmp_path / "out").glob("*.csv"))) == 2
+                      and len(list((tmp_path / "logs").glob("in_*/*_log.txt"))) == 2, timeout=30)
+    finally:
+        stop.set()
+        th.join(30)
+    assert rc == [0]
+    outputs = sorted(p.name for p in (tmp_path / "out").glob("*.csv"))
+    assert outputs[0].endswith("_in_0.csv") and outputs[1].endswith("_in_1.csv")